@@ -12,6 +12,12 @@ logger = logging.getLogger(__name__)
 
 PUSHOVER_PRIORITY = {"low": -1, "normal": 0, "high": 1, "emergency": 2}
 
+# Seconds to wait for the Pushover API to connect and to respond
+REQUEST_TIMEOUT_SECONDS = 10
+
+# Shared by all services so consecutive notifications reuse the kept-alive connection
+_session = requests.Session()
+
 
 @dataclass
 class PushoverConfig:
@@ -76,7 +82,9 @@ class PushoverService:
 
             logger.info("Sending 2FA notification via Pushover")
 
-            response = requests.post(self.PUSHOVER_API_URL, data=payload, timeout=10)
+            response = _session.post(
+                self.PUSHOVER_API_URL, data=payload, timeout=REQUEST_TIMEOUT_SECONDS
+            )
 
             if response.status_code == 200:
                 response_data = response.json()
@@ -126,7 +134,9 @@ class PushoverService:
 
             logger.info("Sending authentication success notification.")
 
-            response = requests.post(self.PUSHOVER_API_URL, data=payload, timeout=10)
+            response = _session.post(
+                self.PUSHOVER_API_URL, data=payload, timeout=REQUEST_TIMEOUT_SECONDS
+            )
 
             if response.status_code == 200:
                 response_data = response.json()
@@ -191,7 +201,9 @@ class PushoverService:
 
             logger.info("Sending error notification via Pushover")
 
-            response = requests.post(self.PUSHOVER_API_URL, data=payload, timeout=10)
+            response = _session.post(
+                self.PUSHOVER_API_URL, data=payload, timeout=REQUEST_TIMEOUT_SECONDS
+            )
 
             if response.status_code == 200:
                 response_data = response.json()
@@ -241,7 +253,9 @@ class PushoverService:
 
             logger.info("Sending test notification via Pushover")
 
-            response = requests.post(self.PUSHOVER_API_URL, data=payload, timeout=10)
+            response = _session.post(
+                self.PUSHOVER_API_URL, data=payload, timeout=REQUEST_TIMEOUT_SECONDS
+            )
 
             if response.status_code == 200:
                 response_data = response.json()
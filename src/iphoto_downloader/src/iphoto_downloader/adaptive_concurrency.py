@@ -0,0 +1,181 @@
+"""Adaptive limit on the number of concurrent downloads."""
+
+import contextlib
+import threading
+import time
+import typing as t
+
+from .logger import get_logger
+
+# Relative throughput change between two rounds that counts as a gain or a loss
+THROUGHPUT_CHANGE_THRESHOLD = 0.05
+
+# Latency above this multiple of the lowest observed latency counts as congestion
+LATENCY_INFLATION_FACTOR = 2.0
+
+# Growth of the lowest observed latency per round, so a lasting slowdown becomes normal
+BASE_LATENCY_DRIFT = 1.05
+
+# Share of the limit kept after the server throttled a download (HTTP 429/503)
+THROTTLE_DECREASE_FACTOR = 0.5
+
+# The limit is not raised again for this long after a throttled download
+THROTTLE_COOLDOWN_SECONDS = 30.0
+
+# A round lasts at least this long, so rounds of tiny photos are not all noise
+MIN_ROUND_SECONDS = 1.0
+
+# Weight of the newest sample in the smoothed throughput and latency
+SMOOTHING = 0.3
+
+
+class ConcurrencySnapshot(t.NamedTuple):
+    """Current state of an adaptive concurrency limit."""
+
+    limit: int
+    in_flight: int
+    throughput: float
+    latency: float
+
+
+class AdaptiveConcurrency:
+    """Concurrency limit adapted AIMD-style to the observed transfer performance.
+
+    Downloads hold a slot while they transfer. Completions are grouped in rounds of
+    at least ``limit`` downloads: if a round moved more bytes per second than the one
+    before, the limit grows by one; if it moved noticeably less, or the time to the
+    first response byte is inflated, the limit shrinks by one. Throttling responses
+    from the server halve the limit at once and pause further growth for a while.
+    """
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1) -> None:
+        """Initialize concurrency limit.
+
+        Args:
+            initial: Limit to start with
+            maximum: Highest limit the adaptation may reach
+            minimum: Lowest limit the adaptation may reach
+        """
+        self.logger = get_logger()
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self._limit = min(max(initial, self.minimum), self.maximum)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+        self._round_started = time.monotonic()
+        self._round_bytes = 0
+        self._round_completions = 0
+        self._last_round_throughput: float | None = None
+        self._growth_paused_until = 0.0
+
+        self._throughput = 0.0
+        self._latency = 0.0
+        self._base_latency: float | None = None
+
+    @property
+    def limit(self) -> int:
+        """Get the current number of concurrent downloads allowed."""
+        return self._limit
+
+    def snapshot(self) -> ConcurrencySnapshot:
+        """Get limit, downloads in flight, smoothed throughput (bytes/s) and latency (s)."""
+        with self._condition:
+            return ConcurrencySnapshot(
+                self._limit, self._in_flight, self._throughput, self._latency
+            )
+
+    @contextlib.contextmanager
+    def slot(self) -> t.Iterator[None]:
+        """Hold one of the concurrent download slots, waiting until one is free."""
+        with self._condition:
+            while self._in_flight >= self._limit:
+                self._condition.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify()
+
+    def record_latency(self, seconds: float) -> None:
+        """Record the time a download took to start responding.
+
+        Args:
+            seconds: Time from request to response headers
+        """
+        with self._condition:
+            if self._base_latency is None:
+                self._latency = seconds
+            else:
+                self._latency += SMOOTHING * (seconds - self._latency)
+            if self._base_latency is None or self._latency < self._base_latency:
+                self._base_latency = self._latency
+
+    def record_success(self, bytes_transferred: int) -> None:
+        """Record a finished download and adapt the limit at the end of a round.
+
+        Args:
+            bytes_transferred: Bytes received by the download
+        """
+        with self._condition:
+            self._round_bytes += bytes_transferred
+            self._round_completions += 1
+
+            now = time.monotonic()
+            elapsed = now - self._round_started
+            if self._round_completions < self._limit or elapsed < MIN_ROUND_SECONDS:
+                return
+
+            throughput = self._round_bytes / elapsed
+            self._throughput = (
+                throughput
+                if self._last_round_throughput is None
+                else self._throughput + SMOOTHING * (throughput - self._throughput)
+            )
+
+            previous = self._last_round_throughput
+            if self._base_latency and self._latency > LATENCY_INFLATION_FACTOR * self._base_latency:
+                self._set_limit(self._limit - 1, "response latency is rising")
+            elif previous is not None and throughput < previous * (1 - THROUGHPUT_CHANGE_THRESHOLD):
+                self._set_limit(self._limit - 1, "throughput dropped")
+            elif (
+                previous is None or throughput > previous * (1 + THROUGHPUT_CHANGE_THRESHOLD)
+            ) and now >= self._growth_paused_until:
+                self._set_limit(self._limit + 1, "throughput is growing")
+
+            self._last_round_throughput = throughput
+            if self._base_latency:
+                self._base_latency *= BASE_LATENCY_DRIFT
+            self._start_round(now)
+
+    def record_throttled(self) -> None:
+        """Record a download the server refused because of load (HTTP 429/503)."""
+        with self._condition:
+            now = time.monotonic()
+            self._growth_paused_until = now + THROTTLE_COOLDOWN_SECONDS
+            if self._limit > self.minimum:
+                self.logger.warning(
+                    f"⚠️ iCloud is throttling downloads, reducing concurrency from {self._limit}"
+                )
+            self._set_limit(int(self._limit * THROTTLE_DECREASE_FACTOR), "iCloud is throttling")
+            # Throughput measured at the old limit says nothing about the new one
+            self._last_round_throughput = None
+            self._start_round(now)
+
+    def _start_round(self, now: float) -> None:
+        """Start collecting a new round of completions."""
+        self._round_started = now
+        self._round_bytes = 0
+        self._round_completions = 0
+
+    def _set_limit(self, limit: int, reason: str) -> None:
+        """Change the limit within bounds. Caller holds the condition."""
+        limit = min(max(limit, self.minimum), self.maximum)
+        if limit == self._limit:
+            return
+        self.logger.debug(f"🎚️ Download concurrency {self._limit} → {limit}: {reason}")
+        self._limit = limit
+        # A higher limit lets waiting downloads start
+        self._condition.notify_all()
@@ -0,0 +1,162 @@
+"""Bandwidth limit shared by all downloads, with time-of-day schedules."""
+
+import datetime as dt
+import threading
+import time
+import typing as t
+
+# Seconds of transfer at the full rate that may be used at once after an idle period
+BURST_SECONDS = 1.0
+
+# Longest single sleep, so a raised or lifted limit takes effect quickly
+MAX_SLEEP_SECONDS = 1.0
+
+
+def mbps_to_bytes_per_second(mbps: float) -> float:
+    """Convert megabits per second to bytes per second."""
+    return mbps * 1_000_000 / 8
+
+
+class BandwidthLimiter:
+    """Token bucket limiting the combined rate of all downloads.
+
+    Every download thread takes tokens for the bytes it has read. Tokens refill at
+    the configured rate up to a burst of ``BURST_SECONDS``; a thread taking more than
+    available goes into debt and sleeps until the debt is paid back, so the combined
+    rate never exceeds the limit no matter how many transfers run.
+    """
+
+    def __init__(self, mbps: float = 0) -> None:
+        """Initialize limiter.
+
+        Args:
+            mbps: Limit in megabits per second, 0 for unlimited
+        """
+        self._lock = threading.Lock()
+        self._limit_mbps = 0.0
+        self._rate = 0.0
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        self.set_limit(mbps)
+
+    @property
+    def limit_mbps(self) -> float:
+        """Get the current limit in megabits per second, 0 if unlimited."""
+        return self._limit_mbps
+
+    def set_limit(self, mbps: float) -> None:
+        """Change the limit; takes effect for transfers already running.
+
+        Args:
+            mbps: Limit in megabits per second, 0 for unlimited
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._limit_mbps = max(0.0, mbps)
+            self._rate = mbps_to_bytes_per_second(self._limit_mbps)
+            # Debt from a stricter limit must not throttle the new one
+            self._tokens = max(0.0, min(self._tokens, self._rate * BURST_SECONDS))
+
+    def consume(self, byte_count: int) -> None:
+        """Take tokens for transferred bytes, sleeping while the rate is exceeded.
+
+        Args:
+            byte_count: Bytes just transferred
+        """
+        with self._lock:
+            if not self._rate:
+                return
+            self._refill(time.monotonic())
+            self._tokens -= byte_count
+
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                # Less than a byte of debt left is rounding noise
+                if not self._rate or self._tokens > -1:
+                    return
+                delay = -self._tokens / self._rate
+            time.sleep(min(delay, MAX_SLEEP_SECONDS))
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last update. Caller holds the lock."""
+        if self._rate:
+            self._tokens = min(
+                self._tokens + (now - self._updated) * self._rate, self._rate * BURST_SECONDS
+            )
+        self._updated = now
+
+
+class BandwidthWindow(t.NamedTuple):
+    """Bandwidth limit applying during a daily time range."""
+
+    start: dt.time
+    end: dt.time
+    mbps: float
+
+    def contains(self, moment: dt.time) -> bool:
+        """Check whether a time of day falls in the window; windows may wrap midnight."""
+        if self.start == self.end:
+            return True
+        if self.start < self.end:
+            return self.start <= moment < self.end
+        return moment >= self.start or moment < self.end
+
+
+def parse_bandwidth_schedule(schedule: str) -> list[BandwidthWindow]:
+    """Parse a schedule like ``08:00-18:00=20,18:00-08:00=0``.
+
+    Each entry is a daily time range and a limit in megabits per second (0 for
+    unlimited). Ranges ending before they start wrap around midnight, ranges ending
+    where they start cover the whole day.
+
+    Args:
+        schedule: Comma-separated windows, empty for none
+
+    Returns:
+        Windows in the given order
+
+    Raises:
+        ValueError: If an entry is malformed
+    """
+    windows = []
+    for raw_entry in schedule.split(","):
+        entry = raw_entry.strip()
+        if not entry:
+            continue
+        try:
+            time_range, mbps = entry.split("=")
+            start, end = time_range.split("-")
+            window = BandwidthWindow(
+                dt.time.fromisoformat(start.strip()),
+                dt.time.fromisoformat(end.strip()),
+                float(mbps),
+            )
+        except ValueError:
+            raise ValueError(
+                f"Invalid bandwidth window '{entry}', expected HH:MM-HH:MM=MBPS"
+            ) from None
+        if window.mbps < 0:
+            raise ValueError(f"Invalid bandwidth window '{entry}', limit must not be negative")
+        windows.append(window)
+    return windows
+
+
+def scheduled_limit(
+    windows: t.Sequence[BandwidthWindow], default_mbps: float, now: dt.datetime | None = None
+) -> float:
+    """Get the bandwidth limit applying at a moment.
+
+    Args:
+        windows: Schedule from parse_bandwidth_schedule(), the first match wins
+        default_mbps: Limit outside all windows
+        now: Moment to evaluate, the current local time if None
+
+    Returns:
+        Limit in megabits per second, 0 for unlimited
+    """
+    moment = (now or dt.datetime.now()).time()
+    for window in windows:
+        if window.contains(moment):
+            return window.mbps
+    return default_mbps
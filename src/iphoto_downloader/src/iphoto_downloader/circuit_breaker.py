@@ -0,0 +1,147 @@
+"""Circuit breaker stopping requests to iCloud while most of them fail."""
+
+import collections
+import threading
+import time
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit is open."""
+
+    def __init__(self, retry_after: float) -> None:
+        """Initialize error.
+
+        Args:
+            retry_after: Seconds until the circuit lets a probe request through
+        """
+        super().__init__(f"iCloud circuit open, next probe in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Trip after too many failed requests, then probe for recovery with backoff.
+
+    Closed: requests pass and their outcomes are kept in a window of the last
+    ``window`` requests. Once at least half the window was seen and the share of
+    failures reaches ``failure_rate``, the circuit opens.
+
+    Open: requests are refused for ``open_seconds``, doubled after every trip that
+    follows a failed probe, up to ``max_open_seconds``.
+
+    Half open: a single probe request is let through. Its success closes the circuit
+    and resets the backoff, its failure opens the circuit again.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float,
+        window: int,
+        open_seconds: float,
+        max_open_seconds: float,
+    ) -> None:
+        """Initialize breaker.
+
+        Args:
+            failure_rate: Share of failed requests (0-1] that trips the circuit
+            window: Number of recent requests the failure rate is computed over
+            open_seconds: Time the circuit stays open after the first trip
+            max_open_seconds: Longest time the circuit stays open
+        """
+        self.failure_rate = failure_rate
+        self.window = max(1, window)
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max(open_seconds, max_open_seconds)
+
+        self._lock = threading.Lock()
+        self._outcomes: collections.deque[bool] = collections.deque(maxlen=self.window)
+        self._state = STATE_CLOSED
+        self._opened_until = 0.0
+        self._consecutive_trips = 0
+        self._probe_in_flight = False
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        """Get the current state, one of the ``STATE_*`` constants."""
+        with self._lock:
+            if self._state == STATE_OPEN and time.monotonic() >= self._opened_until:
+                return STATE_HALF_OPEN
+            return self._state
+
+    def retry_after(self) -> float:
+        """Get the seconds until a request may be attempted, 0 unless open."""
+        with self._lock:
+            if self._state != STATE_OPEN:
+                return 0.0
+            return max(0.0, self._opened_until - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent now.
+
+        The first caller after the open period ends is granted the probe request and
+        must report its outcome; other callers are refused until it did.
+        """
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_OPEN:
+                if time.monotonic() < self._opened_until:
+                    return False
+                self._state = STATE_HALF_OPEN
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> bool:
+        """Report a request iCloud answered normally.
+
+        Returns:
+            True if this closed the circuit again
+        """
+        with self._lock:
+            if self._state == STATE_OPEN:
+                return False
+            recovered = self._state == STATE_HALF_OPEN
+            if recovered:
+                self._state = STATE_CLOSED
+                self._consecutive_trips = 0
+                self._probe_in_flight = False
+                self._outcomes.clear()
+            self._outcomes.append(True)
+            return recovered
+
+    def record_failure(self) -> float | None:
+        """Report a request that failed on iCloud's side (5xx, throttling, auth, network).
+
+        Returns:
+            Seconds the circuit stays open if this failure opened it, otherwise None
+        """
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                self._probe_in_flight = False
+                return self._trip()
+            if self._state == STATE_OPEN:
+                # Late failure of a request sent before the circuit opened
+                return None
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) * 2 >= self.window and failures >= self.failure_rate * len(
+                self._outcomes
+            ):
+                return self._trip()
+            return None
+
+    def _trip(self) -> float:
+        """Open the circuit with the next backoff. Caller holds the lock."""
+        open_seconds = min(self.max_open_seconds, self.open_seconds * 2**self._consecutive_trips)
+        self._state = STATE_OPEN
+        self._opened_until = time.monotonic() + open_seconds
+        self._consecutive_trips = min(self._consecutive_trips + 1, 32)
+        self._outcomes.clear()
+        self.trips += 1
+        return open_seconds
@@ -11,6 +11,9 @@ from dotenv import load_dotenv
 
 from auth2fa.pushover_service import PushoverConfig
 
+from .bandwidth import parse_bandwidth_schedule
+from .download_order import DOWNLOAD_ORDERS, ORDER_LISTING
+
 # Check if keyring is available and functional
 try:
     keyring.get_password("test", "test")
@@ -45,6 +48,46 @@ class BaseConfig(ABC):  # noqa
         self.max_downloads = int(os.getenv("MAX_DOWNLOADS", "0"))
         self.max_file_size_mb = int(os.getenv("MAX_FILE_SIZE_MB", "0"))
 
+        # Download concurrency
+        self.download_workers = int(os.getenv("DOWNLOAD_WORKERS", "4"))
+        # Upper bound the download concurrency may adapt to from DOWNLOAD_WORKERS
+        # (defaults to DOWNLOAD_WORKERS, growing beyond it is opt-in)
+        self.max_download_workers = int(
+            os.getenv("MAX_DOWNLOAD_WORKERS", str(self.download_workers))
+        )
+        # Albums are listed incrementally in between full listings (0 = always full)
+        self.full_listing_interval_hours = float(os.getenv("FULL_LISTING_INTERVAL_HOURS", "24"))
+        # Album listing pages fetched ahead of the downloads (0 = fetch on demand)
+        self.listing_prefetch_pages = int(os.getenv("LISTING_PREFETCH_PAGES", "2"))
+        # Albums opened concurrently while listing photos
+        self.album_listing_workers = int(os.getenv("ALBUM_LISTING_WORKERS", "4"))
+        # Memory for detecting photos listed twice, more ids are spilled to a temp file
+        self.dedup_memory_budget_mb = int(os.getenv("DEDUP_MEMORY_BUDGET_MB", "64"))
+        # Photos in several albums are downloaded once and hard linked into the others
+        self.link_album_duplicates = os.getenv("LINK_ALBUM_DUPLICATES", "false").lower() == "true"
+        # Order of downloads within a window of listed photos, see DOWNLOAD_ORDERS
+        self.download_order = os.getenv("DOWNLOAD_ORDER", ORDER_LISTING).strip().lower()
+        self.download_lookahead = int(os.getenv("DOWNLOAD_LOOKAHEAD", "500"))
+        # Combined download rate limit in megabits per second (0 = unlimited)
+        self.max_bandwidth_mbps = float(os.getenv("MAX_BANDWIDTH_MBPS", "0"))
+        # Daily windows overriding MAX_BANDWIDTH_MBPS, e.g. "08:00-18:00=20,18:00-08:00=0"
+        self.bandwidth_schedule = os.getenv("BANDWIDTH_SCHEDULE", "")
+        # Seconds to wait for iCloud to accept a connection and between received data
+        self.http_connect_timeout_seconds = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "10"))
+        self.http_read_timeout_seconds = float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", "60"))
+        # Failed downloads are retried with exponential backoff, up to a number of attempts
+        self.retry_max_attempts = int(os.getenv("RETRY_MAX_ATTEMPTS", "5"))
+        self.retry_backoff_minutes = float(os.getenv("RETRY_BACKOFF_MINUTES", "5"))
+        self.retry_max_backoff_hours = float(os.getenv("RETRY_MAX_BACKOFF_HOURS", "24"))
+        # Downloads pause once this share of the last CIRCUIT_BREAKER_WINDOW requests
+        # failed, for CIRCUIT_BREAKER_OPEN_SECONDS doubling up to the maximum
+        self.circuit_breaker_failure_rate = float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", "0.5"))
+        self.circuit_breaker_window = int(os.getenv("CIRCUIT_BREAKER_WINDOW", "20"))
+        self.circuit_breaker_open_seconds = float(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", "30"))
+        self.circuit_breaker_max_open_minutes = float(
+            os.getenv("CIRCUIT_BREAKER_MAX_OPEN_MINUTES", "30")
+        )
+
         # Pushover notification settings
         self.pushover_device: str | None = os.getenv("PUSHOVER_DEVICE", "")
         self.enable_pushover: bool = os.getenv("ENABLE_PUSHOVER", "true").lower() == "true"
@@ -76,6 +119,7 @@ class BaseConfig(ABC):  # noqa
         self.execution_mode = os.getenv("EXECUTION_MODE", "single").lower()
         self.sync_interval_minutes = float(os.getenv("SYNC_INTERVAL_MINUTES", "2"))
         self.maintenance_interval_hours = float(os.getenv("MAINTENANCE_INTERVAL_HOURS", "1"))
+        self.watch_local_changes: bool = os.getenv("WATCH_LOCAL_CHANGES", "false").lower() == "true"
 
         # Multi-instance control settings
         self.allow_multi_instance: bool = (
@@ -209,6 +253,71 @@ class BaseConfig(ABC):  # noqa
                 f"Invalid EXECUTION_MODE: {self.execution_mode}. Must be 'single' or 'continuous'"
             )
 
+        if self.download_workers < 1:
+            errors.append("DOWNLOAD_WORKERS must be at least 1")
+
+        if self.max_download_workers < self.download_workers:
+            errors.append("MAX_DOWNLOAD_WORKERS must not be less than DOWNLOAD_WORKERS")
+
+        if self.full_listing_interval_hours < 0:
+            errors.append("FULL_LISTING_INTERVAL_HOURS must not be negative")
+
+        if self.listing_prefetch_pages < 0:
+            errors.append("LISTING_PREFETCH_PAGES must not be negative")
+
+        if self.album_listing_workers < 1:
+            errors.append("ALBUM_LISTING_WORKERS must be at least 1")
+
+        if self.dedup_memory_budget_mb < 1:
+            errors.append("DEDUP_MEMORY_BUDGET_MB must be at least 1")
+
+        if self.download_order not in DOWNLOAD_ORDERS:
+            errors.append(
+                f"Invalid DOWNLOAD_ORDER: {self.download_order}. "
+                f"Must be one of: {', '.join(DOWNLOAD_ORDERS)}"
+            )
+
+        if self.download_lookahead < 1:
+            errors.append("DOWNLOAD_LOOKAHEAD must be at least 1")
+
+        if self.max_bandwidth_mbps < 0:
+            errors.append("MAX_BANDWIDTH_MBPS must not be negative")
+
+        try:
+            parse_bandwidth_schedule(self.bandwidth_schedule)
+        except ValueError as e:
+            errors.append(f"BANDWIDTH_SCHEDULE: {e}")
+
+        if self.http_connect_timeout_seconds <= 0:
+            errors.append("HTTP_CONNECT_TIMEOUT_SECONDS must be bigger than 0")
+
+        if self.http_read_timeout_seconds <= 0:
+            errors.append("HTTP_READ_TIMEOUT_SECONDS must be bigger than 0")
+
+        if self.retry_max_attempts < 1:
+            errors.append("RETRY_MAX_ATTEMPTS must be at least 1")
+
+        if self.retry_backoff_minutes < 0:
+            errors.append("RETRY_BACKOFF_MINUTES must not be negative")
+
+        if self.retry_max_backoff_hours * 60 < self.retry_backoff_minutes:
+            errors.append("RETRY_MAX_BACKOFF_HOURS must not be less than RETRY_BACKOFF_MINUTES")
+
+        if not 0 < self.circuit_breaker_failure_rate <= 1:
+            errors.append("CIRCUIT_BREAKER_FAILURE_RATE must be between 0 and 1")
+
+        if self.circuit_breaker_window < 1:
+            errors.append("CIRCUIT_BREAKER_WINDOW must be at least 1")
+
+        if self.circuit_breaker_open_seconds <= 0:
+            errors.append("CIRCUIT_BREAKER_OPEN_SECONDS must be bigger than 0")
+
+        if self.circuit_breaker_max_open_minutes * 60 < self.circuit_breaker_open_seconds:
+            errors.append(
+                "CIRCUIT_BREAKER_MAX_OPEN_MINUTES must not be less than "
+                "CIRCUIT_BREAKER_OPEN_SECONDS"
+            )
+
         if self.sync_interval_minutes <= 0:
             errors.append("SYNC_INTERVAL_MINUTES must be bigger than 0 minutes")
 
@@ -5,11 +5,17 @@ import threading
 import time
 from datetime import datetime, timedelta
 
+from .bandwidth import parse_bandwidth_schedule, scheduled_limit
+from .circuit_breaker import STATE_CLOSED
 from .config import BaseConfig
 from .deletion_tracker import DeletionTracker
+from .file_watcher import LocalChangeWatcher
 from .logger import get_logger
 from .sync import PhotoSyncer
 
+# Seconds between checks of the bandwidth schedule while a sync runs
+BANDWIDTH_SCHEDULE_CHECK_SECONDS = 30
+
 
 class ContinuousRunner:
     """Handles continuous execution mode with sync intervals and maintenance scheduling."""
@@ -26,6 +32,21 @@ class ContinuousRunner:
         self.shutdown_requested = False
         self.last_maintenance_time: datetime | None = None
 
+        # Syncer of the cycle currently running, if any
+        self._active_syncer: PhotoSyncer | None = None
+
+        # Records local deletions between cycles, if enabled and supported
+        self._watcher: LocalChangeWatcher | None = None
+
+        # Daily bandwidth windows, applied to the running sync by a scheduler thread
+        self.bandwidth_windows = parse_bandwidth_schedule(config.bandwidth_schedule)
+        self._bandwidth_scheduler_stop = threading.Event()
+
+        # Consecutive cycles that ended with iCloud unavailable (circuit breaker not
+        # closed), and how long the last one still kept it open
+        self._failing_cycles = 0
+        self._circuit_retry_after = 0.0
+
         # Synchronization for maintenance operations
         self.maintenance_lock = threading.Lock()
         self.maintenance_in_progress = threading.Event()
@@ -45,6 +66,16 @@ class ContinuousRunner:
         self.logger.info(f"Received {signal_name}, initiating graceful shutdown...")
         self.shutdown_requested = True
 
+        # Persist batched tracker records soon in case the process is killed. Only a
+        # flag is set here: committing from the signal handler could split a write
+        # the interrupted code is in the middle of.
+        syncer = self._active_syncer
+        if syncer is not None:
+            try:
+                syncer.request_pending_writes_flush()
+            except Exception as e:
+                self.logger.warning(f"Failed to flush pending tracker records: {e}")
+
     def run_single_sync(self) -> bool:
         """Run a single synchronization cycle.
 
@@ -61,6 +92,9 @@ class ContinuousRunner:
 
         self.logger.info("Starting single synchronization run")
         syncer = PhotoSyncer(self.config)
+        self._active_syncer = syncer
+        self._apply_bandwidth_schedule(syncer)
+        self._start_bandwidth_scheduler()
 
         try:
             success = syncer.sync()
@@ -73,6 +107,8 @@ class ContinuousRunner:
             return success
         finally:
             # Ensure proper cleanup
+            self._bandwidth_scheduler_stop.set()
+            self._active_syncer = None
             syncer.cleanup()
 
     def run_continuous_sync(self) -> None:
@@ -90,6 +126,11 @@ class ContinuousRunner:
         )
         maintenance_thread.start()
 
+        if self.config.watch_local_changes:
+            self._start_watcher()
+
+        self._start_bandwidth_scheduler()
+
         try:
             while self.running and not self.shutdown_requested:
                 # Run sync cycle
@@ -105,8 +146,60 @@ class ContinuousRunner:
             self.logger.info("Received keyboard interrupt")
         finally:
             self.running = False
+            self._bandwidth_scheduler_stop.set()
+            if self._watcher is not None:
+                self._watcher.stop()
+                self._watcher = None
             self.logger.info("Continuous execution mode stopped")
 
+    def _start_watcher(self) -> None:
+        """Start recording local deletions and restores as they happen."""
+        # Make sure the directory exists before putting a watch on it
+        self.config.ensure_sync_directory()
+        watcher = LocalChangeWatcher(
+            self.config.sync_directory,
+            self.config.database_path,
+            hold=self.maintenance_in_progress,
+        )
+        if watcher.start():
+            self._watcher = watcher
+
+    def _start_bandwidth_scheduler(self) -> None:
+        """Start applying the bandwidth schedule to running syncs, if one is configured."""
+        if not self.bandwidth_windows:
+            return
+        self._bandwidth_scheduler_stop.clear()
+        threading.Thread(
+            target=self._bandwidth_scheduler_worker, daemon=True, name="BandwidthScheduler"
+        ).start()
+
+    def _bandwidth_scheduler_worker(self) -> None:
+        """Background worker switching the bandwidth limit as schedule windows change."""
+        while not self._bandwidth_scheduler_stop.wait(BANDWIDTH_SCHEDULE_CHECK_SECONDS):
+            syncer = self._active_syncer
+            if syncer is None:
+                continue
+            try:
+                self._apply_bandwidth_schedule(syncer)
+            except Exception as e:
+                self.logger.error(f"Failed to apply bandwidth schedule: {e}")
+
+    def _apply_bandwidth_schedule(self, syncer: PhotoSyncer) -> None:
+        """Set the download bandwidth limit of a sync to the one scheduled for now.
+
+        Args:
+            syncer: Sync whose downloads are limited
+        """
+        limit = scheduled_limit(self.bandwidth_windows, self.config.max_bandwidth_mbps)
+        limiter = syncer.icloud_client.bandwidth_limiter
+        if limiter.limit_mbps == limit:
+            return
+        limiter.set_limit(limit)
+        if limit:
+            self.logger.info(f"🚦 Download bandwidth limited to {limit:g} Mbps")
+        else:
+            self.logger.info("🚦 Download bandwidth unlimited")
+
     def _run_sync_cycle(self) -> None:
         """Run a single sync cycle with error handling."""
         try:
@@ -122,6 +215,13 @@ class ContinuousRunner:
             self.logger.info(f"Starting sync cycle at {cycle_start.strftime('%Y-%m-%d %H:%M:%S')}")
 
             syncer = PhotoSyncer(self.config)
+            self._active_syncer = syncer
+            self._apply_bandwidth_schedule(syncer)
+
+            # Skip the deletion scan only if the watcher saw every change since last cycle
+            syncer.local_changes_watched = (
+                self._watcher is not None and not self._watcher.consume_resync_needed()
+            )
 
             try:
                 success = syncer.sync()
@@ -138,17 +238,61 @@ class ContinuousRunner:
                     duration_seconds = duration.total_seconds()
                     self.logger.error(f"❌ Sync cycle failed after {duration_seconds:.1f} seconds")
 
+                self._update_sync_backoff(syncer)
+
             finally:
                 # Ensure proper cleanup
+                self._active_syncer = None
                 syncer.cleanup()
 
         except Exception as e:
             self.logger.error(f"Sync cycle failed with error: {e}", exc_info=True)
 
+    def _update_sync_backoff(self, syncer: PhotoSyncer) -> None:
+        """Remember whether the cycle ended with iCloud unavailable.
+
+        Args:
+            syncer: Sync of the cycle that just finished
+        """
+        breaker = syncer.icloud_client.circuit_breaker
+        if breaker.state == STATE_CLOSED:
+            if self._failing_cycles:
+                self.logger.info("✅ iCloud is available again, back to the regular interval")
+            self._failing_cycles = 0
+            self._circuit_retry_after = 0.0
+        else:
+            self._failing_cycles += 1
+            self._circuit_retry_after = breaker.retry_after()
+
+    def _next_sync_wait_seconds(self) -> float:
+        """Get the time until the next cycle.
+
+        After cycles that ended with iCloud unavailable, the next cycle comes after the
+        circuit breaker's backoff instead of the sync interval: sooner after a short
+        outage, later while iCloud keeps failing.
+
+        Returns:
+            Seconds to wait
+        """
+        if not self._failing_cycles:
+            return self.config.sync_interval_minutes * 60
+        backoff = self.config.circuit_breaker_open_seconds * 2 ** min(self._failing_cycles - 1, 32)
+        return min(
+            max(backoff, self._circuit_retry_after),
+            self.config.circuit_breaker_max_open_minutes * 60,
+        )
+
     def _wait_for_next_sync(self) -> None:
         """Wait for the next sync interval, checking for shutdown periodically."""
-        wait_seconds = int(self.config.sync_interval_minutes * 60)
-        self.logger.info(f"Waiting {self.config.sync_interval_minutes} minutes until next sync...")
+        wait_seconds = int(self._next_sync_wait_seconds())
+        if self._failing_cycles:
+            self.logger.info(
+                f"🔌 iCloud unavailable, next sync attempt in {wait_seconds / 60:.1f} minutes..."
+            )
+        else:
+            self.logger.info(
+                f"Waiting {self.config.sync_interval_minutes} minutes until next sync..."
+            )
 
         # Check for shutdown every 5 seconds while waiting
         check_interval = 5
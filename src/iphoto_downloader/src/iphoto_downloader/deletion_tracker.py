@@ -1,14 +1,40 @@
 """Local deletion tracking using SQLite database."""
 
+import contextlib
 import gc
 import glob
+import os
 import shutil
 import sqlite3
+import threading
 import time
+import typing as t
 from datetime import datetime
 from pathlib import Path
 
+from .local_scanner import DirectoryEntry, LocalFileEntry, LocalSnapshot
 from .logger import get_logger
+from .retry_policy import RetryState
+
+# Pragmas applied to the tracker's long-lived connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    # Durable at checkpoints, never corrupts in WAL mode
+    "PRAGMA synchronous=NORMAL",
+    # Negative value means KiB, i.e. 16 MiB page cache
+    "PRAGMA cache_size=-16000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Number of compiled statements kept per connection
+STATEMENT_CACHE_SIZE = 256
+
+# Defaults for write batching, see DeletionTracker.begin_write_batch()
+WRITE_BATCH_SIZE = 200
+WRITE_BATCH_INTERVAL_SECONDS = 2.0
+
+# How often the flush thread of a write batch checks whether the batch is due
+WRITE_BATCH_POLL_SECONDS = 0.5
 
 
 class DeletionTracker:
@@ -22,19 +48,315 @@ class DeletionTracker:
         """
         self.db_path = Path(db_path)
 
+        # Long-lived connection, opened lazily and shared by all methods
+        self._conn: sqlite3.Connection | None = None
+        self._conn_lock = threading.RLock()
+
+        # Write batching state, see begin_write_batch()
+        self._batching = False
+        self._batch_max_writes = WRITE_BATCH_SIZE
+        self._batch_max_delay = WRITE_BATCH_INTERVAL_SECONDS
+        self._pending_writes = 0
+        self._batch_started = 0.0
+        self._flush_requested = False
+        self._flush_thread: threading.Thread | None = None
+        self._flush_thread_stop = threading.Event()
+
+        # Optional in-memory (photo_name, source_album_name) sets, see load_membership_index()
+        self._downloaded_index: set[tuple[str, str]] | None = None
+        self._deleted_index: set[tuple[str, str]] | None = None
+
         # Ensure database safety before any operations
         if not self.ensure_database_safety():
             raise RuntimeError("Failed to ensure database safety")
 
+        self._ensure_lookup_indexes()
+        self._ensure_local_scan_tables()
+        self._ensure_album_listing_table()
+        self._ensure_checksum_column()
+        self._ensure_retry_columns()
+
     @property
     def logger(self):
         """Get the global logger instance."""
         return get_logger()
 
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get the tracker's connection, opening and tuning it on first use.
+
+        Returns:
+            Open SQLite connection
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+            )
+            try:
+                for pragma in CONNECTION_PRAGMAS:
+                    conn.execute(pragma)
+            except Exception:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    @contextlib.contextmanager
+    def _connect(self) -> t.Iterator[sqlite3.Connection]:
+        """Use the tracker's connection inside a transaction.
+
+        Commits on success and rolls back on error, like ``with sqlite3.connect()``,
+        but without paying for a new connection per call. While a write batch is open,
+        statements join the batch transaction instead and are committed by flush(); on
+        error only the statements of this block are rolled back, through a savepoint,
+        so a half-applied multi-statement write is never committed with the batch.
+
+        Yields:
+            Open SQLite connection
+        """
+        with self._conn_lock:
+            conn = self._get_connection()
+            if not self._batching:
+                with conn:
+                    yield conn
+                return
+
+            # Outside a transaction, the block's first write starts the batch transaction
+            # and a rollback undoes exactly this block
+            nested = conn.in_transaction
+            if nested:
+                conn.execute("SAVEPOINT batch_write")
+            try:
+                yield conn
+            except BaseException:
+                if nested:
+                    conn.execute("ROLLBACK TO batch_write")
+                    conn.execute("RELEASE batch_write")
+                elif conn.in_transaction:
+                    conn.rollback()
+                raise
+            if nested:
+                conn.execute("RELEASE batch_write")
+
+    def begin_write_batch(
+        self,
+        max_writes: int = WRITE_BATCH_SIZE,
+        max_delay_seconds: float = WRITE_BATCH_INTERVAL_SECONDS,
+    ) -> None:
+        """Start grouping downloaded/deleted records into larger transactions.
+
+        Records added with add_downloaded_photo() and add_deleted_photo() are
+        committed together once ``max_writes`` records are pending or the batch is
+        older than ``max_delay_seconds``, and always on flush(), end_write_batch()
+        and close(). Reads through this tracker see pending records. A crash loses
+        at most the uncommitted batch, never leaves a partial one behind.
+
+        The age is also checked by a background thread, so the open transaction and
+        its database write lock are released while no records arrive, e.g. during a
+        long download. Other connections, like the file watcher's, can write then.
+
+        Args:
+            max_writes: Number of pending records that triggers a commit
+            max_delay_seconds: Age of the batch in seconds that triggers a commit
+        """
+        with self._conn_lock:
+            self.flush()
+            self._batch_max_writes = max(1, max_writes)
+            self._batch_max_delay = max_delay_seconds
+            self._batching = True
+            if self._flush_thread is None:
+                self._flush_thread_stop.clear()
+                self._flush_thread = threading.Thread(
+                    target=self._flush_worker, daemon=True, name="TrackerBatchFlush"
+                )
+                self._flush_thread.start()
+
+    def end_write_batch(self) -> None:
+        """Commit pending records and return to one transaction per write."""
+        with self._conn_lock:
+            try:
+                self.flush()
+            finally:
+                self._batching = False
+                self._flush_thread_stop.set()
+                flush_thread, self._flush_thread = self._flush_thread, None
+        if flush_thread is not None and flush_thread is not threading.current_thread():
+            flush_thread.join()
+
+    def request_flush(self) -> None:
+        """Ask for the open batch to be committed by its flush thread.
+
+        Safe to call from a signal handler: it only sets a flag. The commit waits for
+        the write in progress, so a multi-statement operation is never split.
+        """
+        self._flush_requested = True
+
+    def _flush_worker(self) -> None:
+        """Commit the open batch once it is old enough or a flush was requested."""
+        while not self._flush_thread_stop.wait(WRITE_BATCH_POLL_SECONDS):
+            with self._conn_lock:
+                if not self._batching:
+                    continue
+                due = self._pending_writes and (
+                    self._flush_requested
+                    or time.monotonic() - self._batch_started >= self._batch_max_delay
+                )
+                if not due:
+                    continue
+                try:
+                    self.flush()
+                except Exception as e:
+                    self.logger.warning(f"Failed to commit batched tracker records: {e}")
+
+    def flush(self) -> None:
+        """Commit all pending batched records."""
+        with self._conn_lock:
+            if self._conn is not None and self._conn.in_transaction:
+                self._conn.commit()
+                if self._pending_writes:
+                    self.logger.debug(f"📝 Committed {self._pending_writes} batched records")
+            self._pending_writes = 0
+            self._batch_started = time.monotonic()
+            self._flush_requested = False
+
+    def _note_batched_write(self) -> None:
+        """Count a write of the open batch and commit if the batch is full or old."""
+        if not self._batching:
+            return
+        self._pending_writes += 1
+        if (
+            self._pending_writes >= self._batch_max_writes
+            or time.monotonic() - self._batch_started >= self._batch_max_delay
+        ):
+            self.flush()
+
+    def _close_connection(self) -> None:
+        """Close the tracker's connection, checkpointing the WAL into the database."""
+        with self._conn_lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                finally:
+                    self._conn = None
+
+    def _remove_wal_files(self) -> None:
+        """Remove WAL sidecar files so they are not applied to a replaced database file."""
+        for suffix in ("-wal", "-shm"):
+            Path(f"{self.db_path}{suffix}").unlink(missing_ok=True)
+
+    def _ensure_lookup_indexes(self) -> None:
+        """Create composite indexes for the per-photo (name, album) lookups.
+
+        Databases created before these indexes existed only have single-column
+        indexes, which make every lookup scan the whole album. The photo id indexes
+        back the deleted/downloaded join and the removals by photo id.
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_downloaded_name_album
+                    ON downloaded_photos(photo_name, source_album_name)
+                """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_deleted_name_album
+                    ON deleted_photos(photo_name, source_album_name)
+                """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_downloaded_photo_id
+                    ON downloaded_photos(photo_id)
+                """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_deleted_photo_id
+                    ON deleted_photos(photo_id)
+                """)
+        except Exception as e:
+            self.logger.warning(f"Failed to create lookup indexes: {e}")
+
+    def _ensure_local_scan_tables(self) -> None:
+        """Create the tables holding the last scan of the sync directory.
+
+        The scan is a cache: losing it only costs one full scan of the sync directory.
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS local_scan_meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS local_directories (
+                        dir_path TEXT PRIMARY KEY,
+                        mtime REAL NOT NULL,
+                        child_count INTEGER NOT NULL
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS local_files (
+                        file_path TEXT PRIMARY KEY,
+                        dir_path TEXT NOT NULL,
+                        file_size INTEGER NOT NULL,
+                        mtime REAL NOT NULL,
+                        inode INTEGER NOT NULL
+                    )
+                """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_local_files_dir
+                    ON local_files(dir_path)
+                """)
+        except Exception as e:
+            self.logger.warning(f"Failed to create local scan tables: {e}")
+
+    def _ensure_album_listing_table(self) -> None:
+        """Create the table holding the per-album high-water marks of remote listings."""
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS album_listing_state (
+                        album_name TEXT NOT NULL,
+                        is_shared BOOLEAN NOT NULL,
+                        asset_count INTEGER NOT NULL,
+                        last_photo_id TEXT,
+                        full_listed_at REAL NOT NULL,
+                        PRIMARY KEY (album_name, is_shared)
+                    )
+                """)
+        except Exception as e:
+            self.logger.warning(f"Failed to create album listing table: {e}")
+
+    def _ensure_checksum_column(self) -> None:
+        """Add the content checksum column to databases created without it."""
+        try:
+            with self._connect() as conn:
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(downloaded_photos)")}
+                if columns and "checksum" not in columns:
+                    conn.execute("ALTER TABLE downloaded_photos ADD COLUMN checksum TEXT")
+        except Exception as e:
+            self.logger.warning(f"Failed to add checksum column: {e}")
+
+    def _ensure_retry_columns(self) -> None:
+        """Add the retry scheduling columns to photo_tracking tables created without them."""
+        try:
+            with self._connect() as conn:
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(photo_tracking)")}
+                if not columns:
+                    return
+                for column, column_type in (
+                    ("next_retry_at", "REAL"),
+                    ("album_position", "INTEGER"),
+                    ("last_error", "TEXT"),
+                ):
+                    if column not in columns:
+                        conn.execute(
+                            f"ALTER TABLE photo_tracking ADD COLUMN {column} {column_type}"
+                        )
+        except Exception as e:
+            self.logger.warning(f"Failed to add retry columns: {e}")
+
     def _init_database(self) -> None:
         """Initialize the SQLite database with album-aware schema."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 # Check current schema version
                 schema_version = self._get_schema_version(conn)
 
@@ -375,8 +697,15 @@ class DeletionTracker:
             # Create backup directory if it doesn't exist
             backup_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Copy the database file
-            shutil.copy2(self.db_path, backup_path)
+            # Copy through SQLite so committed pages still in the WAL are included,
+            # and store the backup as a standalone rollback-journal database
+            backup_conn = sqlite3.connect(backup_path)
+            try:
+                with self._conn_lock:
+                    self._get_connection().backup(backup_conn)
+                backup_conn.execute("PRAGMA journal_mode=DELETE")
+            finally:
+                backup_conn.close()
 
             # Clean up old backups
             self._cleanup_old_backups(max_backups)
@@ -409,7 +738,7 @@ class DeletionTracker:
             True if database is intact, False if corrupted
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("PRAGMA integrity_check")
                 result = cursor.fetchone()
@@ -461,6 +790,10 @@ class DeletionTracker:
                 if test_conn:
                     test_conn.close()
 
+            # Release the connection before the database file is replaced
+            self._close_connection()
+            self.clear_membership_index()
+
             # Create a backup of the corrupted database
             if self.db_path.exists():
                 try:
@@ -484,6 +817,7 @@ class DeletionTracker:
                         return False
 
             # Restore from backup
+            self._remove_wal_files()
             shutil.copy2(latest_backup, self.db_path)
             self.logger.info(f"Database recovered from backup: {latest_backup}")
 
@@ -530,12 +864,12 @@ class DeletionTracker:
                     corrupted_backup = self.db_path.with_suffix(f".corrupted_{timestamp}.db")
 
                     # Force close connections and wait a bit for Windows file handles
+                    self._close_connection()
                     gc.collect()
-                    import time
-
                     time.sleep(0.1)
 
                     shutil.move(self.db_path, corrupted_backup)
+                    self._remove_wal_files()
                     self._init_database()
                     # Create backup after recreating database
                     self.create_backup()
@@ -544,7 +878,9 @@ class DeletionTracker:
                     self.logger.error(f"Failed to move corrupted database: {e}")
                     # As last resort, just recreate the database
                     try:
+                        self._close_connection()
                         self.db_path.unlink(missing_ok=True)
+                        self._remove_wal_files()
                         self._init_database()
                         # Create backup after recreating database as last resort
                         self.create_backup()
@@ -569,7 +905,7 @@ class DeletionTracker:
             True if all required tables exist, False otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "SELECT name FROM sqlite_master WHERE type='table' AND name='deleted_photos'"
@@ -614,7 +950,7 @@ class DeletionTracker:
         if not source_album:
             source_album = "Unknown"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
                 """
                 INSERT OR REPLACE INTO deleted_photos
@@ -623,9 +959,77 @@ class DeletionTracker:
             """,
                 (filename, source_album, photo_id, datetime.now(), file_size, original_path),
             )
-            conn.commit()
+            if self._deleted_index is not None:
+                self._deleted_index.add((filename, source_album))
+            self._note_batched_write()
         self.logger.debug(f"📝 Recorded deleted photo: {filename} from {source_album}")
 
+    def load_membership_index(self) -> None:
+        """Load all (photo_name, source_album_name) pairs into memory with one query.
+
+        While loaded, is_photo_deleted() and is_photo_downloaded() are answered from
+        in-process sets instead of SQL lookups. Writes through this tracker keep the
+        sets up to date; writes by other connections are not seen until reloaded.
+        """
+        downloaded: set[tuple[str, str]] = set()
+        deleted: set[tuple[str, str]] = set()
+
+        with self._connect() as conn:
+            cursor = conn.execute("""
+                SELECT 0, photo_name, source_album_name FROM downloaded_photos
+                UNION ALL
+                SELECT 1, photo_name, source_album_name FROM deleted_photos
+            """)
+            for is_deleted, photo_name, source_album in cursor:
+                (deleted if is_deleted else downloaded).add((photo_name, source_album))
+
+            self._downloaded_index = downloaded
+            self._deleted_index = deleted
+
+        self.logger.debug(
+            f"Loaded membership index: {len(downloaded)} downloaded, {len(deleted)} deleted"
+        )
+
+    def clear_membership_index(self) -> None:
+        """Drop the in-memory index, lookups go to the database again."""
+        with self._conn_lock:
+            self._downloaded_index = None
+            self._deleted_index = None
+
+    def _delete_by_photo_id(
+        self,
+        conn: sqlite3.Connection,
+        table: str,
+        photo_id: str,
+        index: set[tuple[str, str]] | None,
+    ) -> None:
+        """Delete all rows of a photo id and keep the membership index coherent.
+
+        Args:
+            conn: Open SQLite connection
+            table: Either ``downloaded_photos`` or ``deleted_photos``
+            photo_id: Unique photo identifier
+            index: Membership index belonging to the table, or None if not loaded
+        """
+        if index is None:
+            conn.execute(f"DELETE FROM {table} WHERE photo_id = ?", (photo_id,))
+            return
+
+        affected = conn.execute(
+            f"SELECT photo_name, source_album_name FROM {table} WHERE photo_id = ?",
+            (photo_id,),
+        ).fetchall()
+        conn.execute(f"DELETE FROM {table} WHERE photo_id = ?", (photo_id,))
+
+        # Another photo id may still map to the same (name, album) pair
+        for photo_name, source_album in affected:
+            still_present = conn.execute(
+                f"SELECT 1 FROM {table} WHERE photo_name = ? AND source_album_name = ? LIMIT 1",
+                (photo_name, source_album),
+            ).fetchone()
+            if not still_present:
+                index.discard((photo_name, source_album))
+
     def is_deleted(self, photo_id: str) -> bool:
         """Check if a photo is marked as deleted (legacy method for backward compatibility).
 
@@ -635,7 +1039,7 @@ class DeletionTracker:
         Returns:
             True if photo is marked as deleted, False otherwise
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 "SELECT 1 FROM deleted_photos WHERE photo_id = ? LIMIT 1", (photo_id,)
             )
@@ -653,7 +1057,11 @@ class DeletionTracker:
         """
         source_album = album_name if album_name else "Unknown"
 
-        with sqlite3.connect(self.db_path) as conn:
+        deleted_index = self._deleted_index
+        if deleted_index is not None:
+            return (photo_name, source_album) in deleted_index
+
+        with self._connect() as conn:
             cursor = conn.execute(
                 """
                 SELECT 1 FROM deleted_photos
@@ -676,7 +1084,11 @@ class DeletionTracker:
         """
         source_album = album_name if album_name else "Unknown"
 
-        with sqlite3.connect(self.db_path) as conn:
+        downloaded_index = self._downloaded_index
+        if downloaded_index is not None:
+            return (photo_name, source_album) in downloaded_index
+
+        with self._connect() as conn:
             cursor = conn.execute(
                 """
                 SELECT 1 FROM downloaded_photos
@@ -697,7 +1109,7 @@ class DeletionTracker:
             True if filename is marked as deleted, False otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute(
                     "SELECT 1 FROM deleted_photos WHERE photo_name = ? LIMIT 1", (filename,)
                 )
@@ -712,7 +1124,7 @@ class DeletionTracker:
         Returns:
             Set of deleted photo IDs
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("SELECT photo_id FROM deleted_photos")
             return {row[0] for row in cursor.fetchall()}
 
@@ -722,18 +1134,51 @@ class DeletionTracker:
         Args:
             photo_id: Unique photo identifier
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM deleted_photos WHERE photo_id = ?", (photo_id,))
+        with self._connect() as conn:
+            self._delete_by_photo_id(conn, "deleted_photos", photo_id, self._deleted_index)
             conn.commit()
         self.logger.debug(f"🗑️ Removed photo from deletion tracker: {photo_id}")
 
+    def remove_deleted_photos(self, photo_ids: list[str]) -> None:
+        """Remove several photos from the deletion tracker in one transaction.
+
+        Args:
+            photo_ids: Unique photo identifiers
+        """
+        if not photo_ids:
+            return
+        with self._connect() as conn:
+            for photo_id in photo_ids:
+                self._delete_by_photo_id(conn, "deleted_photos", photo_id, self._deleted_index)
+        self.logger.debug(f"🗑️ Removed {len(photo_ids)} photos from deletion tracker")
+
+    def remove_deleted_copies(self, copies: list[tuple[str, str]]) -> None:
+        """Remove photos from the deletion tracker for single albums only.
+
+        Unlike remove_deleted_photos(), the copies of a photo in other albums stay
+        deleted.
+
+        Args:
+            copies: (photo_name, source_album_name) pairs
+        """
+        if not copies:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "DELETE FROM deleted_photos WHERE photo_name = ? AND source_album_name = ?",
+                copies,
+            )
+            if self._deleted_index is not None:
+                self._deleted_index.difference_update(copies)
+        self.logger.debug(f"🗑️ Removed {len(copies)} photos from deletion tracker")
+
     def get_stats(self) -> dict:
         """Get deletion tracker statistics.
 
         Returns:
             Dictionary with tracker statistics
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("SELECT COUNT(*) FROM deleted_photos")
             total_deleted = cursor.fetchone()[0]
 
@@ -759,6 +1204,7 @@ class DeletionTracker:
         local_path: str,
         file_size: int | None = None,
         album_name: str | None = None,
+        checksum: str | None = None,
     ) -> None:
         """Record a photo as successfully downloaded with album-aware tracking.
 
@@ -768,21 +1214,42 @@ class DeletionTracker:
             local_path: Local file path where photo was saved
             file_size: File size in bytes
             album_name: Album name where photo originated
+            checksum: SHA-256 hex digest of the file content, if known
         """
         try:
             # Use 'Unknown' if no album name provided
             source_album = album_name if album_name else "Unknown"
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute(
                     """
                     INSERT OR REPLACE INTO downloaded_photos
-                    (photo_name, source_album_name, photo_id, local_path, downloaded_at, file_size)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    (photo_name, source_album_name, photo_id, local_path, downloaded_at,
+                     file_size, checksum)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
-                    (filename, source_album, photo_id, local_path, datetime.now(), file_size),
+                    (
+                        filename,
+                        source_album,
+                        photo_id,
+                        local_path,
+                        datetime.now(),
+                        file_size,
+                        checksum,
+                    ),
                 )
-                conn.commit()
+                if checksum is not None:
+                    # Keeps find_cross_album_duplicates() current for tracked photos
+                    conn.execute(
+                        """
+                        UPDATE photo_tracking SET checksum = ?, updated_at = CURRENT_TIMESTAMP
+                        WHERE photo_id = ? AND album_name = ?
+                    """,
+                        (checksum, photo_id, source_album),
+                    )
+                if self._downloaded_index is not None:
+                    self._downloaded_index.add((filename, source_album))
+                self._note_batched_write()
             self.logger.debug(
                 f"📝 Recorded downloaded photo: {filename} from {source_album} -> {local_path}"
             )
@@ -796,10 +1263,10 @@ class DeletionTracker:
             Dictionary mapping photo_id to photo metadata
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     SELECT photo_name, source_album_name, photo_id, local_path,
-                           downloaded_at, file_size
+                           downloaded_at, file_size, checksum
                     FROM downloaded_photos
                 """)
                 result = {}
@@ -815,41 +1282,167 @@ class DeletionTracker:
                         "local_path": row[3],
                         "downloaded_at": row[4],
                         "file_size": row[5],
+                        "checksum": row[6],
                     }
                 return result
         except Exception as e:
             self.logger.error(f"❌ Failed to get downloaded photos: {e}")
             return {}
 
-    def detect_locally_deleted_photos(self, sync_directory: Path) -> list[dict]:
+    def get_downloaded_copies(self, photo_id: str) -> list[tuple[str, str | None]]:
+        """Get the local copies of a photo downloaded for any album.
+
+        Args:
+            photo_id: Unique photo identifier
+
+        Returns:
+            (local path relative to the sync directory, checksum or None) tuples,
+            oldest download first
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    """
+                    SELECT local_path, checksum FROM downloaded_photos
+                    WHERE photo_id = ?
+                    ORDER BY downloaded_at
+                """,
+                    (photo_id,),
+                )
+                return [(row[0], row[1]) for row in cursor.fetchall()]
+        except Exception as e:
+            self.logger.error(f"❌ Failed to get downloaded copies of {photo_id}: {e}")
+            return []
+
+    def iter_downloaded_files(self, batch_size: int = 1000) -> t.Iterator[dict]:
+        """Iterate over all downloaded photos in download order.
+
+        Rows are fetched in batches by rowid, so memory stays flat on large libraries
+        and the connection is not held between batches. Photos marked as deleted are
+        skipped, their files were removed on purpose.
+
+        Args:
+            batch_size: Rows fetched per query
+
+        Yields:
+            Dictionaries with photo_id, album_name, local_path, file_size and checksum
+        """
+        last_rowid = -1
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT rowid, photo_id, source_album_name, local_path, file_size, checksum
+                    FROM downloaded_photos dl
+                    WHERE rowid > ?
+                      AND NOT EXISTS (
+                        SELECT 1 FROM deleted_photos d
+                        WHERE d.photo_name = dl.photo_name
+                          AND d.source_album_name = dl.source_album_name
+                      )
+                    ORDER BY rowid
+                    LIMIT ?
+                    """,
+                    (last_rowid, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for rowid, photo_id, album_name, local_path, file_size, checksum in rows:
+                last_rowid = rowid
+                yield {
+                    "photo_id": photo_id,
+                    "album_name": album_name,
+                    "local_path": local_path,
+                    "file_size": file_size,
+                    "checksum": checksum,
+                }
+
+    def forget_downloaded_file(self, local_path: str) -> int:
+        """Forget the download of a local file, so the next sync downloads it again.
+
+        Unlike a local deletion, nothing is recorded in deleted_photos. The listing
+        state of the file's album is dropped as well, otherwise an incremental sync
+        would skip the unchanged album and never list the photo again.
+
+        Args:
+            local_path: Path relative to the sync directory
+
+        Returns:
+            Number of download records removed
+        """
+        try:
+            with self._connect() as conn:
+                affected = conn.execute(
+                    "SELECT photo_name, source_album_name FROM downloaded_photos "
+                    "WHERE local_path = ?",
+                    (local_path,),
+                ).fetchall()
+                conn.execute("DELETE FROM downloaded_photos WHERE local_path = ?", (local_path,))
+                conn.executemany(
+                    "DELETE FROM album_listing_state WHERE album_name = ?",
+                    {(source_album,) for _, source_album in affected},
+                )
+                if self._downloaded_index is not None:
+                    # Another copy may still be recorded under the same (name, album) pair
+                    for photo_name, source_album in affected:
+                        still_present = conn.execute(
+                            "SELECT 1 FROM downloaded_photos "
+                            "WHERE photo_name = ? AND source_album_name = ? LIMIT 1",
+                            (photo_name, source_album),
+                        ).fetchone()
+                        if not still_present:
+                            self._downloaded_index.discard((photo_name, source_album))
+                self._note_batched_write()
+            return len(affected)
+        except Exception as e:
+            self.logger.error(f"❌ Failed to forget download of {local_path}: {e}")
+            return 0
+
+    def detect_locally_deleted_photos(
+        self, sync_directory: Path, existing_paths: t.Container[str] | None = None
+    ) -> list[dict]:
         """Detect photos that were downloaded but are now missing locally.
 
+        Photos already marked as deleted are excluded in SQL, so the scan is a single
+        query plus one existence check per remaining downloaded photo.
+
         Args:
             sync_directory: Base sync directory path
+            existing_paths: Relative paths known to exist, e.g. a LocalSnapshot; if not
+                given, every path is checked on disk
 
         Returns:
             List of photo metadata dictionaries for detected deletions
         """
         deleted_photos = []
         try:
-            downloaded_photos = self.get_downloaded_photos()
+            with self._connect() as conn:
+                rows = conn.execute("""
+                    SELECT dl.photo_id, dl.photo_name, dl.local_path, dl.file_size,
+                           dl.source_album_name
+                    FROM downloaded_photos dl
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM deleted_photos d
+                        WHERE d.photo_name = dl.photo_name
+                          AND d.source_album_name = dl.source_album_name
+                    )
+                """).fetchall()
 
-            for _, metadata in downloaded_photos.items():
-                # Check if this photo is already marked as deleted
-                if self.is_photo_deleted(metadata["filename"], metadata["album_name"]):
-                    continue
+            # A photo downloaded for several albums has one file per album, each is
+            # checked on its own; a file recorded more than once: the last row wins
+            candidates = {(row[1], row[4]): row for row in rows}
 
+            for photo_id, filename, local_path, file_size, album_name in candidates.values():
                 # Check if the file still exists locally
-                local_path = sync_directory / metadata["local_path"]
-                if not local_path.exists():
+                if not self._local_file_exists(sync_directory, local_path, existing_paths):
                     # Photo was deleted locally
                     deleted_photos.append(
                         {
-                            "photo_id": metadata["photo_id"],
-                            "filename": metadata["filename"],
-                            "local_path": metadata["local_path"],
-                            "file_size": metadata["file_size"],
-                            "album_name": metadata["album_name"],
+                            "photo_id": photo_id,
+                            "filename": filename,
+                            "local_path": local_path,
+                            "file_size": file_size,
+                            "album_name": album_name,
                         }
                     )
 
@@ -859,6 +1452,248 @@ class DeletionTracker:
             self.logger.error(f"❌ Error detecting locally deleted photos: {e}")
             return []
 
+    def detect_restored_photos(
+        self, sync_directory: Path, existing_paths: t.Container[str] | None = None
+    ) -> list[dict]:
+        """Detect deleted photos whose downloaded file is back in the sync directory.
+
+        Deleted and downloaded records are matched with one join on the photo name and
+        album, so only photos that are both deleted and known to the download tracker
+        are checked on disk. Copies of a photo in other albums are checked separately.
+
+        Args:
+            sync_directory: Base sync directory path
+            existing_paths: Relative paths known to exist, e.g. a LocalSnapshot; if not
+                given, every path is checked on disk
+
+        Returns:
+            List of dictionaries with ``photo_id``, ``filename``, ``album_name`` and
+            ``local_path`` of restored photos
+        """
+        try:
+            with self._connect() as conn:
+                rows = conn.execute("""
+                    SELECT dl.photo_name, dl.source_album_name, dl.photo_id, dl.local_path
+                    FROM deleted_photos d
+                    JOIN downloaded_photos dl
+                      ON dl.photo_name = d.photo_name
+                     AND dl.source_album_name = d.source_album_name
+                """).fetchall()
+
+            # The join repeats a photo for every matching row; check each copy once
+            candidates = {(row[0], row[1]): row for row in rows}
+
+            return [
+                {
+                    "photo_id": photo_id,
+                    "filename": filename,
+                    "album_name": album_name,
+                    "local_path": local_path,
+                }
+                for filename, album_name, photo_id, local_path in candidates.values()
+                if self._local_file_exists(sync_directory, local_path, existing_paths)
+            ]
+
+        except Exception as e:
+            self.logger.error(f"❌ Error detecting restored photos: {e}")
+            return []
+
+    def record_local_deletion(self, local_path: str, is_directory: bool = False) -> int | None:
+        """Mark downloaded photos as deleted after their file disappeared.
+
+        Used by the file watcher to record deletions as they happen.
+
+        Args:
+            local_path: Path relative to the sync directory, with "/" separators
+            is_directory: Whether ``local_path`` is a directory; all photos below it
+                are marked then
+
+        Returns:
+            Number of photos marked as deleted, or None if the database could not be
+            updated, e.g. because it is locked
+        """
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT dl.photo_id, dl.photo_name, dl.local_path, dl.file_size,
+                           dl.source_album_name
+                    FROM downloaded_photos dl
+                    WHERE {self._local_path_condition(is_directory)}
+                      AND NOT EXISTS (
+                        SELECT 1 FROM deleted_photos d
+                        WHERE d.photo_name = dl.photo_name
+                          AND d.source_album_name = dl.source_album_name
+                      )
+                    """,
+                    self._local_path_params(local_path, is_directory),
+                ).fetchall()
+
+            # Unlike mark_photos_as_deleted(), a failed record is reported to the caller
+            for photo_id, filename, path, file_size, album_name in rows:
+                self.add_deleted_photo(
+                    photo_id=photo_id,
+                    filename=filename,
+                    file_size=file_size,
+                    original_path=path,
+                    album_name=album_name,
+                )
+                self.logger.info(f"🗑️ Marked as deleted: {path}")
+            return len(rows)
+
+        except Exception as e:
+            self.logger.error(f"❌ Failed to record local deletion of {local_path}: {e}")
+            return None
+
+    def record_local_restore(self, local_path: str) -> int | None:
+        """Forget deletions of photos whose file reappeared.
+
+        Used by the file watcher to record restores as they happen.
+
+        Args:
+            local_path: Path relative to the sync directory, with "/" separators
+
+        Returns:
+            Number of photos removed from the deletion tracker, or None if the database
+            could not be updated
+        """
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT DISTINCT d.photo_name, d.source_album_name
+                    FROM deleted_photos d
+                    JOIN downloaded_photos dl
+                      ON dl.photo_name = d.photo_name
+                     AND dl.source_album_name = d.source_album_name
+                    WHERE dl.local_path = ?
+                    """,
+                    (local_path,),
+                ).fetchall()
+
+            self.remove_deleted_copies(rows)
+            if rows:
+                self.logger.info(f"🔄 Restored deleted photo: {local_path}")
+            return len(rows)
+
+        except Exception as e:
+            self.logger.error(f"❌ Failed to record local restore of {local_path}: {e}")
+            return None
+
+    @staticmethod
+    def _local_path_condition(is_directory: bool) -> str:
+        """SQL condition on ``dl.local_path`` for a file or everything below a directory."""
+        if is_directory:
+            # substr() instead of LIKE, album folders may contain % or _
+            return "substr(dl.local_path, 1, ?) = ?"
+        return "dl.local_path = ?"
+
+    @staticmethod
+    def _local_path_params(local_path: str, is_directory: bool) -> tuple:
+        """Parameters matching _local_path_condition()."""
+        if is_directory:
+            prefix = local_path.rstrip("/") + "/"
+            return (len(prefix), prefix)
+        return (local_path,)
+
+    def load_local_snapshot(self, sync_directory: Path) -> LocalSnapshot | None:
+        """Load the scan of the sync directory stored by the previous sync.
+
+        Args:
+            sync_directory: Base sync directory path
+
+        Returns:
+            The stored snapshot, or None if there is none for this directory
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value FROM local_scan_meta WHERE key = 'root'"
+                ).fetchone()
+                if row is None or row[0] != str(sync_directory):
+                    return None
+
+                directories = {
+                    dir_path: DirectoryEntry(mtime, child_count)
+                    for dir_path, mtime, child_count in conn.execute(
+                        "SELECT dir_path, mtime, child_count FROM local_directories"
+                    )
+                }
+                files = {
+                    file_path: LocalFileEntry(file_size, mtime, inode)
+                    for file_path, file_size, mtime, inode in conn.execute(
+                        "SELECT file_path, file_size, mtime, inode FROM local_files"
+                    )
+                }
+
+            return LocalSnapshot(sync_directory, files, directories)
+
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to load local scan, doing a full scan: {e}")
+            return None
+
+    def save_local_snapshot(self, snapshot: LocalSnapshot) -> None:
+        """Store a scan of the sync directory for the next sync.
+
+        Only directories listed or removed since the previous snapshot are rewritten.
+
+        Args:
+            snapshot: Scan to store
+        """
+        try:
+            with self._connect() as conn:
+                stale = snapshot.stale_directories
+                if stale is None:
+                    # Full scan, replace everything
+                    conn.execute("DELETE FROM local_directories")
+                    conn.execute("DELETE FROM local_files")
+                    stale = set(snapshot.directories)
+                else:
+                    for dir_path in stale:
+                        conn.execute(
+                            "DELETE FROM local_directories WHERE dir_path = ?", (dir_path,)
+                        )
+                        conn.execute("DELETE FROM local_files WHERE dir_path = ?", (dir_path,))
+
+                conn.executemany(
+                    "INSERT INTO local_directories (dir_path, mtime, child_count) VALUES (?, ?, ?)",
+                    (
+                        (dir_path, *snapshot.directories[dir_path])
+                        for dir_path in stale
+                        if dir_path in snapshot.directories
+                    ),
+                )
+                file_rows = []
+                for file_path, entry in snapshot.files.items():
+                    dir_path = os.path.dirname(file_path)
+                    if dir_path in stale:
+                        file_rows.append((file_path, dir_path, *entry))
+                conn.executemany(
+                    """
+                    INSERT INTO local_files (file_path, dir_path, file_size, mtime, inode)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    file_rows,
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO local_scan_meta (key, value) VALUES ('root', ?)",
+                    (str(snapshot.root),),
+                )
+
+            self.logger.debug(f"💾 Stored local scan ({len(stale)} directories updated)")
+
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to store local scan: {e}")
+
+    @staticmethod
+    def _local_file_exists(
+        sync_directory: Path, local_path: str, existing_paths: t.Container[str] | None
+    ) -> bool:
+        """Check a recorded local path against a scan, or on disk if there is none."""
+        if existing_paths is not None:
+            return local_path in existing_paths
+        return (sync_directory / local_path).exists()
+
     def mark_photos_as_deleted(self, deleted_photos: list[dict]) -> None:
         """Mark multiple photos as deleted based on deletion detection.
 
@@ -887,8 +1722,10 @@ class DeletionTracker:
             photo_id: Unique photo identifier
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("DELETE FROM downloaded_photos WHERE photo_id = ?", (photo_id,))
+            with self._connect() as conn:
+                self._delete_by_photo_id(
+                    conn, "downloaded_photos", photo_id, self._downloaded_index
+                )
                 conn.commit()
             self.logger.debug(f"🗑️ Removed photo from download tracker: {photo_id}")
         except Exception as e:
@@ -916,7 +1753,7 @@ class DeletionTracker:
             **kwargs: Additional optional parameters
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute(
                     """
                     INSERT OR REPLACE INTO photo_tracking
@@ -940,7 +1777,7 @@ class DeletionTracker:
             total_photos: Total number of photos in album
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute(
                     """
                     INSERT OR REPLACE INTO album_tracking
@@ -954,6 +1791,59 @@ class DeletionTracker:
         except Exception as e:
             self.logger.error(f"❌ Failed to track album {album_name}: {e}")
 
+    def get_album_listing_states(self) -> dict[tuple[str, bool], dict]:
+        """Get the high-water marks of the last album listings.
+
+        Returns:
+            Dictionary mapping (album name, is shared) to listing state
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute("""
+                    SELECT album_name, is_shared, asset_count, last_photo_id, full_listed_at
+                    FROM album_listing_state
+                """)
+                return {
+                    (row[0], bool(row[1])): {
+                        "asset_count": row[2],
+                        "last_photo_id": row[3],
+                        "full_listed_at": row[4],
+                    }
+                    for row in cursor.fetchall()
+                }
+        except Exception as e:
+            self.logger.error(f"❌ Failed to get album listing states: {e}")
+            return {}
+
+    def save_album_listing_states(self, states: dict[tuple[str, bool], dict]) -> None:
+        """Store the high-water marks of album listings.
+
+        Args:
+            states: Dictionary mapping (album name, is shared) to listing state
+        """
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO album_listing_state
+                    (album_name, is_shared, asset_count, last_photo_id, full_listed_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            album_name,
+                            is_shared,
+                            state["asset_count"],
+                            state["last_photo_id"],
+                            state["full_listed_at"],
+                        )
+                        for (album_name, is_shared), state in states.items()
+                    ],
+                )
+            self.logger.debug(f"📁 Stored listing state of {len(states)} albums")
+        except Exception as e:
+            self.logger.error(f"❌ Failed to store album listing states: {e}")
+
     def get_all_tracked_photos(self) -> list[dict]:
         """Get all tracked photos with their metadata.
 
@@ -961,7 +1851,7 @@ class DeletionTracker:
             List of dictionaries containing photo data
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     SELECT photo_id, album_name, filename, local_path, file_size,
                            checksum, sync_status, created_at
@@ -995,7 +1885,7 @@ class DeletionTracker:
             List of dictionaries containing photo data
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute(
                     """
                     SELECT photo_id, album_name, filename, local_path, file_size,
@@ -1032,7 +1922,7 @@ class DeletionTracker:
             status: New sync status
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute(
                     """
                     UPDATE photo_tracking
@@ -1057,7 +1947,7 @@ class DeletionTracker:
             Sync status string
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute(
                     """
                     SELECT sync_status FROM photo_tracking
@@ -1079,7 +1969,7 @@ class DeletionTracker:
             synced_photos: Number of photos synced
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute(
                     """
                     UPDATE album_tracking
@@ -1103,7 +1993,7 @@ class DeletionTracker:
             Dictionary with album statistics
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute(
                     """
                     SELECT is_shared, total_photos, synced_photos, created_at, last_sync
@@ -1144,7 +2034,7 @@ class DeletionTracker:
             status: New sync status
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute(
                     """
                     UPDATE album_tracking
@@ -1165,7 +2055,7 @@ class DeletionTracker:
             photos_data: List of photo dictionaries with required fields
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.executemany(
                     """
                     INSERT OR REPLACE INTO photo_tracking
@@ -1202,7 +2092,7 @@ class DeletionTracker:
         try:
             cutoff_timestamp = time.time() - (days_old * 24 * 60 * 60)
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute(
                     """
                     DELETE FROM photo_tracking
@@ -1227,7 +2117,7 @@ class DeletionTracker:
             List of duplicate groups
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     SELECT checksum, GROUP_CONCAT(photo_id || ':' || album_name) as locations,
                            COUNT(*) as duplicate_count
@@ -1263,31 +2153,134 @@ class DeletionTracker:
             self.logger.error(f"❌ Failed to find duplicates: {e}")
             return []
 
-    def record_sync_error(self, photo_id: str, album_name: str, error_message: str) -> None:
-        """Record a sync error for a photo.
+    def record_sync_error(
+        self,
+        photo_id: str,
+        album_name: str,
+        error_message: str,
+        filename: str | None = None,
+        local_path: str | None = None,
+        album_position: int | None = None,
+    ) -> int:
+        """Record a sync error for a photo, tracking the photo if it is not yet.
 
         Args:
             photo_id: Photo identifier
             album_name: Album name
             error_message: Error message
+            filename: Photo filename, needed to track a photo seen for the first time
+            local_path: Target path relative to the sync directory
+            album_position: Position of the photo in its album when it was listed
+
+        Returns:
+            Number of errors recorded for the photo so far, 0 if recording failed
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute(
                     """
-                    UPDATE photo_tracking
-                    SET sync_status = 'failed',
+                    INSERT INTO photo_tracking
+                    (photo_id, album_name, filename, local_path, sync_status,
+                     last_sync_attempt, error_count, album_position, last_error)
+                    VALUES (?, ?, ?, ?, 'failed', CURRENT_TIMESTAMP, 1, ?, ?)
+                    ON CONFLICT (photo_id, album_name) DO UPDATE SET
+                        sync_status = 'failed',
                         error_count = error_count + 1,
                         last_sync_attempt = CURRENT_TIMESTAMP,
+                        local_path = COALESCE(excluded.local_path, local_path),
+                        album_position = COALESCE(excluded.album_position, album_position),
+                        last_error = excluded.last_error,
                         updated_at = CURRENT_TIMESTAMP
-                    WHERE photo_id = ? AND album_name = ?
                 """,
-                    (photo_id, album_name),
+                    (
+                        photo_id,
+                        album_name,
+                        filename or "",
+                        local_path,
+                        album_position,
+                        error_message,
+                    ),
                 )
-                conn.commit()
+                row = conn.execute(
+                    "SELECT error_count FROM photo_tracking WHERE photo_id = ? AND album_name = ?",
+                    (photo_id, album_name),
+                ).fetchone()
+                self._note_batched_write()
             self.logger.debug(f"🚫 Recorded sync error for {photo_id}: {error_message}")
+            return row[0] if row else 0
         except Exception as e:
             self.logger.error(f"❌ Failed to record sync error: {e}")
+            return 0
+
+    def schedule_retry(self, photo_id: str, album_name: str, next_retry_at: float) -> None:
+        """Set when a failed photo is due for its next attempt.
+
+        Args:
+            photo_id: Photo identifier
+            album_name: Album name
+            next_retry_at: Epoch seconds of the next attempt
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    UPDATE photo_tracking SET next_retry_at = ?
+                    WHERE photo_id = ? AND album_name = ?
+                """,
+                    (next_retry_at, photo_id, album_name),
+                )
+                self._note_batched_write()
+        except Exception as e:
+            self.logger.error(f"❌ Failed to schedule retry: {e}")
+
+    def clear_sync_error(self, photo_id: str, album_name: str) -> None:
+        """Mark a previously failed photo as synced and reset its error count.
+
+        Args:
+            photo_id: Photo identifier
+            album_name: Album name
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    UPDATE photo_tracking
+                    SET sync_status = 'completed',
+                        error_count = 0,
+                        next_retry_at = NULL,
+                        last_error = NULL,
+                        last_sync_attempt = CURRENT_TIMESTAMP,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE photo_id = ? AND album_name = ?
+                """,
+                    (photo_id, album_name),
+                )
+                self._note_batched_write()
+        except Exception as e:
+            self.logger.error(f"❌ Failed to clear sync error: {e}")
+
+    def get_retry_states(self) -> dict[tuple[str, str], RetryState]:
+        """Get the failure history of all photos whose last attempt failed.
+
+        Returns:
+            Retry state by (photo_id, album_name)
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    """
+                    SELECT photo_id, album_name, error_count, next_retry_at
+                    FROM photo_tracking
+                    WHERE sync_status = 'failed'
+                """
+                )
+                return {
+                    (photo_id, album_name): RetryState(error_count or 0, next_retry_at)
+                    for photo_id, album_name, error_count, next_retry_at in cursor
+                }
+        except Exception as e:
+            self.logger.error(f"❌ Failed to get retry states: {e}")
+            return {}
 
     def get_album_sync_progress(self, album_name: str) -> dict:
         """Get detailed sync progress for an album.
@@ -1299,7 +2292,7 @@ class DeletionTracker:
             Dictionary with progress information
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 # Get album metadata
                 cursor = conn.execute(
                     """
@@ -1371,7 +2364,7 @@ class DeletionTracker:
             List of album dictionaries
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute(
                     """
                     SELECT album_name, is_shared, total_photos, synced_photos,
@@ -1408,7 +2401,7 @@ class DeletionTracker:
             Dictionary with photo information
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute(
                     """
                     SELECT photo_id, album_name, filename, local_path, file_size,
@@ -1440,26 +2433,32 @@ class DeletionTracker:
             self.logger.error(f"❌ Failed to get photo info: {e}")
             return {}
 
-    def get_photos_for_retry(self, max_errors: int = 3) -> list[dict]:
+    def get_photos_for_retry(
+        self, max_errors: int = 3, due_before: float | None = None
+    ) -> list[dict]:
         """Get photos that are eligible for retry based on error count.
 
         Args:
             max_errors: Maximum error count for retry eligibility
+            due_before: Only photos whose scheduled retry is not later than this epoch
+                time, or None for all
 
         Returns:
-            List of photo dictionaries eligible for retry
+            List of photo dictionaries eligible for retry, longest waiting first
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute(
                     """
                     SELECT photo_id, album_name, filename, local_path, file_size,
-                           checksum, sync_status, last_sync_attempt, error_count, created_at
+                           checksum, sync_status, last_sync_attempt, error_count, created_at,
+                           next_retry_at, album_position
                     FROM photo_tracking
                     WHERE sync_status = 'failed' AND error_count < ?
+                    AND (? IS NULL OR next_retry_at IS NULL OR next_retry_at <= ?)
                     ORDER BY last_sync_attempt ASC
                 """,
-                    (max_errors,),
+                    (max_errors, due_before, due_before),
                 )
 
                 columns = [
@@ -1473,6 +2472,8 @@ class DeletionTracker:
                     "last_sync_attempt",
                     "error_count",
                     "created_at",
+                    "next_retry_at",
+                    "album_position",
                 ]
                 return [dict(zip(columns, row, strict=False)) for row in cursor.fetchall()]
         except Exception as e:
@@ -1480,33 +2481,26 @@ class DeletionTracker:
             return []
 
     def close(self) -> None:
-        """Close any open database connections.
+        """Commit pending batched records and close the database connection.
 
         This is useful for ensuring proper cleanup, especially on Windows
-        where file handles may prevent directory cleanup.
+        where file handles may prevent directory cleanup. The connection is
+        reopened transparently if the tracker is used again.
         """
-        # Force garbage collection to close any remaining connections
-        gc.collect()
+        # Ignore errors during cleanup
+        with contextlib.suppress(Exception):
+            self.end_write_batch()
+        with contextlib.suppress(Exception):
+            self._close_connection()
 
-        # Try to close any lingering connections by connecting and closing immediately
-        try:
-            if self.db_path.exists():
-                conn = sqlite3.connect(self.db_path)
-                conn.close()
-        except Exception:
-            pass  # Ignore errors during cleanup
+        # Force garbage collection to release any remaining handles
+        gc.collect()
 
-        # Also close connections to any backup files
+    def __del__(self):
+        """Destructor to ensure the connection is closed."""
+        # contextlib may already be torn down at interpreter exit
         try:
-            backup_pattern = str(self.db_path.with_suffix(".backup_*.db"))
-            backup_files = glob.glob(backup_pattern)
-            for backup_file in backup_files:
-                try:
-                    backup_path = Path(backup_file)
-                    if backup_path.exists():
-                        conn = sqlite3.connect(backup_path)
-                        conn.close()
-                except Exception:
-                    pass  # Ignore errors during cleanup
+            self.end_write_batch()
+            self._close_connection()
         except Exception:
-            pass  # Ignore errors during cleanup
+            pass
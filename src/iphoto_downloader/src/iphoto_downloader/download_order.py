@@ -0,0 +1,86 @@
+"""Reordering of listed photos within a look-ahead window before downloading."""
+
+import heapq
+import itertools
+import typing as t
+
+from .photo_record import PhotoRecord
+
+ORDER_LISTING = "listing"
+ORDER_SMALL_FIRST = "small-first"
+ORDER_LARGE_FIRST = "large-first"
+ORDER_NEWEST_FIRST = "newest-first"
+
+DOWNLOAD_ORDERS = (ORDER_LISTING, ORDER_SMALL_FIRST, ORDER_LARGE_FIRST, ORDER_NEWEST_FIRST)
+
+
+def _newest_first_key(record: PhotoRecord) -> tuple[bool, float]:
+    """Sort key putting recent photos first and photos without date last."""
+    created = record.created
+    if created is None or not hasattr(created, "timestamp"):
+        return (True, 0.0)
+    return (False, -created.timestamp())
+
+
+_ORDER_KEYS: dict[str, t.Callable[[PhotoRecord], t.Any]] = {
+    ORDER_SMALL_FIRST: lambda record: record.size or 0,
+    ORDER_LARGE_FIRST: lambda record: -(record.size or 0),
+    ORDER_NEWEST_FIRST: _newest_first_key,
+}
+
+
+class LookaheadWindow:
+    """Iterate over photos reordered within a sliding window of the listing.
+
+    Up to ``size`` listed photos are held in a heap; each further photo listed lets
+    the first one by the order's key through. Ties keep their listing order. The
+    listing is never read more than ``size`` photos ahead, so memory stays bounded
+    and downloads start as soon as the window is filled.
+    """
+
+    def __init__(
+        self,
+        photos: t.Iterable[PhotoRecord | t.Mapping[str, t.Any]],
+        order: str,
+        size: int,
+    ) -> None:
+        """Initialize window.
+
+        Args:
+            photos: Listed photos, as records or metadata dictionaries
+            order: One of ``DOWNLOAD_ORDERS``
+            size: Number of photos reordered at a time
+
+        Raises:
+            ValueError: If the order is unknown
+        """
+        if order not in DOWNLOAD_ORDERS:
+            raise ValueError(f"Unknown download order '{order}'")
+        self._photos = photos
+        self._key = _ORDER_KEYS.get(order)
+        self._size = max(1, size)
+        self._heap: list[tuple[t.Any, int, PhotoRecord]] = []
+
+    def __iter__(self) -> t.Iterator[PhotoRecord | t.Mapping[str, t.Any]]:
+        """Yield the photos in window order."""
+        if self._key is None:
+            yield from self._photos
+            return
+
+        sequence = itertools.count()
+        for listed_photo in self._photos:
+            try:
+                photo = PhotoRecord.coerce(listed_photo)
+            except Exception:
+                # Let the caller report the malformed entry right away
+                yield listed_photo
+                continue
+            heapq.heappush(self._heap, (self._key(photo), next(sequence), photo))
+            if len(self._heap) >= self._size:
+                yield heapq.heappop(self._heap)[2]
+        while self._heap:
+            yield heapq.heappop(self._heap)[2]
+
+    def pending(self) -> list[PhotoRecord]:
+        """Get the photos listed but not yet yielded."""
+        return [entry[2] for entry in self._heap]
@@ -0,0 +1,67 @@
+"""Place one downloaded file at several paths without copying its data."""
+
+import contextlib
+import os
+from pathlib import Path
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows
+    FCNTL_AVAILABLE = False
+
+# ioctl request cloning a whole file on copy-on-write filesystems (Btrfs, XFS), Linux only
+FICLONE = 0x40049409
+
+
+def link_or_clone(source: Path, target: Path) -> str | None:
+    """Create ``target`` sharing the data of ``source``.
+
+    A hard link is tried first. Where hard links are impossible (other filesystem,
+    no support) the file is cloned as a reflink if the filesystem supports it, so
+    the copy shares blocks on disk until either side is modified.
+
+    Args:
+        source: Existing file
+        target: Path to create, must not exist
+
+    Returns:
+        "hardlink" or "reflink" for the method used, None if neither is supported
+    """
+    try:
+        os.link(source, target)
+        return "hardlink"
+    except FileExistsError:
+        raise
+    except OSError:
+        pass
+
+    if _reflink(source, target):
+        return "reflink"
+    return None
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    """Clone a file with the FICLONE ioctl.
+
+    Returns:
+        True if the clone was created, False if unsupported
+    """
+    if not FCNTL_AVAILABLE:
+        return False
+
+    try:
+        with open(source, "rb") as src, open(target, "xb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except FileExistsError:
+        raise
+    except OSError:
+        # EOPNOTSUPP, EXDEV, EINVAL: no reflinks between these paths
+        pass
+
+    # The empty target created for the ioctl must not look like a finished photo
+    with contextlib.suppress(OSError):
+        os.remove(target)
+    return False
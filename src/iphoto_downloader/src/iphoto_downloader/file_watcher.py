@@ -0,0 +1,363 @@
+"""Watch the sync directory for local deletions and restores using Linux inotify."""
+
+import contextlib
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+
+from .deletion_tracker import DeletionTracker
+from .icloud_client import PARTIAL_DOWNLOAD_SUFFIX
+from .logger import get_logger
+
+# inotify event flags, see inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+
+# Files count as restored once completely written or moved in, never on bare creation
+WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+    | IN_DONT_FOLLOW
+)
+
+# struct inotify_event header: wd, mask, cookie, len
+EVENT_HEADER = struct.Struct("iIII")
+READ_BUFFER_SIZE = 64 * 1024
+
+# How often the watcher thread wakes up to apply events held back during maintenance
+POLL_INTERVAL_SECONDS = 1.0
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    """Load libc if it provides the inotify API."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not all(
+        hasattr(libc, name) for name in ("inotify_init1", "inotify_add_watch", "inotify_rm_watch")
+    ):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+def inotify_available() -> bool:
+    """Check whether local change watching is supported on this platform.
+
+    Returns:
+        True on Linux with an inotify capable libc
+    """
+    return _load_libc() is not None
+
+
+class LocalChangeWatcher:
+    """Records local deletions and restores into the deletion tracker as they happen.
+
+    While the watcher runs without losing events, sync cycles can skip scanning for
+    locally deleted photos. Any gap (queue overflow, watch limit, errors) is reported
+    through consume_resync_needed() so the next cycle falls back to a full check.
+    """
+
+    def __init__(
+        self,
+        sync_directory: Path,
+        database_path: Path,
+        hold: threading.Event | None = None,
+    ) -> None:
+        """Initialize local change watcher.
+
+        Args:
+            sync_directory: Directory to watch
+            database_path: Path of the deletion tracker database
+            hold: While set, events are collected but not written, e.g. during database
+                maintenance
+        """
+        self.sync_directory = Path(sync_directory)
+        self.database_path = Path(database_path)
+        self.logger = get_logger()
+        self._hold = hold
+
+        self._libc: ctypes.CDLL | None = None
+        self._fd: int | None = None
+        self._stop_pipe: tuple[int, int] | None = None
+        self._thread: threading.Thread | None = None
+        self._tracker: DeletionTracker | None = None
+
+        # Watch descriptor <-> directory path relative to the sync directory ("" is root)
+        self._wd_paths: dict[int, str] = {}
+        self._path_wds: dict[str, int] = {}
+
+        # Set whenever events may have been missed; the first cycle always checks fully
+        self._resync_needed = threading.Event()
+        self._resync_needed.set()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the watcher thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Start watching the sync directory in a background thread.
+
+        Returns:
+            True if the watcher is running, False if it is unavailable or failed
+        """
+        self._libc = _load_libc()
+        if self._libc is None:
+            self.logger.info("👀 Local change watching needs Linux inotify, using periodic scans")
+            return False
+
+        try:
+            fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                err = ctypes.get_errno()
+                raise OSError(err, os.strerror(err))
+            self._fd = fd
+            self._stop_pipe = os.pipe()
+            self._add_watches("")
+        except OSError as e:
+            self.logger.warning(f"⚠️ Cannot watch {self.sync_directory}: {e}")
+            self._close_descriptors()
+            return False
+
+        self._thread = threading.Thread(target=self._run, daemon=True, name="LocalChangeWatcher")
+        self._thread.start()
+        self.logger.info(
+            f"👀 Watching {len(self._wd_paths)} directories under {self.sync_directory} "
+            "for local changes"
+        )
+        return True
+
+    def stop(self) -> None:
+        """Stop the watcher thread and release its resources."""
+        if self._stop_pipe is not None:
+            with contextlib.suppress(OSError):
+                os.write(self._stop_pipe[1], b"x")
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self._close_descriptors()
+        if self._tracker is not None:
+            self._tracker.close()
+            self._tracker = None
+
+    def consume_resync_needed(self) -> bool:
+        """Check and reset whether the next cycle has to scan for deletions itself.
+
+        Returns:
+            True if events may have been missed since the last call or the watcher
+            is not running
+        """
+        needed = self._resync_needed.is_set() or not self.is_running
+        self._resync_needed.clear()
+        return needed
+
+    def _close_descriptors(self) -> None:
+        """Close the inotify and stop pipe descriptors."""
+        fds = [self._fd] if self._fd is not None else []
+        if self._stop_pipe is not None:
+            fds.extend(self._stop_pipe)
+        for fd in fds:
+            with contextlib.suppress(OSError):
+                os.close(fd)
+        self._fd = None
+        self._stop_pipe = None
+        self._wd_paths.clear()
+        self._path_wds.clear()
+
+    def _add_watches(self, relative_dir: str) -> list[str]:
+        """Watch a directory and all directories below it.
+
+        Args:
+            relative_dir: Directory relative to the sync directory ("" is the root)
+
+        Returns:
+            Files found below the directory while adding the watches
+
+        Raises:
+            OSError: If the root directory cannot be watched
+        """
+        found_files = []
+        pending = [relative_dir]
+        while pending:
+            current = pending.pop()
+            directory = self.sync_directory / current if current else self.sync_directory
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if current == relative_dir == "":
+                    raise OSError(err, os.strerror(err), str(directory))
+                if err == errno.ENOSPC:
+                    self.logger.warning(
+                        "⚠️ inotify watch limit reached, raise fs.inotify.max_user_watches; "
+                        "falling back to periodic scans for unwatched folders"
+                    )
+                # A directory we cannot watch means changes we cannot see
+                self._resync_needed.set()
+                continue
+
+            self._wd_paths[wd] = current
+            self._path_wds[current] = wd
+
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith("."):
+                            continue
+                        path = f"{current}/{entry.name}" if current else entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(path)
+                        else:
+                            found_files.append(path)
+            except OSError as e:
+                self.logger.debug(f"Cannot list {directory}: {e}")
+
+        return found_files
+
+    def _remove_watches(self, relative_dir: str) -> None:
+        """Stop watching a directory that left the tree, and everything below it.
+
+        Args:
+            relative_dir: Directory relative to the sync directory
+        """
+        prefix = f"{relative_dir}/"
+        for path in [p for p in self._path_wds if p == relative_dir or p.startswith(prefix)]:
+            wd = self._path_wds.pop(path)
+            self._wd_paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def _read_events(self) -> list[tuple[int, int, str]]:
+        """Read all queued inotify events.
+
+        Returns:
+            List of (watch descriptor, mask, name) tuples
+        """
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, READ_BUFFER_SIZE)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                events.append((wd, mask, name))
+        return events
+
+    def _run(self) -> None:
+        """Watcher thread: read events and record them in the deletion tracker."""
+        held: list[tuple[int, int, str]] = []
+        paused = False
+
+        while True:
+            try:
+                ready, _, _ = select.select(
+                    [self._fd, self._stop_pipe[0]], [], [], POLL_INTERVAL_SECONDS
+                )
+                if self._stop_pipe[0] in ready:
+                    break
+                if self._fd in ready:
+                    held.extend(self._read_events())
+
+                if self._hold is not None and self._hold.is_set():
+                    paused = True
+                    continue
+                if paused and self._tracker is not None:
+                    # Maintenance may have replaced the database file, reconnect
+                    self._tracker.close()
+                paused = False
+
+                for wd, mask, name in held:
+                    self._handle_event(wd, mask, name)
+                held.clear()
+
+            except Exception as e:
+                self.logger.error(f"❌ Local change watcher error: {e}")
+                held.clear()
+                self._resync_needed.set()
+
+    def _handle_event(self, wd: int, mask: int, name: str) -> None:
+        """Apply one inotify event.
+
+        Args:
+            wd: Watch descriptor the event belongs to
+            mask: Event mask
+            name: Name of the affected entry inside the watched directory
+        """
+        if mask & IN_Q_OVERFLOW:
+            self.logger.warning("⚠️ Local change events were dropped, next sync checks fully")
+            self._resync_needed.set()
+            return
+
+        relative_dir = self._wd_paths.get(wd)
+        if relative_dir is None:
+            return
+        if mask & IN_IGNORED:
+            self._wd_paths.pop(wd, None)
+            if self._path_wds.get(relative_dir) == wd:
+                del self._path_wds[relative_dir]
+            return
+        if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            # Subdirectories are handled through the event of their parent
+            if relative_dir == "":
+                self.logger.warning("⚠️ Sync directory was moved or deleted")
+                self._resync_needed.set()
+            return
+
+        # Skip hidden entries (e.g. the database folder) and in-progress downloads
+        if not name or name.startswith(".") or name.endswith(PARTIAL_DOWNLOAD_SUFFIX):
+            return
+
+        relative_path = f"{relative_dir}/{name}" if relative_dir else name
+        is_directory = bool(mask & IN_ISDIR)
+
+        recorded: list[int | None] = []
+        if mask & (IN_DELETE | IN_MOVED_FROM):
+            if is_directory:
+                self._remove_watches(relative_path)
+            recorded.append(self._get_tracker().record_local_deletion(relative_path, is_directory))
+        elif is_directory and mask & (IN_CREATE | IN_MOVED_TO):
+            # Files may have been written before the new watch was in place
+            for file_path in self._add_watches(relative_path):
+                recorded.append(self._get_tracker().record_local_restore(file_path))
+        elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+            recorded.append(self._get_tracker().record_local_restore(relative_path))
+
+        if None in recorded:
+            # The change is lost, e.g. the database was locked; scan on the next sync
+            self._resync_needed.set()
+
+    def _get_tracker(self) -> DeletionTracker:
+        """Get the watcher's own deletion tracker, opening it on first use."""
+        if self._tracker is None:
+            self._tracker = DeletionTracker(str(self.database_path))
+        return self._tracker
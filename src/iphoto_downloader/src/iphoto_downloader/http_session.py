@@ -0,0 +1,66 @@
+"""Connection pooling for the HTTP session shared by listings and downloads."""
+
+import functools
+import threading
+import typing as t
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Hosts with a connection pool kept open (API hosts plus the asset CDN hosts)
+POOLED_HOSTS = 16
+
+
+def configure_connection_pool(session: requests.Session, pool_size: int) -> None:
+    """Mount adapters keeping up to ``pool_size`` idle connections per host.
+
+    The default adapters keep 10 connections per host and close any further
+    connection once its response is read, so with more concurrent downloads every
+    transfer above the tenth pays a new TCP and TLS handshake.
+
+    Args:
+        session: Session used for all requests, e.g. the pyicloud session
+        pool_size: Connections kept per host, at least the number of concurrent requests
+    """
+    for prefix in ("https://", "http://"):
+        session.mount(
+            prefix,
+            HTTPAdapter(pool_connections=POOLED_HOSTS, pool_maxsize=max(1, pool_size)),
+        )
+
+
+def serialize_session_saving(session: requests.Session) -> None:
+    """Let only one thread at a time update and save the session's persisted state.
+
+    pyicloud updates its session data and rewrites the session JSON and cookie jar
+    files after every response, without locking. Concurrent downloads, album listings
+    and listing prefetches would interleave these writes and could corrupt the saved
+    session, forcing a new login or 2FA.
+
+    Args:
+        session: pyicloud session; sessions without these methods are left alone
+    """
+    lock = threading.RLock()
+    for name in ("_update_session_data", "_save_session_data"):
+        method = getattr(session, name, None)
+        if method is None:
+            continue
+
+        @functools.wraps(method)
+        def locked(*args: t.Any, _method: t.Callable = method, **kwargs: t.Any) -> t.Any:
+            with lock:
+                return _method(*args, **kwargs)
+
+        setattr(session, name, locked)
+
+
+def request_timeout(config: t.Any) -> tuple[float, float]:
+    """Get the (connect, read) timeout for requests from the configuration.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        Timeout tuple as accepted by requests
+    """
+    return (config.http_connect_timeout_seconds, config.http_read_timeout_seconds)
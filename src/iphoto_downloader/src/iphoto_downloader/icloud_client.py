@@ -1,17 +1,134 @@
 """iCloud authentication and API interaction."""
 
+import collections
+import contextlib
+import hashlib
+import os
 import time
 import typing as t
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
+import requests
+import urllib3.exceptions
 from pyicloud import PyiCloudService
 from pyicloud.exceptions import PyiCloudAPIResponseException, PyiCloudFailedLoginException
-from pyicloud.services.photos import AlbumContainer, BasePhotoAlbum
+from pyicloud.services.photos import AlbumContainer, BasePhotoAlbum, DirectionEnum
 
 from auth2fa import Auth2FAConfig, PushoverConfig, handle_2fa_authentication
 
+from .adaptive_concurrency import AdaptiveConcurrency
+from .bandwidth import BandwidthLimiter
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 from .config import BaseConfig
+from .http_session import (
+    configure_connection_pool,
+    request_timeout,
+    serialize_session_saving,
+)
 from .logger import get_logger
+from .photo_record import PhotoRecord
+from .prefetch import PrefetchIterator
+from .seen_photo_ids import SeenPhotoIds
+
+# Bytes copied from the HTTP response to disk per read, bounds memory per download
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Hash computed over every download while it streams to disk, stored as its checksum
+CHECKSUM_ALGORITHM = "sha256"
+
+# Suffix of the temporary file a download is written to before it is renamed
+PARTIAL_DOWNLOAD_SUFFIX = ".part"
+
+# Suffix of the hidden file next to a partial download holding the ETag or
+# Last-Modified of the version it was started for
+PARTIAL_VALIDATOR_SUFFIX = ".validator"
+
+# Album catalogue is fetched again after this many seconds
+ALBUM_CACHE_TTL_SECONDS = 15 * 60
+
+# Assets per album listing request of pyicloud (twice the album page size)
+LISTING_PAGE_SIZE = 200
+
+HTTP_PARTIAL_CONTENT = 206
+HTTP_RANGE_NOT_SATISFIABLE = 416
+
+# Responses by which iCloud signals that it is overloaded or rate limiting
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+
+# Client errors by which iCloud signals an expired or rejected session
+AUTH_FAILURE_STATUS_CODES = frozenset({401, 403, 421, 450})
+
+# Network errors counting against the circuit breaker like failed responses. Errors
+# while streaming a response body come straight from urllib3.
+NETWORK_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    urllib3.exceptions.ProtocolError,
+    urllib3.exceptions.ReadTimeoutError,
+)
+
+# Lowest HTTP status code of a server error
+SERVER_ERROR_STATUS_CODE = 500
+
+# Longest time downloads wait for an open circuit; longer outages end the sync
+CIRCUIT_MAX_PAUSE_SECONDS = 300
+
+# Seconds between checks while another download probes an open circuit
+CIRCUIT_PROBE_POLL_SECONDS = 1.0
+
+
+def is_service_failure(error: Exception) -> bool:
+    """Check whether an error means iCloud itself is failing, not this one request.
+
+    Args:
+        error: Exception raised by a request
+
+    Returns:
+        True for server errors, throttling, rejected sessions and network errors
+    """
+    if isinstance(error, NETWORK_ERRORS):
+        return True
+    if isinstance(error, PyiCloudAPIResponseException):
+        if isinstance(error.code, int):
+            return (
+                error.code >= SERVER_ERROR_STATUS_CODE
+                or error.code in THROTTLE_STATUS_CODES
+                or error.code in AUTH_FAILURE_STATUS_CODES
+            )
+        # pyicloud wraps every network error into an exception without status code
+        return error.code is None
+    # Errors raised while handling a network error, e.g. by a wrapping library
+    cause = error.__cause__
+    return isinstance(cause, Exception) and is_service_failure(cause)
+
+
+class DownloadSkippedError(Exception):
+    """Raised when a photo is deliberately not downloaded, e.g. over MAX_FILE_SIZE_MB."""
+
+
+class _OpenedAlbum(t.NamedTuple):
+    """Album whose count and listing start are known, ready to be listed."""
+
+    album_info: dict[str, t.Any]
+    state: dict[str, t.Any] | None
+    total_count: int
+    # First position to list, None if the album is unchanged
+    start: int | None
+    photos: t.Iterator[t.Any] | None
+    listed_at: float
+    open_seconds: float
+
+
+def _close_opened_album(future: Future) -> None:
+    """Stop prefetching for an album that was opened but will not be listed."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    photos = future.result().photos
+    close = getattr(photos, "close", None)
+    if close is not None:
+        close()
 
 
 class ICloudClient:
@@ -26,6 +143,30 @@ class ICloudClient:
         self.config = config
         self._api: PyiCloudService | None = None
 
+        # Album catalogue per kind (shared or not): fetch time, albums, albums by name
+        self._album_cache: dict[
+            bool, tuple[float, list[BasePhotoAlbum], dict[str, BasePhotoAlbum]]
+        ] = {}
+
+        # Listing state per (album name, is shared) of albums listed to the end
+        self.completed_listings: dict[tuple[str, bool], dict[str, t.Any]] = {}
+
+        # Number of downloads transferring at once, adapted to the observed throughput
+        self.download_concurrency = AdaptiveConcurrency(
+            initial=config.download_workers, maximum=config.max_download_workers
+        )
+
+        # Combined rate of all downloads, changed by the continuous runner's schedule
+        self.bandwidth_limiter = BandwidthLimiter(config.max_bandwidth_mbps)
+
+        # Stops downloads while most requests fail, probing iCloud until it recovers
+        self.circuit_breaker = CircuitBreaker(
+            failure_rate=config.circuit_breaker_failure_rate,
+            window=config.circuit_breaker_window,
+            open_seconds=config.circuit_breaker_open_seconds,
+            max_open_seconds=config.circuit_breaker_max_open_minutes * 60,
+        )
+
         # Set up session storage directory
         self.session_dir = Path.home() / "iphoto_downloader" / "sessions"
         self.session_dir.mkdir(parents=True, exist_ok=True)
@@ -52,11 +193,19 @@ class ICloudClient:
             self.logger.info(f"Authenticating with iCloud as {self.config.icloud_username}")
 
             # Create PyiCloudService with session storage
+            self.invalidate_album_cache()
             self._api = PyiCloudService(
                 self.config.icloud_username,
                 self.config.icloud_password,
                 cookie_directory=str(self.session_dir),
             )
+            # Keep a connection per concurrent download and album listing alive
+            configure_connection_pool(
+                self._api.session,
+                self.config.max_download_workers + self.config.album_listing_workers,
+            )
+            # Every response rewrites the session files, from all of these threads
+            serialize_session_saving(self._api.session)
 
             # Check if we have a trusted session
             if hasattr(self._api, "is_trusted_session") and self._api.is_trusted_session:
@@ -239,11 +388,11 @@ class ICloudClient:
         else:
             self.logger.debug("No expired session files found to clean up")
 
-    def list_photos(self) -> t.Iterator[dict[str, t.Any]]:
+    def list_photos(self) -> t.Iterator[PhotoRecord]:
         """List all photos from iCloud.
 
         Yields:
-            Photo metadata dictionaries
+            Photo records
         """
         if not self._api or not self._api.photos:
             self.logger.error("❌ Not authenticated or photos service unavailable")
@@ -263,18 +412,8 @@ class ICloudClient:
                     self.logger.info(f"📥 Processing photo {i}/{total_count}")
 
                 try:
-                    # Extract photo metadata
-                    photo_info = {
-                        "id": photo.id,
-                        "filename": photo.filename,
-                        "size": getattr(photo, "size", 0),
-                        "created": getattr(photo, "created", None),
-                        "modified": getattr(photo, "modified", None),
-                        "album_name": "All Photos",  # Default album for main library
-                        "photo_obj": photo,  # Keep reference for downloading
-                    }
-
-                    yield photo_info
+                    # Default album for main library
+                    yield PhotoRecord.from_asset(photo, "All Photos")
 
                 except Exception as e:
                     self.logger.warning(f"⚠️ Error processing photo {i}: {e}")
@@ -295,19 +434,14 @@ class ICloudClient:
 
         self.logger.info("📥 Fetching album list from iCloud...")
 
-        # Get all albums from iCloud
-        albums = self._api.photos.albums
-
         # Get personal albums (excluding the Library album which contains shared streams)
-        all_albums = list(albums.values()) if hasattr(albums, "values") else []
+        all_albums, _ = self._get_album_catalog(shared=False)
         albums_list = [album for album in all_albums if getattr(album, "name", "") != "Library"]
 
         self.logger.info(f"📊 Found {len(albums_list)} personal albums in iCloud")
 
         # shared albums
-        album_library = self._api.photos.albums["Library"]
-        albums_shared: AlbumContainer = album_library.service.shared_streams
-        albums_shared_list = list(albums_shared.values())
+        albums_shared_list, _ = self._get_album_catalog(shared=True)
         self.logger.info(f"📊 Found {len(albums_shared_list)} shared albums in iCloud")
 
         for album in albums_list + albums_shared_list:
@@ -328,44 +462,77 @@ class ICloudClient:
 
             yield album_info
 
+    def _get_album_catalog(
+        self, shared: bool
+    ) -> tuple[list[BasePhotoAlbum], dict[str, BasePhotoAlbum]]:
+        """Get personal or shared albums, fetched at most once per cache TTL.
+
+        Args:
+            shared: Whether to get shared albums instead of personal ones
+
+        Returns:
+            Tuple of (albums in iCloud order, albums by name; the first album wins if
+            names repeat)
+        """
+        cached = self._album_cache.get(shared)
+        if cached is not None and time.monotonic() - cached[0] < ALBUM_CACHE_TTL_SECONDS:
+            return cached[1], cached[2]
+        if cached is not None:
+            # pyicloud keeps its album containers forever, drop them to see new albums
+            self._reset_pyicloud_album_containers()
+
+        if shared:
+            album_library = self._api.photos.albums["Library"]
+            albums_shared: AlbumContainer = album_library.service.shared_streams
+            albums = list(albums_shared.values())
+        else:
+            container = self._api.photos.albums
+            albums = list(container.values()) if hasattr(container, "values") else []
+
+        by_name: dict[str, BasePhotoAlbum] = {}
+        for album in albums:
+            by_name.setdefault(album.name, album)
+
+        self._album_cache[shared] = (time.monotonic(), albums, by_name)
+        return albums, by_name
+
+    def invalidate_album_cache(self) -> None:
+        """Forget the album catalogue so the next lookup fetches it again."""
+        if self._album_cache:
+            self._reset_pyicloud_album_containers()
+        self._album_cache.clear()
+
+    def _reset_pyicloud_album_containers(self) -> None:
+        """Clear the album containers pyicloud caches on its photo libraries."""
+        photos = getattr(self._api, "_photos", None) if self._api else None
+        for library_name in ("_root_library", "_shared_library"):
+            library = getattr(photos, library_name, None)
+            if library is not None and hasattr(library, "_albums"):
+                library._albums = None
+
     def list_photos_from_album(
         self,
         album_name: str,
         is_shared: bool | None = None,
-    ) -> t.Iterator[dict[str, t.Any]]:
+    ) -> t.Iterator[PhotoRecord]:
         """List photos from a specific album.
 
         Args:
             album_name: Name of the album to list photos from
 
         Yields:
-            Photo metadata dictionaries
+            Photo records
         """
         if not self._api or not self._api.photos:
             self.logger.error("❌ Not authenticated or photos service unavailable")
             return
 
-        all_albums = []
-
-        if is_shared is None or is_shared is False:
-            # Get all albums from iCloud
-            albums = self._api.photos.albums
-            albums_list = list(albums.values())
-            all_albums.extend(albums_list)
-
-        if is_shared is None or is_shared is True:
-            # Get all shared albums from iCloud
-            album_library = self._api.photos.albums["Library"]
-            albums_shared: AlbumContainer = album_library.service.shared_streams
-            albums_shared_list = list(albums_shared.values())
-            all_albums.extend(albums_shared_list)
-
         # Find the album by name
         target_album: BasePhotoAlbum | None = None
-        for album in all_albums:
-            if album.name == album_name:
-                target_album = album
-                break
+        if is_shared is None or is_shared is False:
+            target_album = self._get_album_catalog(shared=False)[1].get(album_name)
+        if target_album is None and (is_shared is None or is_shared is True):
+            target_album = self._get_album_catalog(shared=True)[1].get(album_name)
 
         if not target_album:
             self.logger.error(f"❌ Album '{album_name}' not found")
@@ -373,36 +540,78 @@ class ICloudClient:
 
         self.logger.info(f"📥 Fetching photos from album '{album_name}'...")
 
-        photos = target_album  # type: ignore
         total_count = len(target_album)
 
         self.logger.info(f"📊 Found {total_count} photos in album '{album_name}'")
 
-        for i, photo in enumerate(photos, 1):
-            if i % 50 == 0:  # Log progress every 50 photos for albums
-                self.logger.info(f"📥 Processing photo {i}/{total_count} from album '{album_name}'")
+        photos = self._prefetch_album_pages(target_album, album_name)
+        yield from self._iter_album_photos(photos, album_name, total_count)
 
-            try:
-                # Extract photo metadata
-                photo_info = {
-                    "id": photo.id,
-                    "filename": photo.filename,
-                    "size": getattr(photo, "size", 0),
-                    "created": getattr(photo, "created", None),
-                    "modified": getattr(photo, "modified", None),
-                    "album_name": album_name,
-                    "photo_obj": photo,  # Keep reference for downloading
-                }
-
-                yield photo_info
-
-            except Exception as e:
-                self.logger.warning(f"⚠️ Error processing photo {i} from album '{album_name}': {e}")
-                continue
+    def _iter_album_photos(
+        self,
+        photos: t.Iterable[t.Any],
+        album_name: str,
+        total_count: int,
+        start: int = 0,
+    ) -> t.Iterator[PhotoRecord]:
+        """Turn album assets into photo records.
+
+        Args:
+            photos: Album assets, beginning at position ``start`` of the album
+            album_name: Name of the album the assets belong to
+            total_count: Number of assets in the album, for progress logging
+            start: Album position of the first asset
+
+        Yields:
+            Photo records
+        """
+        try:
+            for i, photo in enumerate(photos, start + 1):
+                if i % 50 == 0:  # Log progress every 50 photos for albums
+                    self.logger.info(
+                        f"📥 Processing photo {i}/{total_count} from album '{album_name}'"
+                    )
+
+                try:
+                    yield PhotoRecord.from_asset(photo, album_name, position=i - 1)
+
+                except Exception as e:
+                    self.logger.warning(
+                        f"⚠️ Error processing photo {i} from album '{album_name}': {e}"
+                    )
+                    continue
+        finally:
+            # Stops the prefetch thread when the consumer ends early, e.g. at MAX_DOWNLOADS
+            close = getattr(photos, "close", None)
+            if close is not None:
+                close()
+
+    def _prefetch_album_pages(
+        self, photos: t.Iterable[t.Any], album_name: str
+    ) -> t.Iterator[t.Any]:
+        """Fetch the next album listing pages in the background.
+
+        pyicloud requests a page only when iteration reaches it, which would stall
+        database checks and downloads on every page. A producer thread keeps up to
+        LISTING_PREFETCH_PAGES pages buffered instead.
+
+        Args:
+            photos: Album assets
+            album_name: Name of the album, used for the thread name
+
+        Returns:
+            Iterator over the same assets
+        """
+        pages = self.config.listing_prefetch_pages
+        if pages <= 0:
+            return iter(photos)
+        return PrefetchIterator(
+            photos, pages * LISTING_PAGE_SIZE, name=f"AlbumPrefetch-{album_name}"
+        )
 
     def list_photos_from_albums(
         self, album_names: list[str], include_main_library: bool = True
-    ) -> t.Iterator[dict[str, t.Any]]:
+    ) -> t.Iterator[PhotoRecord]:
         """List photos from multiple specified albums.
 
         Args:
@@ -410,35 +619,42 @@ class ICloudClient:
             include_main_library: Whether to include photos from main library
 
         Yields:
-            Photo metadata dictionaries
+            Photo records
         """
         if not self._api or not self._api.photos:
             self.logger.error("❌ Not authenticated or photos service unavailable")
             return
 
-        processed_photo_ids = set()  # Track to avoid duplicates
-
-        # Include main library photos if requested
-        if include_main_library:
-            self.logger.info("📥 Including photos from main library")
-            for photo_info in self.list_photos():
-                if photo_info["id"] not in processed_photo_ids:
-                    processed_photo_ids.add(photo_info["id"])
-                    yield photo_info
-
-        # Include photos from specified albums
-        if album_names:
-            for album_name in album_names:
-                self.logger.info(f"📥 Including photos from album '{album_name}'")
-                for photo_info in self.list_photos_from_album(album_name):
-                    if photo_info["id"] not in processed_photo_ids:
-                        processed_photo_ids.add(photo_info["id"])
+        processed_photo_ids = self._new_seen_photo_ids()  # Track to avoid duplicates
+        # Duplicates are linked into every album folder by the syncer when enabled
+        link_duplicates = self.config.link_album_duplicates
+
+        try:
+            # Include main library photos if requested
+            if include_main_library:
+                self.logger.info("📥 Including photos from main library")
+                for photo_info in self.list_photos():
+                    if processed_photo_ids.add(photo_info.id):
                         yield photo_info
-                    else:
-                        self.logger.debug(
-                            f"⏭️ Skipping duplicate photo: {photo_info['filename']} "
-                            f"(already processed from another album)"
-                        )
+
+            # Include photos from specified albums
+            if album_names:
+                for album_name in album_names:
+                    self.logger.info(f"📥 Including photos from album '{album_name}'")
+                    for photo_info in self.list_photos_from_album(album_name):
+                        if processed_photo_ids.add(photo_info.id) or link_duplicates:
+                            yield photo_info
+                        else:
+                            self.logger.debug(
+                                f"⏭️ Skipping duplicate photo: {photo_info.filename} "
+                                f"(already processed from another album)"
+                            )
+        finally:
+            processed_photo_ids.close()
+
+    def _new_seen_photo_ids(self) -> SeenPhotoIds:
+        """Create the duplicate filter of one listing, bounded by DEDUP_MEMORY_BUDGET_MB."""
+        return SeenPhotoIds(self.config.dedup_memory_budget_mb * 1024 * 1024)
 
     def verify_albums_exist(self, album_names: list[str]) -> tuple[list[str], list[str], list[str]]:
         """Verify that specified albums exist in iCloud.
@@ -453,17 +669,10 @@ class ICloudClient:
             self.logger.error("❌ Not authenticated or photos service unavailable")
             return [], [], album_names
 
-        # Get all albums from iCloud
-        albums = self._api.photos.albums
-        albums_list = list(albums.values())
-
-        # shared albums
-        album_library = self._api.photos.albums["Library"]
-        albums_shared: AlbumContainer = album_library.service.shared_streams
-        albums_shared_list = list(albums_shared.values())
-
         # Get all available album names
-        available_albums = {album.name for album in albums_list + albums_shared_list}
+        available_albums = set(self._get_album_catalog(shared=False)[1]) | set(
+            self._get_album_catalog(shared=True)[1]
+        )
 
         existing_albums = []
         missing_albums = []
@@ -518,82 +727,611 @@ class ICloudClient:
 
             yield album_info
 
-    def list_photos_from_filtered_albums(self, config: BaseConfig) -> t.Iterator[dict[str, t.Any]]:
+    def list_photos_from_filtered_albums(
+        self,
+        config: BaseConfig,
+        listing_states: dict[tuple[str, bool], dict[str, t.Any]] | None = None,
+    ) -> t.Iterator[PhotoRecord]:
         """List photos from albums based on configuration filtering.
 
+        With listing states from a previous sync, albums are listed incrementally: an
+        album whose size and last photo did not change is skipped, and an album that
+        only grew is paged from its previous end. Anything else, or a due full
+        listing, enumerates the whole album. The state of every album listed to the
+        end is collected in ``completed_listings``; the caller persists it once the
+        listed photos were handled.
+
+        Up to ALBUM_LISTING_WORKERS albums are opened ahead on a thread pool, so their
+        round-trips overlap. Photos are still yielded album by album in catalogue
+        order, so the first album containing a photo keeps it.
+
         Args:
             config: Configuration object with album filtering settings
-            include_main_library: Whether to include photos from main library
+            listing_states: Listing state per (album name, is shared) from the previous
+                sync, or None to always list every album completely
 
         Yields:
-            Photo metadata dictionaries from filtered albums
+            Photo records from filtered albums
         """
-        processed_photo_ids = set()  # Track to avoid duplicates
+        processed_photo_ids = self._new_seen_photo_ids()  # Track to avoid duplicates
+        # Duplicates are linked into every album folder by the syncer when enabled
+        link_duplicates = self.config.link_album_duplicates
+        self.completed_listings = {}
+        workers = max(1, self.config.album_listing_workers)
+        albums = self.get_filtered_albums(config)
+        opening: collections.deque[tuple[dict[str, t.Any], Future[_OpenedAlbum]]] = (
+            collections.deque()
+        )
+        album_photos: t.Generator[PhotoRecord, None, None] | None = None
+        listed_albums = 0
+        total_wait_seconds = 0.0
+        started = time.monotonic()
+
+        def open_next_album() -> None:
+            album_info = next(albums, None)
+            if album_info is None:
+                return
+            state = None
+            if listing_states is not None:
+                state = listing_states.get((album_info["name"], album_info.get("is_shared", False)))
+            future = pool.submit(
+                self._open_album_listing, album_info, state, config, listing_states is not None
+            )
+            opening.append((album_info, future))
 
-        # Include photos from filtered albums
-        for album_info in self.get_filtered_albums(config):
-            album_name = album_info["name"]
-            is_shared = album_info.get("is_shared", False)
-            album_type = "shared" if is_shared else "personal"
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="AlbumListing")
+        try:
+            for _ in range(workers):
+                open_next_album()
+
+            while opening:
+                album_info, future = opening.popleft()
+                album_name = album_info["name"]
+                album_type = "shared" if album_info.get("is_shared", False) else "personal"
+                self.logger.info(f"📥 Including photos from {album_type} album '{album_name}'")
+
+                # Time the consumer is blocked on listing, i.e. not hidden by the pool
+                wait_started = time.monotonic()
+                opened = future.result()
+                wait_seconds = time.monotonic() - wait_started
+                open_next_album()
+                photo_count = duplicate_count = 0
+
+                album_photos = self._iter_opened_album(opened, listing_states is not None)
+                while True:
+                    wait_started = time.monotonic()
+                    photo_info = next(album_photos, None)
+                    wait_seconds += time.monotonic() - wait_started
+                    if photo_info is None:
+                        break
+
+                    photo_count += 1
+                    if processed_photo_ids.add(photo_info.id):
+                        yield photo_info
+                        continue
 
-            self.logger.info(f"📥 Including photos from {album_type} album '{album_name}'")
+                    duplicate_count += 1
+                    if link_duplicates:
+                        yield photo_info
+                    else:
+                        self.logger.debug(
+                            f"⏭️ Skipping duplicate photo: {photo_info.filename} "
+                            f"(already processed from another source)"
+                        )
 
-            for photo_info in self.list_photos_from_album(album_name, is_shared=is_shared):
-                if photo_info["id"] not in processed_photo_ids:
-                    processed_photo_ids.add(photo_info["id"])
-                    yield photo_info
-                else:
-                    self.logger.debug(
-                        f"⏭️ Skipping duplicate photo: {photo_info['filename']} "
-                        f"(already processed from another source)"
-                    )
+                listed_albums += 1
+                total_wait_seconds += wait_seconds
+                self.logger.info(
+                    f"⏱️ Album '{album_name}': {photo_count} photos, "
+                    f"{duplicate_count} duplicates, opened in {opened.open_seconds:.2f}s, "
+                    f"waited {wait_seconds:.2f}s for listing"
+                )
+
+            if listed_albums:
+                self.logger.info(
+                    f"⏱️ Enumerated {listed_albums} albums in "
+                    f"{time.monotonic() - started:.1f}s, {total_wait_seconds:.1f}s of it "
+                    f"waiting for listings"
+                )
+        finally:
+            # Albums opened ahead of an early stop must not keep prefetching
+            if album_photos is not None:
+                album_photos.close()
+            processed_photo_ids.close()
+            for _, future in opening:
+                future.cancel()
+                future.add_done_callback(_close_opened_album)
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _open_album_listing(
+        self,
+        album_info: dict[str, t.Any],
+        state: dict[str, t.Any] | None,
+        config: BaseConfig,
+        incremental: bool,
+    ) -> _OpenedAlbum:
+        """Do the round-trips needed before an album's photos can be listed.
 
-    def download_photo(self, photo_info: dict[str, t.Any], local_path: str) -> bool:
+        Runs on the album listing pool: counts the album, decides where listing starts
+        and starts prefetching its first pages.
+
+        Args:
+            album_info: Album metadata from get_filtered_albums()
+            state: Listing state of the previous sync, or None
+            config: Configuration with the full listing interval
+            incremental: Whether the album may be listed incrementally
+
+        Returns:
+            The opened album
+        """
+        started = time.monotonic()
+        album = album_info["album_obj"]
+        now = time.time()
+
+        total_count = len(album)
+        start = 0
+        if incremental:
+            start = self._incremental_start(album, state, total_count, now, config)
+
+        photos = None
+        if start is not None:
+            assets = self._iter_album_from(album, start) if start else album
+            photos = self._prefetch_album_pages(assets, album_info["name"])
+
+        return _OpenedAlbum(
+            album_info, state, total_count, start, photos, now, time.monotonic() - started
+        )
+
+    def _iter_opened_album(
+        self, opened: _OpenedAlbum, incremental: bool
+    ) -> t.Iterator[PhotoRecord]:
+        """List the photos of an opened album.
+
+        For incremental listings, pyicloud exposes neither sync tokens nor date
+        filters, so the high-water mark is the album size plus the id of the photo at
+        its last position. Albums are ordered ascending; if the photo at the previous
+        last position is unchanged, everything after it is new.
+
+        Args:
+            opened: Album opened by _open_album_listing()
+            incremental: Whether to record the listing state once the album was listed
+                to the end
+
+        Yields:
+            Photo records
+        """
+        album_name = opened.album_info["name"]
+        key = (album_name, opened.album_info.get("is_shared", False))
+        state = opened.state
+        start = opened.start
+        total_count = opened.total_count
+
+        if start is None:
+            self.logger.info(f"⏭️ Album '{album_name}' unchanged since last sync")
+            self.completed_listings[key] = state
+            return
+
+        if start:
+            self.logger.info(
+                f"📥 Fetching {total_count - start} new photos from album '{album_name}'"
+            )
+        else:
+            self.logger.info(f"📊 Listing all {total_count} photos in album '{album_name}'")
+
+        position = start
+        last_photo_id = state["last_photo_id"] if start else None
+        for photo_info in self._iter_album_photos(opened.photos, album_name, total_count, start):
+            position += 1
+            last_photo_id = photo_info.id
+            yield photo_info
+
+        if incremental:
+            self.completed_listings[key] = {
+                "asset_count": position,
+                "last_photo_id": last_photo_id,
+                "full_listed_at": state["full_listed_at"] if start else opened.listed_at,
+            }
+
+    def _incremental_start(
+        self,
+        album: BasePhotoAlbum,
+        state: dict[str, t.Any] | None,
+        total_count: int,
+        now: float,
+        config: BaseConfig,
+    ) -> int | None:
+        """Decide where to start listing an album.
+
+        Returns:
+            0 for a full listing, the first new position for an incremental listing, or
+            None if the album is unchanged
+        """
+        if state is None or getattr(album, "direction", None) != DirectionEnum.ASCENDING:
+            return 0
+        if now - state["full_listed_at"] >= config.full_listing_interval_hours * 3600:
+            return 0
+
+        previous_count = state["asset_count"]
+        if previous_count == 0 or total_count < previous_count:
+            return 0
+
+        # Photos inserted or removed before the previous end shift its last photo
+        try:
+            tail = next(iter(album.photo(previous_count - 1)), None)
+        except Exception as e:
+            self.logger.debug(f"Could not check end of album '{album.name}': {e}")
+            return 0
+        if tail is None or tail.id != state["last_photo_id"]:
+            return 0
+
+        return None if total_count == previous_count else previous_count
+
+    @staticmethod
+    def _iter_album_from(album: BasePhotoAlbum, start: int) -> t.Iterator[t.Any]:
+        """Page through an ascending album beginning at position ``start``."""
+        offset = start
+        while True:
+            count = 0
+            for photo in album._get_photos_at(offset, album.direction, album.page_size * 2):
+                count += 1
+                yield photo
+            if count == 0:
+                break
+            offset += count
+
+    def fetch_album_photo(
+        self, album_name: str, position: int, photo_id: str
+    ) -> PhotoRecord | None:
+        """Fetch a single photo from the position it was listed at, without listing.
+
+        Personal albums are looked up before shared ones, like the album filters do.
+
+        Args:
+            album_name: Name of the album the photo was listed from
+            position: Index of the photo in the album listing
+            photo_id: Expected photo id
+
+        Returns:
+            Photo record, or None if the album is gone or the position now holds
+            another photo (the album changed since the photo was listed)
+        """
+        if not self._api:
+            return None
+
+        try:
+            for shared in (False, True):
+                album = self._get_album_catalog(shared)[1].get(album_name)
+                if album is None:
+                    continue
+                for photo in album.photo(position):
+                    if photo.id == photo_id:
+                        return PhotoRecord.from_asset(photo, album_name, position=position)
+                    break
+                return None
+        except Exception as e:
+            self.logger.debug(f"Could not fetch photo {position} of album '{album_name}': {e}")
+        return None
+
+    def download_photo(
+        self,
+        photo_info: PhotoRecord | dict[str, t.Any],
+        local_path: str,
+        progress_callback: t.Callable[[int], None] | None = None,
+    ) -> bool:
         """Download a photo to local storage.
 
+        The response is streamed in chunks of ``DOWNLOAD_CHUNK_SIZE`` bytes into a
+        ``.part`` file next to the target, which is fsync'd and atomically renamed on
+        success. An existing ``.part`` file from an interrupted run is resumed with an
+        HTTP Range request, made conditional with If-Range on the ETag or Last-Modified
+        stored when it was started, so a changed asset is downloaded in full instead of
+        being spliced onto the old part. Parts without a stored validator, or not
+        smaller than the photo's size, are started over; a resumed file whose final size
+        differs from the photo's size is discarded.
+
+        Transfers wait for a slot of ``download_concurrency``, whose limit adapts to the
+        throughput, response latency and throttling (HTTP 429/503) observed. The bytes
+        read count against ``bandwidth_limiter``, shared by all downloads.
+
+        Requests are sent through ``circuit_breaker``: while it is open, downloads wait
+        for it to let a probe through, for at most ``CIRCUIT_MAX_PAUSE_SECONDS``.
+
+        The SHA-256 checksum of the content is computed over the chunks as they are
+        written and stored in ``photo_info.checksum``, so the file is never read back.
+        Only the already present part of a resumed download is hashed from disk.
+
         Args:
-            photo_info: Photo metadata from list_photos()
+            photo_info: Photo record from list_photos(), or an equivalent dictionary
             local_path: Local file path to save the photo
+            progress_callback: Optional callable receiving the number of bytes of each
+                chunk written to disk
 
         Returns:
             True if download successful, False otherwise
+
+        Raises:
+            CircuitOpenError: If iCloud stays unavailable for longer than the pause limit
+            DownloadSkippedError: If the photo is larger than MAX_FILE_SIZE_MB
         """
+        requested = False
         try:
-            photo = photo_info["photo_obj"]
-            filename = photo_info["filename"]
+            photo_info = PhotoRecord.coerce(photo_info)
+            photo = photo_info.photo_obj
+            filename = photo_info.filename
 
             self.logger.debug(f"📥 Downloading {filename} to {local_path}")
 
             # Check file size limit if configured
             if self.config.max_file_size_mb > 0:
-                size_mb = photo_info.get("size", 0) / (1024 * 1024)
+                size_mb = (photo_info.size or 0) / (1024 * 1024)
                 if size_mb > self.config.max_file_size_mb:
-                    self.logger.info(
-                        f"⏭️ Skipping {filename} (size: {size_mb:.1f}MB > limit: "
-                        f"{self.config.max_file_size_mb}MB)"
+                    raise DownloadSkippedError(
+                        f"size {size_mb:.1f}MB over limit of {self.config.max_file_size_mb}MB"
                     )
-                    return False
 
             if self.config.dry_run:
                 self.logger.info(f"🔍 DRY RUN: Would download {filename} to {local_path}")
                 return True
 
-            # Download the photo
-            download = photo.download()
+            part_path = Path(f"{local_path}{PARTIAL_DOWNLOAD_SUFFIX}")
+            validator_path = self._validator_path(part_path)
+            resume_from, validator = self._resumable_part(
+                part_path, validator_path, photo_info.size, filename
+            )
+
+            self._await_circuit()
+            requested = True
+            with self.download_concurrency.slot():
+                # Download the photo
+                started_at = time.monotonic()
+                download, append = self._open_download(photo, filename, resume_from, validator)
+                if download is None:
+                    self._record_service_success()
+                    self.logger.error(f"❌ No downloadable version available for {filename}")
+                    return False
+                self.download_concurrency.record_latency(time.monotonic() - started_at)
 
-            # Write to file
-            with open(local_path, "wb") as f:
-                f.write(download.raw.read())
+                hasher = hashlib.new(CHECKSUM_ALGORITHM)
+                if append:
+                    self._hash_file(part_path, hasher)
+                else:
+                    # Lets an interrupted transfer of this version be resumed later
+                    self._save_validator(download, validator_path)
 
-            self.logger.debug(f"✅ Downloaded {filename}")
+                try:
+                    bytes_written = self._stream_to_file(
+                        download,
+                        part_path,
+                        append=append,
+                        progress_callback=progress_callback,
+                        hasher=hasher,
+                    )
+                finally:
+                    # Hand the connection back to the pool
+                    if hasattr(download, "close"):
+                        download.close()
+            self.download_concurrency.record_success(bytes_written)
+            self._record_service_success()
+
+            if append and photo_info.size and part_path.stat().st_size != photo_info.size:
+                # Pieces of two versions; the next attempt downloads the photo in full
+                size = part_path.stat().st_size
+                part_path.unlink()
+                validator_path.unlink(missing_ok=True)
+                raise ValueError(
+                    f"resumed file has {size} bytes instead of {photo_info.size}, discarded"
+                )
+
+            # Only a complete file ever appears under the final name
+            os.replace(part_path, local_path)
+            validator_path.unlink(missing_ok=True)
+            self._fsync_directory(part_path.parent)
+            photo_info.checksum = hasher.hexdigest()
+
+            self.logger.debug(f"✅ Downloaded {filename} ({bytes_written} bytes)")
             return True
 
+        except (CircuitOpenError, DownloadSkippedError):
+            raise
+        except PyiCloudAPIResponseException as e:
+            if e.code in THROTTLE_STATUS_CODES:
+                self.download_concurrency.record_throttled()
+            self._record_request_error(e, requested)
+            self.logger.error(
+                f"❌ Error downloading photo {photo_info.get('filename', 'unknown')}: {e}"
+            )
+            return False
         except Exception as e:
+            self._record_request_error(e, requested)
             self.logger.error(
                 f"❌ Error downloading photo {photo_info.get('filename', 'unknown')}: {e}"
             )
             return False
 
+    def _await_circuit(self) -> None:
+        """Wait until the circuit breaker lets a request through.
+
+        Raises:
+            CircuitOpenError: If the circuit stays open longer than CIRCUIT_MAX_PAUSE_SECONDS
+        """
+        while not self.circuit_breaker.allow_request():
+            retry_after = self.circuit_breaker.retry_after()
+            if retry_after > CIRCUIT_MAX_PAUSE_SECONDS:
+                raise CircuitOpenError(retry_after)
+            time.sleep(max(retry_after, CIRCUIT_PROBE_POLL_SECONDS))
+
+    def _record_service_success(self) -> None:
+        """Report a request iCloud answered to the circuit breaker."""
+        if self.circuit_breaker.record_success():
+            self.logger.info("✅ iCloud is responding again, resuming downloads")
+
+    def _record_request_error(self, error: Exception, requested: bool) -> None:
+        """Report the outcome of a failed download to the circuit breaker.
+
+        Args:
+            error: Exception the download failed with
+            requested: Whether the download got past the circuit breaker
+        """
+        if not requested:
+            return
+        if not is_service_failure(error):
+            # iCloud answered, the failure is specific to this photo or local
+            self._record_service_success()
+            return
+        open_seconds = self.circuit_breaker.record_failure()
+        if open_seconds is not None:
+            self.logger.warning(
+                f"🔌 iCloud requests keep failing, pausing downloads for {open_seconds:.0f}s"
+            )
+
+    @staticmethod
+    def _validator_path(part_path: Path) -> Path:
+        """Get the hidden file storing the validator of a partial download."""
+        return part_path.with_name(f".{part_path.name}{PARTIAL_VALIDATOR_SUFFIX}")
+
+    def _resumable_part(
+        self, part_path: Path, validator_path: Path, expected_size: int | None, filename: str
+    ) -> tuple[int, str | None]:
+        """Check whether a partial download can be resumed safely.
+
+        Args:
+            part_path: Partial download file
+            validator_path: File holding the validator of the partial download
+            expected_size: Size of the photo in bytes, if known
+            filename: Photo filename (for logging)
+
+        Returns:
+            Tuple of (bytes to resume from, validator for If-Range), (0, None) to start over
+        """
+        if not part_path.exists():
+            return 0, None
+        size = part_path.stat().st_size
+        validator = validator_path.read_text().strip() if validator_path.exists() else ""
+        if size and validator and not (expected_size and size >= expected_size):
+            return size, validator
+        if size:
+            self.logger.debug(f"Discarding partial download of {filename}, cannot resume it")
+        return 0, None
+
+    @staticmethod
+    def _save_validator(download: t.Any, validator_path: Path) -> None:
+        """Store the ETag or Last-Modified of a response next to its partial download."""
+        headers = getattr(download, "headers", None) or {}
+        etag = headers.get("ETag")
+        # Weak ETags must not be used with If-Range
+        validator = etag if isinstance(etag, str) and not etag.startswith("W/") else None
+        if validator is None:
+            last_modified = headers.get("Last-Modified")
+            validator = last_modified if isinstance(last_modified, str) else None
+        if validator:
+            validator_path.write_text(validator)
+        else:
+            validator_path.unlink(missing_ok=True)
+
+    def _open_download(
+        self, photo: t.Any, filename: str, resume_from: int, validator: str | None = None
+    ) -> tuple[t.Any | None, bool]:
+        """Start the download of a photo, resuming a partial download if possible.
+
+        Args:
+            photo: pyicloud photo asset
+            filename: Photo filename (for logging)
+            resume_from: Size of an existing partial download in bytes (0 if none)
+            validator: ETag or Last-Modified of the partial download's version; the
+                server sends the whole file if the asset changed since
+
+        Returns:
+            Tuple of (streamed response or None, whether to append to the partial file)
+        """
+        timeout = request_timeout(self.config)
+        if resume_from > 0 and validator:
+            try:
+                download = photo.download(
+                    headers={"Range": f"bytes={resume_from}-", "If-Range": validator},
+                    timeout=timeout,
+                )
+            except PyiCloudAPIResponseException as e:
+                if e.code != HTTP_RANGE_NOT_SATISFIABLE:
+                    raise
+                # Partial file does not match the asset anymore, start over
+                self.logger.debug(f"Discarding stale partial download of {filename}")
+            else:
+                if download is not None and download.status_code == HTTP_PARTIAL_CONTENT:
+                    self.logger.info(f"⏯️ Resuming {filename} at {resume_from} bytes")
+                    return download, True
+                # Server ignored the range and sent the whole file
+                return download, False
+
+        return photo.download(timeout=timeout), False
+
+    def _stream_to_file(
+        self,
+        download: t.Any,
+        local_path: str | Path,
+        append: bool = False,
+        progress_callback: t.Callable[[int], None] | None = None,
+        hasher: t.Any = None,
+    ) -> int:
+        """Copy a streamed download response to a file chunk by chunk.
+
+        The file is flushed and fsync'd before returning.
+
+        Args:
+            download: Streamed HTTP response returned by the photo's download()
+            local_path: Local file path to write to
+            append: Append to an existing file instead of truncating it
+            progress_callback: Optional callable receiving the size of each written chunk
+            hasher: Optional hashlib object updated with every written chunk
+
+        Returns:
+            Number of bytes written
+        """
+        bytes_written = 0
+        with open(local_path, "ab" if append else "wb") as f:
+            while True:
+                chunk = download.raw.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+                bytes_written += len(chunk)
+                if progress_callback:
+                    progress_callback(len(chunk))
+                # Not reading while over the limit lets TCP slow the sender down
+                self.bandwidth_limiter.consume(len(chunk))
+            f.flush()
+            os.fsync(f.fileno())
+        return bytes_written
+
+    @staticmethod
+    def _hash_file(path: Path, hasher: t.Any) -> None:
+        """Feed the content of an existing file into a hashlib object.
+
+        Args:
+            path: File to hash
+            hasher: hashlib object to update
+        """
+        with open(path, "rb") as f:
+            while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+                hasher.update(chunk)
+
+    @staticmethod
+    def _fsync_directory(directory: Path) -> None:
+        """Persist a rename by syncing its directory (best effort, POSIX only).
+
+        Args:
+            directory: Directory containing the renamed file
+        """
+        if os.name == "nt":
+            return
+        with contextlib.suppress(OSError):
+            fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
     @property
     def is_authenticated(self) -> bool:
         """Check if client is authenticated.
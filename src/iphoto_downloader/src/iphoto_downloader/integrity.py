@@ -0,0 +1,265 @@
+"""Verify downloaded files against the sizes and checksums recorded at download."""
+
+import contextlib
+import hashlib
+import os
+import threading
+import time
+import typing as t
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from .deletion_tracker import DeletionTracker
+from .icloud_client import CHECKSUM_ALGORITHM
+from .logger import get_logger
+
+# Bytes per read while hashing; large sequential reads keep disks streaming
+VERIFY_READ_SIZE = 8 * 1024 * 1024
+
+# Files queued per worker, so workers never wait for the database cursor
+VERIFY_QUEUE_DEPTH = 4
+
+# A progress line is logged after this many files
+VERIFY_PROGRESS_INTERVAL = 10_000
+
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"
+STATUS_TRUNCATED = "truncated"
+STATUS_SIZE_MISMATCH = "size_mismatch"
+STATUS_CHECKSUM_MISMATCH = "checksum_mismatch"
+STATUS_UNREADABLE = "unreadable"
+
+# Problems fixed by downloading the photo again; missing files are local deletions
+REPAIRABLE_STATUSES = frozenset(
+    {STATUS_TRUNCATED, STATUS_SIZE_MISMATCH, STATUS_CHECKSUM_MISMATCH, STATUS_UNREADABLE}
+)
+
+
+def default_verify_workers() -> int:
+    """Get the default number of verification threads: one per CPU core."""
+    return os.cpu_count() or 4
+
+
+class FileCheck(t.NamedTuple):
+    """Outcome of verifying one downloaded file."""
+
+    local_path: str
+    status: str
+    bytes_read: int
+    checksum_verified: bool
+    detail: str = ""
+
+
+class VerificationReport(t.NamedTuple):
+    """Summary of a verification run. Only files with problems are listed."""
+
+    files_checked: int
+    bytes_read: int
+    size_only: int
+    problems: list[FileCheck]
+    seconds: float
+
+
+_read_buffers = threading.local()
+
+
+def _read_buffer(read_size: int) -> bytearray:
+    """Get the calling thread's reusable read buffer."""
+    buffer = getattr(_read_buffers, "buffer", None)
+    if buffer is None or len(buffer) != read_size:
+        buffer = bytearray(read_size)
+        _read_buffers.buffer = buffer
+    return buffer
+
+
+def check_file(  # noqa
+    path: Path,
+    local_path: str,
+    expected_size: int | None,
+    expected_checksum: str | None,
+    read_size: int = VERIFY_READ_SIZE,
+) -> FileCheck:
+    """Verify one downloaded file.
+
+    The size is compared first, so truncated files are found without reading them.
+    The content is then hashed with large sequential reads into a per-thread buffer;
+    file reads and hashing release the GIL, so threads scale across disks and cores.
+
+    Args:
+        path: Absolute path of the file
+        local_path: Path relative to the sync directory, used in the result
+        expected_size: Recorded size in bytes, None or 0 if unknown
+        expected_checksum: Recorded checksum, None if the download predates checksums
+        read_size: Bytes per read
+
+    Returns:
+        Result of the check
+    """
+    try:
+        actual_size = path.stat().st_size
+    except FileNotFoundError:
+        return FileCheck(local_path, STATUS_MISSING, 0, False)
+    except OSError as e:
+        return FileCheck(local_path, STATUS_UNREADABLE, 0, False, str(e))
+
+    if expected_size and actual_size != expected_size:
+        status = STATUS_TRUNCATED if actual_size < expected_size else STATUS_SIZE_MISMATCH
+        return FileCheck(
+            local_path, status, 0, False, f"{actual_size} bytes, expected {expected_size}"
+        )
+
+    if not expected_checksum:
+        return FileCheck(local_path, STATUS_OK, 0, False)
+
+    hasher = hashlib.new(CHECKSUM_ALGORITHM)
+    try:
+        bytes_read = _hash_sequentially(path, hasher, read_size)
+    except OSError as e:
+        return FileCheck(local_path, STATUS_UNREADABLE, 0, False, str(e))
+
+    if hasher.hexdigest() == expected_checksum:
+        return FileCheck(local_path, STATUS_OK, bytes_read, True)
+    return FileCheck(
+        local_path, STATUS_CHECKSUM_MISMATCH, bytes_read, True, f"{CHECKSUM_ALGORITHM} differs"
+    )
+
+
+def _hash_sequentially(path: Path, hasher: t.Any, read_size: int) -> int:
+    """Feed a file into a hashlib object with large unbuffered reads.
+
+    Args:
+        path: File to hash
+        hasher: hashlib object to update
+        read_size: Bytes per read
+
+    Returns:
+        Number of bytes read
+    """
+    buffer = _read_buffer(read_size)
+    view = memoryview(buffer)
+    bytes_read = 0
+    with open(path, "rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            with contextlib.suppress(OSError):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while count := f.readinto(buffer):
+            hasher.update(view[:count])
+            bytes_read += count
+    return bytes_read
+
+
+def verify_downloads(
+    sync_directory: Path,
+    tracker: DeletionTracker,
+    workers: int | None = None,
+    read_size: int = VERIFY_READ_SIZE,
+) -> VerificationReport:
+    """Verify every file recorded in the downloaded photos table.
+
+    Rows are streamed from the database and checked on a thread pool. Only a few
+    files per worker are in flight at a time, so memory stays flat on any library
+    size while all workers keep reading.
+
+    Args:
+        sync_directory: Directory the recorded local paths are relative to
+        tracker: Tracker holding the download records
+        workers: Number of verification threads, one per CPU core if None
+        read_size: Bytes per read
+
+    Returns:
+        Summary of the run with all files that failed verification
+    """
+    logger = get_logger()
+    workers = max(1, workers or default_verify_workers())
+    started = time.monotonic()
+
+    files_checked = 0
+    bytes_read = 0
+    size_only = 0
+    problems: list[FileCheck] = []
+    # Several records may point to the same file, report it once
+    problem_paths: set[str] = set()
+
+    def collect(future: Future) -> None:
+        nonlocal files_checked, bytes_read, size_only
+        result = future.result()
+        files_checked += 1
+        bytes_read += result.bytes_read
+        if result.status != STATUS_OK:
+            if result.local_path in problem_paths:
+                return
+            problem_paths.add(result.local_path)
+            problems.append(result)
+            logger.warning(f"⚠️ {result.local_path}: {result.status} {result.detail}".rstrip())
+        elif not result.checksum_verified:
+            size_only += 1
+        if files_checked % VERIFY_PROGRESS_INTERVAL == 0:
+            elapsed = max(time.monotonic() - started, 1e-9)
+            logger.info(
+                f"🔍 Verified {files_checked} files, {bytes_read / 1024 / 1024 / elapsed:.1f} MiB/s"
+            )
+
+    logger.info(f"🔍 Verifying downloaded files in {sync_directory} with {workers} workers")
+    pending: set[Future] = set()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="verify") as executor:
+        for row in tracker.iter_downloaded_files():
+            if len(pending) >= workers * VERIFY_QUEUE_DEPTH:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
+            pending.add(
+                executor.submit(
+                    check_file,
+                    sync_directory / row["local_path"],
+                    row["local_path"],
+                    row["file_size"],
+                    row["checksum"],
+                    read_size,
+                )
+            )
+
+        for future in pending:
+            collect(future)
+
+    seconds = time.monotonic() - started
+    logger.info(
+        f"🔍 Verified {files_checked} files ({bytes_read / 1024 / 1024:.1f} MiB hashed) "
+        f"in {seconds:.1f}s, {len(problems)} problems"
+    )
+    return VerificationReport(files_checked, bytes_read, size_only, problems, seconds)
+
+
+def queue_for_redownload(
+    sync_directory: Path, tracker: DeletionTracker, problems: t.Iterable[FileCheck]
+) -> int:
+    """Remove damaged files and their download records, so the next sync fetches them.
+
+    Missing files are left alone: they were deleted locally, which the sync records
+    as a deletion instead of downloading the photo again.
+
+    Args:
+        sync_directory: Directory the local paths are relative to
+        tracker: Tracker holding the download records
+        problems: Failed checks returned by verify_downloads()
+
+    Returns:
+        Number of files queued for download
+    """
+    logger = get_logger()
+    queued = 0
+    for problem in problems:
+        if problem.status not in REPAIRABLE_STATUSES:
+            continue
+        # Forget the record first: a file without a record is downloaded again,
+        # while a record without a file would count as a local deletion
+        if not tracker.forget_downloaded_file(problem.local_path):
+            continue
+        try:
+            (sync_directory / problem.local_path).unlink(missing_ok=True)
+        except OSError as e:
+            logger.error(f"❌ Failed to remove damaged file {problem.local_path}: {e}")
+            continue
+        logger.info(f"♻️ Queued {problem.local_path} for download")
+        queued += 1
+    tracker.flush()
+    return queued
@@ -0,0 +1,217 @@
+"""Single-pass scanning of the local sync directory."""
+
+import os
+import time
+import typing as t
+from pathlib import Path
+
+from .logger import get_logger
+
+# Extensions counted as photos when deciding what already exists locally
+IMAGE_EXTENSIONS = frozenset(
+    {
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".gif",
+        ".bmp",
+        ".tiff",
+        ".tif",
+        ".webp",
+        ".heic",
+        ".heif",
+    }
+)
+
+
+# Directories modified this close to the scan are rescanned next time: a change in the
+# same mtime tick would otherwise go unnoticed
+RACY_MTIME_WINDOW_SECONDS = 2.0
+
+
+class LocalFileEntry(t.NamedTuple):
+    """Stat data of one file in the sync directory."""
+
+    size: int
+    mtime: float
+    inode: int
+
+
+class DirectoryEntry(t.NamedTuple):
+    """State of one scanned directory, used to skip it when unchanged."""
+
+    mtime: float
+    child_count: int
+
+
+class LocalSnapshot:
+    """Files found in the sync directory, keyed by their path relative to it.
+
+    The snapshot is taken once per sync and answers all "does this file exist"
+    questions of that sync, so no further stat calls hit the sync directory.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        files: dict[str, LocalFileEntry],
+        directories: dict[str, DirectoryEntry] | None = None,
+        stale_directories: set[str] | None = None,
+    ) -> None:
+        """Initialize snapshot.
+
+        Args:
+            root: Scanned sync directory
+            files: Mapping of relative path to file stat data
+            directories: Mapping of relative directory path ("" is the root) to its state
+            stale_directories: Directories that were listed or vanished since the
+                previous snapshot; None if the whole tree was listed
+        """
+        self.root = root
+        self.files = files
+        self.directories = directories if directories is not None else {}
+        self.stale_directories = stale_directories
+
+    def __contains__(self, relative_path: object) -> bool:
+        """Check whether a relative path exists in the snapshot.
+
+        Paths recorded with forward slashes match on every platform.
+        """
+        if not isinstance(relative_path, str):
+            return False
+        return os.path.normpath(relative_path) in self.files
+
+    def __len__(self) -> int:
+        """Return the number of files in the snapshot."""
+        return len(self.files)
+
+    def get(self, relative_path: str) -> LocalFileEntry | None:
+        """Get stat data of a file.
+
+        Args:
+            relative_path: Path relative to the sync directory
+
+        Returns:
+            File stat data, or None if the file does not exist
+        """
+        return self.files.get(os.path.normpath(relative_path))
+
+    def image_files(self) -> set[str]:
+        """Get relative paths of all visible image files.
+
+        Returns:
+            Set of image file paths relative to the sync directory
+        """
+        return {
+            relative_path
+            for relative_path in self.files
+            if not os.path.basename(relative_path).startswith(".")
+            and os.path.splitext(relative_path)[1].lower() in IMAGE_EXTENSIONS
+        }
+
+
+def scan_directory(root: Path, previous: LocalSnapshot | None = None) -> LocalSnapshot:
+    """Walk a directory tree once with ``os.scandir``.
+
+    Directory entries carry their file type, so only regular files are stat'ed, once
+    each. Symlinked directories are not followed, matching ``Path.rglob``.
+
+    With a previous snapshot of the same root, directories whose mtime did not change
+    are not listed again; their files are taken from the previous snapshot. Adding,
+    removing or renaming an entry changes the mtime of its directory, so only
+    in-place modifications of existing files go unnoticed.
+
+    Args:
+        root: Directory to scan
+        previous: Snapshot of an earlier scan of ``root``
+
+    Returns:
+        Snapshot of all files below ``root``; empty if ``root`` does not exist
+    """
+    logger = get_logger()
+    if previous is not None and Path(previous.root) != Path(root):
+        previous = None
+
+    files: dict[str, LocalFileEntry] = {}
+    directories: dict[str, DirectoryEntry] = {}
+    listed: set[str] = set()
+    previous_files, previous_subdirs = _group_by_directory(previous)
+    racy_after = time.time() - RACY_MTIME_WINDOW_SECONDS
+    pending = [("", os.fspath(root))]
+
+    while pending:
+        relative_dir, directory = pending.pop()
+        try:
+            mtime = os.stat(directory).st_mtime
+            cached = previous.directories.get(relative_dir) if previous else None
+            if cached is not None and cached.mtime == mtime:
+                # Unchanged since the last scan, reuse its listing
+                directories[relative_dir] = cached
+                for name in previous_files.get(relative_dir, ()):
+                    relative_path = os.path.join(relative_dir, name) if relative_dir else name
+                    files[relative_path] = previous.files[relative_path]
+                for name in previous_subdirs.get(relative_dir, ()):
+                    relative_path = os.path.join(relative_dir, name) if relative_dir else name
+                    pending.append((relative_path, os.path.join(directory, name)))
+                continue
+
+            child_count = 0
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    child_count += 1
+                    relative_path = (
+                        os.path.join(relative_dir, entry.name) if relative_dir else entry.name
+                    )
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append((relative_path, entry.path))
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            files[relative_path] = LocalFileEntry(
+                                stat.st_size, stat.st_mtime, stat.st_ino
+                            )
+                    except OSError as e:
+                        # File vanished or is unreadable while scanning
+                        logger.debug(f"Skipping {entry.path}: {e}")
+
+            # An mtime of -1 never matches, so a racy directory is listed again next time
+            directories[relative_dir] = DirectoryEntry(
+                mtime if mtime < racy_after else -1.0, child_count
+            )
+            listed.add(relative_dir)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.warning(f"⚠️ Cannot scan directory {directory}: {e}")
+
+    stale_directories = None
+    if previous is not None:
+        stale_directories = listed | (previous.directories.keys() - directories.keys())
+
+    return LocalSnapshot(Path(root), files, directories, stale_directories)
+
+
+def _group_by_directory(
+    snapshot: LocalSnapshot | None,
+) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """Group the files and subdirectories of a snapshot by their parent directory.
+
+    Args:
+        snapshot: Snapshot to group, may be None
+
+    Returns:
+        Tuple of (file names per directory, subdirectory names per directory)
+    """
+    files: dict[str, list[str]] = {}
+    subdirs: dict[str, list[str]] = {}
+    if snapshot is None:
+        return files, subdirs
+
+    for relative_path in snapshot.files:
+        parent, name = os.path.split(relative_path)
+        files.setdefault(parent, []).append(name)
+    for relative_dir in snapshot.directories:
+        if relative_dir:
+            parent, name = os.path.split(relative_dir)
+            subdirs.setdefault(parent, []).append(name)
+    return files, subdirs
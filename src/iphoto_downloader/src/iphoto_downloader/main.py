@@ -11,8 +11,14 @@ import sys
 from auth2fa.pushover_service import PushoverService
 from iphoto_downloader.config import BaseConfig, get_config
 from iphoto_downloader.continuous_runner import run_execution_mode
+from iphoto_downloader.deletion_tracker import DeletionTracker
 from iphoto_downloader.delivery_artifacts import DeliveryArtifactsManager
 from iphoto_downloader.instance_manager import InstanceManager
+from iphoto_downloader.integrity import (
+    REPAIRABLE_STATUSES,
+    queue_for_redownload,
+    verify_downloads,
+)
 from iphoto_downloader.logger import get_logger, setup_logging
 from iphoto_downloader.manage_credentials import (
     icloud_store_credentials,
@@ -31,6 +37,9 @@ def main() -> None:
         epilog="""
 Examples:
   iphoto_downloader              Run the sync process
+  iphoto_downloader verify       Check downloaded files against their checksums
+  iphoto_downloader verify --repair
+                                 Also queue damaged files for download
   iphoto_downloader --help       Show this help message
 
 For detailed configuration and usage instructions, visit:
@@ -42,8 +51,29 @@ https://github.com/HenningUe/iphoto-downloader/blob/main/USER-GUIDE.md
         "--version", action="version", version=f"iPhoto Downloader Tool v{get_version()}"
     )
 
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["sync", "verify"],
+        default="sync",
+        help="sync photos from iCloud (default) or verify the downloaded files",
+    )
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        help="verify: remove damaged files so the next sync downloads them again",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="verify: number of files checked in parallel (default: one per CPU core)",
+    )
+
     # Parse arguments - this will handle --help and --version automatically
-    parser.parse_args()
+    args = parser.parse_args()
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
 
     # Set UTF-8 encoding for stdout/stderr to handle Unicode characters on Windows
     # This is particularly important for PyInstaller executables
@@ -99,6 +129,13 @@ https://github.com/HenningUe/iphoto-downloader/blob/main/USER-GUIDE.md
 
         # Enforce single instance if required (will exit if another instance is running)
         with instance_manager.instance_context():
+            if args.command == "verify":
+                # Works on local files only, no iCloud access needed
+                if not run_verify_mode(config, repair=args.repair, workers=args.workers):
+                    safe_input("Press Enter to exit...")
+                    sys.exit(1)
+                return
+
             if not config.icloud_has_stored_credentials():
                 print("🔑 iCloud credentials not found in keyring.")
                 icloud_store_credentials()
@@ -156,6 +193,51 @@ https://github.com/HenningUe/iphoto-downloader/blob/main/USER-GUIDE.md
         sys.exit(1)
 
 
+def run_verify_mode(config: BaseConfig, repair: bool = False, workers: int | None = None) -> bool:
+    """Verify all downloaded files and print a report.
+
+    Args:
+        config: Application configuration
+        repair: Remove damaged files so the next sync downloads them again
+        workers: Number of files checked in parallel, one per CPU core if None
+
+    Returns:
+        True if no file is damaged or missing, False otherwise
+    """
+    logger = get_logger()
+    if not config.database_path.exists():
+        print(f"❌ No download database found at {config.database_path}")
+        return False
+
+    tracker = DeletionTracker(str(config.database_path))
+    try:
+        report = verify_downloads(config.sync_directory, tracker, workers=workers)
+
+        print(f"\n🔍 Verified {report.files_checked} files in {report.seconds:.1f}s")
+        if report.size_only:
+            print(f"   {report.size_only} files without stored checksum were checked by size only")
+        if not report.problems:
+            print("✅ All downloaded files are intact")
+            return True
+
+        by_status: dict[str, int] = {}
+        for problem in report.problems:
+            by_status[problem.status] = by_status.get(problem.status, 0) + 1
+            print(f"   ❌ {problem.local_path}: {problem.status} {problem.detail}".rstrip())
+        summary = ", ".join(f"{count} {status}" for status, count in sorted(by_status.items()))
+        print(f"⚠️ {len(report.problems)} files failed verification: {summary}")
+
+        if repair:
+            queued = queue_for_redownload(config.sync_directory, tracker, report.problems)
+            print(f"♻️ {queued} damaged files will be downloaded again on the next sync")
+        elif any(problem.status in REPAIRABLE_STATUSES for problem in report.problems):
+            print("   Run 'iphoto_downloader verify --repair' to download damaged files again")
+        logger.warning(f"⚠️ Verification found {len(report.problems)} problems")
+        return False
+    finally:
+        tracker.close()
+
+
 def send_error_notification(
     config: BaseConfig, error_message: str, error_type: str = "Application Error"
 ) -> None:
@@ -0,0 +1,127 @@
+"""Compact per-photo metadata passed from listing to download."""
+
+import typing as t
+
+
+class PhotoRecord:
+    """Metadata of one iCloud photo.
+
+    Slots keep the per-photo footprint small on large libraries. The pyicloud asset
+    is only needed to download the photo and can be dropped with release() once the
+    download decision is made.
+
+    For code written against the former metadata dictionaries, fields can also be
+    read by key (``record["id"]``, ``record.get("album_name")``).
+    """
+
+    __slots__ = (
+        "album_name",
+        "checksum",
+        "created",
+        "filename",
+        "id",
+        "modified",
+        "photo_obj",
+        "position",
+        "size",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        filename: str,
+        size: int = 0,
+        created: t.Any = None,
+        modified: t.Any = None,
+        album_name: str | None = None,
+        photo_obj: t.Any = None,
+        checksum: str | None = None,
+        position: int | None = None,
+    ) -> None:
+        """Initialize photo record.
+
+        Args:
+            id: iCloud photo id
+            filename: Original filename
+            size: Size in bytes, 0 if unknown
+            created: Creation date
+            modified: Modification date
+            album_name: Album the photo was listed from, None for no album
+            photo_obj: pyicloud asset used for downloading
+            checksum: SHA-256 hex digest of the content, set once downloaded
+            position: Index of the photo in its album listing, None if unknown
+        """
+        self.id = id
+        self.filename = filename
+        self.size = size
+        self.created = created
+        self.modified = modified
+        self.album_name = album_name
+        self.photo_obj = photo_obj
+        self.checksum = checksum
+        self.position = position
+
+    @classmethod
+    def from_asset(
+        cls, photo: t.Any, album_name: str | None, position: int | None = None
+    ) -> "PhotoRecord":
+        """Create a record from a pyicloud photo asset.
+
+        Args:
+            photo: pyicloud photo asset
+            album_name: Album the asset was listed from
+            position: Index of the asset in the album listing
+
+        Returns:
+            Photo record keeping a reference to the asset for downloading
+        """
+        return cls(
+            id=photo.id,
+            filename=photo.filename,
+            size=getattr(photo, "size", 0),
+            created=getattr(photo, "created", None),
+            modified=getattr(photo, "modified", None),
+            album_name=album_name,
+            photo_obj=photo,
+            position=position,
+        )
+
+    @classmethod
+    def coerce(cls, photo: "PhotoRecord | t.Mapping[str, t.Any]") -> "PhotoRecord":
+        """Get a record for a photo given as record or metadata dictionary.
+
+        Args:
+            photo: Photo record or dictionary with at least "id" and "filename"
+
+        Returns:
+            The record itself, or a new record with the dictionary's fields
+        """
+        if isinstance(photo, cls):
+            return photo
+        return cls(**{key: photo[key] for key in cls.__slots__ if key in photo})
+
+    def release(self) -> None:
+        """Drop the reference to the pyicloud asset once it is no longer needed."""
+        self.photo_obj = None
+
+    def __getitem__(self, key: str) -> t.Any:
+        """Read a field by name.
+
+        Raises:
+            KeyError: If the record has no such field
+        """
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: t.Any = None) -> t.Any:
+        """Read a field by name, returning ``default`` for unknown fields."""
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether the record has a field of that name."""
+        return key in self.__slots__
+
+    def __repr__(self) -> str:
+        """Return a short representation for logs and debugging."""
+        return f"PhotoRecord(id={self.id!r}, filename={self.filename!r}, album={self.album_name!r})"
@@ -0,0 +1,94 @@
+"""Background prefetching of slow iterators."""
+
+import queue
+import threading
+import typing as t
+
+# Marks the end of the source iterator in the queue
+_DONE = object()
+
+# How often a blocked producer checks whether the consumer went away
+_PUT_TIMEOUT_SECONDS = 0.1
+
+
+class _Failure(t.NamedTuple):
+    """Exception raised by the source iterator, re-raised in the consumer."""
+
+    error: BaseException
+
+
+class PrefetchIterator[T]:
+    """Iterate a source on a background thread, up to ``max_items`` ahead of the consumer.
+
+    The producer starts right away and blocks once the bounded queue is full, so
+    memory stays bounded. Exceptions of the source are re-raised to the consumer at
+    the position they occurred. After close(), or once the iterator is garbage
+    collected, the producer stops at its next item.
+    """
+
+    def __init__(self, source: t.Iterable[T], max_items: int, name: str = "Prefetch") -> None:
+        """Initialize iterator and start the producer thread.
+
+        Args:
+            source: Iterable to prefetch, e.g. a lazily paging album
+            max_items: Maximum number of items buffered ahead of the consumer
+            name: Name of the producer thread
+        """
+        self._buffer: queue.Queue = queue.Queue(maxsize=max(1, max_items))
+        self._stopped = threading.Event()
+        self._finished = False
+        # The thread must not reference self, or a dropped iterator would never stop it
+        threading.Thread(
+            target=_produce, args=(source, self._buffer, self._stopped), daemon=True, name=name
+        ).start()
+
+    def __iter__(self) -> "PrefetchIterator[T]":
+        """Return the iterator itself."""
+        return self
+
+    def __next__(self) -> T:
+        """Get the next item, waiting for the producer if none is buffered.
+
+        Raises:
+            StopIteration: After the last item or close()
+        """
+        if self._finished:
+            raise StopIteration
+        item = self._buffer.get()
+        if item is _DONE:
+            self.close()
+            raise StopIteration
+        if isinstance(item, _Failure):
+            self.close()
+            raise item.error
+        return item
+
+    def close(self) -> None:
+        """Stop the producer and end the iteration."""
+        self._finished = True
+        self._stopped.set()
+
+    def __del__(self) -> None:
+        """Stop the producer when the iterator is dropped without close()."""
+        self._stopped.set()
+
+
+def _produce(source: t.Iterable[t.Any], buffer: queue.Queue, stopped: threading.Event) -> None:
+    """Producer thread: move source items into the queue until done or stopped."""
+
+    def put(item: object) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=_PUT_TIMEOUT_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        for item in source:
+            if not put(item):
+                return
+        put(_DONE)
+    except BaseException as e:
+        put(_Failure(e))
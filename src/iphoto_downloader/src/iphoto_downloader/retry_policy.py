@@ -0,0 +1,76 @@
+"""Exponential backoff with jitter for retrying failed downloads."""
+
+import random
+import time
+import typing as t
+
+
+class RetryPolicy:
+    """Decide when a failed photo is retried and when it is given up.
+
+    The n-th consecutive failure of a photo defers its next attempt by
+    ``base_seconds * 2 ** (n - 1)``, capped at ``max_seconds``. The delay is drawn
+    between half and all of that ("equal jitter"), so photos failing together in one
+    outage are not all retried in the same sync again. After ``max_attempts``
+    failures the photo is not retried anymore.
+    """
+
+    def __init__(
+        self,
+        base_seconds: float,
+        max_seconds: float,
+        max_attempts: int,
+        rng: t.Callable[[float, float], float] = random.uniform,
+    ) -> None:
+        """Initialize policy.
+
+        Args:
+            base_seconds: Delay after the first failure
+            max_seconds: Longest delay between two attempts
+            max_attempts: Failures after which a photo is given up
+            rng: Function returning a random number between its two arguments
+        """
+        self.base_seconds = max(0.0, base_seconds)
+        self.max_seconds = max(self.base_seconds, max_seconds)
+        self.max_attempts = max(1, max_attempts)
+        self._rng = rng
+
+    def delay(self, error_count: int) -> float:
+        """Get the jittered delay after a number of consecutive failures.
+
+        Args:
+            error_count: Consecutive failures so far, at least 1
+
+        Returns:
+            Seconds to wait before the next attempt
+        """
+        exponent = min(max(0, error_count - 1), 62)
+        ceiling = min(self.max_seconds, self.base_seconds * 2**exponent)
+        return self._rng(ceiling / 2, ceiling)
+
+    def next_attempt_at(self, error_count: int, now: float | None = None) -> float:
+        """Get when a photo is due again after its latest failure.
+
+        Args:
+            error_count: Consecutive failures including the latest one
+            now: Time of the latest failure as epoch seconds, the current time if None
+
+        Returns:
+            Epoch seconds of the next attempt
+        """
+        return (time.time() if now is None else now) + self.delay(error_count)
+
+    def exhausted(self, error_count: int) -> bool:
+        """Check whether a photo failed too often to be retried."""
+        return error_count >= self.max_attempts
+
+
+class RetryState(t.NamedTuple):
+    """Failure history of a photo in an album."""
+
+    error_count: int
+    next_retry_at: float | None
+
+    def is_due(self, now: float) -> bool:
+        """Check whether the backoff has elapsed; failures without schedule are due."""
+        return self.next_retry_at is None or now >= self.next_retry_at
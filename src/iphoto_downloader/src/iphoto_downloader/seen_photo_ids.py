@@ -0,0 +1,126 @@
+"""Memory-bounded set of photo ids for deduplicating listings."""
+
+import contextlib
+import hashlib
+import os
+import sqlite3
+import tempfile
+
+from .logger import get_logger
+
+# Rough footprint of one id in a Python set: ~50 character str plus the set slot
+BYTES_PER_IN_MEMORY_ID = 160
+
+# Bit positions set per id in the Bloom filter
+BLOOM_HASH_COUNT = 4
+
+
+class SeenPhotoIds:
+    """Set of the photo ids seen during one listing, bounded in memory.
+
+    Ids are kept in a plain set until half of the memory budget is used. The set is
+    then spilled to a temporary SQLite file and cleared. The other half of the budget
+    holds a Bloom filter over all spilled ids: ids it has never seen are known to be
+    new without touching the disk, the rare possible hits are checked exactly in the
+    database. Lookups stay exact no matter how many ids are spilled.
+    """
+
+    def __init__(self, memory_budget_bytes: int) -> None:
+        """Initialize empty id set.
+
+        Args:
+            memory_budget_bytes: Approximate memory the set may use
+        """
+        self.logger = get_logger()
+        half_budget = max(BYTES_PER_IN_MEMORY_ID, memory_budget_bytes // 2)
+        self._max_in_memory = half_budget // BYTES_PER_IN_MEMORY_ID
+        self._bloom_bits = half_budget * 8
+
+        self._recent: set[str] = set()
+        self._spilled_count = 0
+        self._bloom: bytearray | None = None
+        self._db: sqlite3.Connection | None = None
+        self._db_path: str | None = None
+
+    def __len__(self) -> int:
+        """Return the number of ids seen."""
+        return len(self._recent) + self._spilled_count
+
+    def __contains__(self, photo_id: object) -> bool:
+        """Check whether an id was seen."""
+        if not isinstance(photo_id, str):
+            return False
+        return photo_id in self._recent or self._is_spilled(photo_id)
+
+    def add(self, photo_id: str) -> bool:
+        """Record an id.
+
+        Args:
+            photo_id: iCloud photo id
+
+        Returns:
+            True if the id was not seen before
+        """
+        if photo_id in self:
+            return False
+        self._recent.add(photo_id)
+        if len(self._recent) >= self._max_in_memory:
+            self._spill()
+        return True
+
+    def close(self) -> None:
+        """Release memory and delete the spill file."""
+        self._recent.clear()
+        self._bloom = None
+        self._spilled_count = 0
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        if self._db_path is not None:
+            with contextlib.suppress(OSError):
+                os.remove(self._db_path)
+            self._db_path = None
+
+    def _bloom_positions(self, photo_id: str) -> list[int]:
+        """Get the Bloom filter bit positions of an id."""
+        digest = hashlib.blake2b(photo_id.encode(), digest_size=4 * BLOOM_HASH_COUNT).digest()
+        return [
+            int.from_bytes(digest[i : i + 4], "little") % self._bloom_bits
+            for i in range(0, len(digest), 4)
+        ]
+
+    def _is_spilled(self, photo_id: str) -> bool:
+        """Check whether an id was spilled to disk."""
+        if self._bloom is None:
+            return False
+        for position in self._bloom_positions(photo_id):
+            if not self._bloom[position >> 3] & (1 << (position & 7)):
+                return False
+        row = self._db.execute("SELECT 1 FROM seen WHERE photo_id = ?", (photo_id,)).fetchone()
+        return row is not None
+
+    def _spill(self) -> None:
+        """Move the in-memory ids to the spill file."""
+        if self._db is None:
+            fd, self._db_path = tempfile.mkstemp(prefix="iphoto-seen-ids-", suffix=".db")
+            os.close(fd)
+            # Only used by the generator that owns this set, which may resume on any thread
+            self._db = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=OFF")
+            self._db.execute("PRAGMA synchronous=OFF")
+            self._db.execute("CREATE TABLE seen (photo_id TEXT PRIMARY KEY) WITHOUT ROWID")
+            self._bloom = bytearray(self._bloom_bits // 8)
+            self.logger.info(
+                f"💾 Over {self._max_in_memory} photo ids seen, spilling to {self._db_path}"
+            )
+
+        for photo_id in self._recent:
+            for position in self._bloom_positions(photo_id):
+                self._bloom[position >> 3] |= 1 << (position & 7)
+        with self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO seen (photo_id) VALUES (?)",
+                ((photo_id,) for photo_id in self._recent),
+            )
+        self._spilled_count += len(self._recent)
+        self._recent.clear()
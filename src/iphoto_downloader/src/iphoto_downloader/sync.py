@@ -2,14 +2,23 @@
 
 import contextlib
 import re
+import time
 import typing as t
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
 
 from auth2fa.pushover_service import PushoverService as PushoverNotificationService
 
+from .circuit_breaker import CircuitOpenError
 from .config import BaseConfig
 from .deletion_tracker import DeletionTracker
-from .icloud_client import ICloudClient
+from .download_order import LookaheadWindow
+from .file_links import link_or_clone
+from .icloud_client import DownloadSkippedError, ICloudClient
+from .local_scanner import LocalSnapshot, scan_directory
 from .logger import get_logger
+from .photo_record import PhotoRecord
+from .retry_policy import RetryPolicy, RetryState
 
 
 class PhotoSyncer:
@@ -35,7 +44,24 @@ class PhotoSyncer:
             "deleted_skipped": 0,
             "errors": 0,
             "bytes_downloaded": 0,
+            "linked_duplicates": 0,
+            "retries_deferred": 0,
+            "circuit_skipped": 0,
+            "size_skipped": 0,
         }
+        self.retry_policy = RetryPolicy(
+            base_seconds=config.retry_backoff_minutes * 60,
+            max_seconds=config.retry_max_backoff_hours * 3600,
+            max_attempts=config.retry_max_attempts,
+        )
+        # Failure history by (photo_id, album_name), loaded at the start of each sync
+        self._retry_states: dict[tuple[str, str], RetryState] = {}
+        # Failures of this sync recorded for a targeted retry
+        self._recorded_failures = 0
+        # Scan of the sync directory taken by _get_local_files() for the current sync
+        self._local_snapshot: LocalSnapshot | None = None
+        # Set by the continuous runner while a file watcher records local changes
+        self.local_changes_watched = False
 
     @property
     def logger(self):
@@ -82,8 +108,21 @@ class PhotoSyncer:
             # Track files that were deleted locally
             self._track_local_deletions(local_files)
 
-            # Sync photos
-            self._sync_photos(local_files)
+            # Answer per-photo skip checks from memory for the rest of the sync
+            self.deletion_tracker.load_membership_index()
+
+            # Photos that failed before are only attempted once their backoff elapsed
+            self._retry_states = self.deletion_tracker.get_retry_states()
+            self._recorded_failures = 0
+
+            # Sync photos, grouping the tracker records into larger transactions
+            self.deletion_tracker.begin_write_batch()
+            try:
+                download_count = self._sync_photos(local_files)
+                self._retry_failed_downloads(download_count)
+                self._save_album_listing_states()
+            finally:
+                self.deletion_tracker.end_write_batch()
 
             # Print summary
             self._print_summary()
@@ -192,38 +231,26 @@ class PhotoSyncer:
     def _get_local_files(self) -> set[str]:
         """Get set of existing local filenames with their relative paths.
 
+        The sync directory is walked once; the full scan is kept for the deletion
+        checks of the same sync. Directories unchanged since the scan stored by the
+        previous sync are not listed again.
+
         Returns:
             Set of local image file paths relative to sync directory
         """
+        self._local_snapshot = None
         try:
-            local_files = set()
-
-            # Define image file extensions
-            image_extensions = {
-                ".jpg",
-                ".jpeg",
-                ".png",
-                ".gif",
-                ".bmp",
-                ".tiff",
-                ".tif",
-                ".webp",
-                ".heic",
-                ".heif",
-            }
-
-            if self.config.sync_directory.exists():
-                for file_path in self.config.sync_directory.rglob("*"):
-                    if (
-                        file_path.is_file()
-                        and not file_path.name.startswith(".")
-                        and file_path.suffix.lower() in image_extensions
-                    ):
-                        # Use relative path from sync directory for album support
-                        relative_path = file_path.relative_to(self.config.sync_directory)
-                        local_files.add(str(relative_path))
-
-            return local_files
+            sync_directory = self.config.sync_directory
+            previous = self.deletion_tracker.load_local_snapshot(sync_directory)
+            self._local_snapshot = scan_directory(sync_directory, previous)
+            self.deletion_tracker.save_local_snapshot(self._local_snapshot)
+
+            if previous is not None:
+                self.logger.debug(
+                    f"📁 Rescanned {len(self._local_snapshot.stale_directories or ())} of "
+                    f"{len(self._local_snapshot.directories)} local directories"
+                )
+            return self._local_snapshot.image_files()
 
         except Exception as e:
             self.logger.error(f"❌ Error scanning local files: {e}")
@@ -235,11 +262,16 @@ class PhotoSyncer:
         Args:
             local_files: Set of current local filenames
         """
+        if self.local_changes_watched:
+            self.logger.debug("👀 Local deletions are recorded by the file watcher")
+            self._log_deletion_stats()
+            return
+
         self.logger.debug("🔍 Checking for locally deleted files")
 
         # Detect photos that were downloaded but are now missing locally
         deleted_photos = self.deletion_tracker.detect_locally_deleted_photos(
-            self.config.sync_directory
+            self.config.sync_directory, self._local_snapshot
         )
 
         if deleted_photos:
@@ -249,155 +281,603 @@ class PhotoSyncer:
         else:
             self.logger.debug("✅ No locally deleted photos detected")
 
-        # Get previously tracked deleted photos
-        deleted_photo_ids = self.deletion_tracker.get_deleted_photos()
-
         # Check if any deleted photos now exist locally (were restored)
-        restored_count = 0
-        for photo_id in deleted_photo_ids:
-            # Check if this photo is back in local files
-            downloaded_photos = self.deletion_tracker.get_downloaded_photos()
-            if photo_id in downloaded_photos:
-                metadata = downloaded_photos[photo_id]
-                local_path = self.config.sync_directory / metadata["local_path"]
-                if local_path.exists():
-                    # Photo was restored, remove from deletion tracker
-                    self.deletion_tracker.remove_deleted_photo(photo_id)
-                    self.logger.info(f"🔄 Restored deleted photo: {metadata['local_path']}")
-                    restored_count += 1
+        restored_photos = self.deletion_tracker.detect_restored_photos(
+            self.config.sync_directory, self._local_snapshot
+        )
+        if restored_photos:
+            # Photo was restored, remove from deletion tracker
+            self.deletion_tracker.remove_deleted_copies(
+                [(photo["filename"], photo["album_name"]) for photo in restored_photos]
+            )
+            for photo in restored_photos:
+                self.logger.info(f"🔄 Restored deleted photo: {photo['local_path']}")
+        restored_count = len(restored_photos)
 
         if restored_count > 0:
             self.logger.info(f"🔄 Found {restored_count} restored photos")
 
+        self._log_deletion_stats()
+
+    def _log_deletion_stats(self) -> None:
+        """Log how many photos the deletion tracker knows as deleted."""
         # Get deletion tracker stats
         stats = self.deletion_tracker.get_stats()
         if stats["total_deleted"] > 0:
             self.logger.info(f"📝 Deletion tracker has {stats['total_deleted']} deleted photos")
 
-    def _sync_photos(self, local_files: set[str]) -> None:
+    def _sync_photos(self, local_files: set[str]) -> int:
         """Sync photos from iCloud with album support.
 
+        Photos are taken in ``DOWNLOAD_ORDER`` within a window of ``DOWNLOAD_LOOKAHEAD``
+        listed photos. Download decisions are made on the calling thread, the actual transfers run on a
+        bounded pool of ``MAX_DOWNLOAD_WORKERS`` threads, of which the iCloud client lets
+        as many transfer at once as its adaptive concurrency limit allows. Finished
+        downloads are funneled back to the calling thread, which is the only one updating
+        the tracker and the stats.
+
+        Photos that failed in an earlier sync are skipped until their retry is due and
+        once they failed ``RETRY_MAX_ATTEMPTS`` times. The sync stops early when the
+        iCloud client's circuit breaker reports a longer outage.
+
         Args:
             local_files: Set of existing local file paths relative to sync directory
+
+        Returns:
+            Number of photos downloaded (or counted as downloaded in a dry run)
         """
         download_count = 0
+        now = time.time()
+        max_workers = max(1, self.config.download_workers, self.config.max_download_workers)
+        max_in_flight = max_workers * 2
+
+        # Downloads handed to the pool but not yet recorded
+        pending: dict[Future[bool], tuple[PhotoRecord, str, Path]] = {}
+        # Relative paths scheduled in this run, to skip duplicates while still in flight
+        scheduled_paths: set[str] = set()
+        # Downloads by photo id, so later album placements can wait for the first copy
+        downloads_by_id: dict[str, Future[bool]] = {}
+        # Album copies to link once the download of their photo has been recorded
+        waiting_links: dict[Future[bool], list[tuple[PhotoRecord, str, Path]]] = {}
+        link_duplicates = self.config.link_album_duplicates and not self.config.dry_run
+
+        # Prefer the full scan of this sync: it also matches "/" paths on Windows and
+        # knows file sizes
+        snapshot = self._local_snapshot
+        existing_files: t.Container[str] = snapshot if snapshot is not None else local_files
+
+        # Get photos based on selected source (main library and/or albums), reordered
+        # within a look-ahead window so that e.g. large videos do not hold up photos
+        photo_window = LookaheadWindow(
+            self._get_photo_iterator(), self.config.download_order, self.config.download_lookahead
+        )
 
-        # Get photos based on selected source (main library and/or albums)
-        photo_iterator = self._get_photo_iterator()
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="PhotoDownload"
+        ) as executor:
+            for listed_photo in photo_window:
+                photo_info = listed_photo
+                scheduled = False
+                try:
+                    photo_info = PhotoRecord.coerce(listed_photo)
 
-        for photo_info in photo_iterator:
-            try:
-                self.stats["total_photos"] += 1
-                filename = photo_info["filename"]
-                photo_id = photo_info["id"]
-                album_name = photo_info.get("album_name")
-
-                # Check if we've reached download limit
-                if self.config.max_downloads > 0 and download_count >= self.config.max_downloads:
-                    self.logger.info(f"📊 Reached download limit ({self.config.max_downloads})")
-                    break
-
-                # Check if photo was deleted locally (album-aware)
-                if self.deletion_tracker.is_photo_deleted(filename, album_name):
-                    self.logger.debug(f"⏭️ Skipping deleted photo: {filename} from {album_name}")
-                    self.stats["deleted_skipped"] += 1
-                    continue
+                    # Record whatever finished meanwhile, block only if the pool is saturated
+                    download_count += self._collect_downloads(pending, timeout=0)
+                    download_count += self._place_waiting_links(
+                        waiting_links, pending, executor, download_count
+                    )
+                    while len(pending) >= max_in_flight:
+                        download_count += self._collect_downloads(pending)
+                        download_count += self._place_waiting_links(
+                            waiting_links, pending, executor, download_count
+                        )
 
-                # Check if photo was already downloaded from this album (album-aware)
-                if self.deletion_tracker.is_photo_downloaded(filename, album_name):
-                    self.logger.debug(
-                        f"⏭️ Photo already downloaded from album: {filename} from {album_name}"
+                    # iCloud stayed unavailable beyond the download pause, stop hammering it
+                    if self.stats["circuit_skipped"]:
+                        self.logger.warning(
+                            "🔌 iCloud is unavailable, stopping this sync; the remaining "
+                            "photos are synced next time"
+                        )
+                        self._forget_listings_of([photo_info, *photo_window.pending()])
+                        break
+
+                    self.stats["total_photos"] += 1
+                    filename = photo_info.filename
+                    photo_id = photo_info.id
+                    album_name = photo_info.album_name
+
+                    # Check if we've reached download limit (in-flight downloads count too)
+                    if self.config.max_downloads > 0:
+                        download_count += self._wait_for_download_slot(pending, download_count)
+                        if download_count >= self.config.max_downloads:
+                            self.logger.info(
+                                f"📊 Reached download limit ({self.config.max_downloads})"
+                            )
+                            self._forget_listings_of([photo_info, *photo_window.pending()])
+                            break
+
+                    # Check if photo was deleted locally (album-aware)
+                    if self.deletion_tracker.is_photo_deleted(filename, album_name):
+                        self.logger.debug(f"⏭️ Skipping deleted photo: {filename} from {album_name}")
+                        self.stats["deleted_skipped"] += 1
+                        continue
+
+                    # Check if photo was already downloaded from this album (album-aware)
+                    if self.deletion_tracker.is_photo_downloaded(filename, album_name):
+                        self.logger.debug(
+                            f"⏭️ Photo already downloaded from album: {filename} from {album_name}"
+                        )
+                        self.stats["already_exists"] += 1
+                        continue
+
+                    # Create album subfolder path (use root if no album)
+                    if album_name:
+                        album_folder = self._sanitize_album_name(album_name)
+                        relative_path = f"{album_folder}/{filename}"
+                    else:
+                        # For backward compatibility - photos without album go to root
+                        album_folder = ""
+                        relative_path = filename
+
+                    # Same target is already being downloaded in this run
+                    if relative_path in scheduled_paths:
+                        self.logger.debug(
+                            f"⏭️ Photo already scheduled for download: {relative_path}"
+                        )
+                        self.stats["already_exists"] += 1
+                        continue
+
+                    # Check if file already exists locally (fallback safety check)
+                    if relative_path in existing_files:
+                        self.logger.debug(f"⏭️ Photo file already exists locally: {relative_path}")
+                        # Record this as downloaded if not already tracked
+                        if not self.deletion_tracker.is_photo_downloaded(filename, album_name):
+                            entry = snapshot.get(relative_path) if snapshot else None
+                            self.deletion_tracker.add_downloaded_photo(
+                                photo_id=photo_id,
+                                filename=filename,
+                                local_path=relative_path,
+                                file_size=entry.size if entry else None,
+                                album_name=album_name,
+                            )
+                        self.stats["already_exists"] += 1
+                        continue
+
+                    # Photo failed before and its retry is not due yet, or it was given up
+                    retry_state = self._retry_states.get(self._retry_key(photo_info))
+                    if retry_state is not None and not self._retry_allowed(retry_state, now):
+                        self.logger.debug(f"⏭️ Retry of {relative_path} not due yet")
+                        self.stats["retries_deferred"] += 1
+                        continue
+
+                    # Create full local path
+                    local_path = self.config.sync_directory / relative_path
+
+                    # Create subdirectories if needed
+                    local_path.parent.mkdir(parents=True, exist_ok=True)
+
+                    # A copy of this photo from another album can be linked instead
+                    if link_duplicates:
+                        original = downloads_by_id.get(photo_id)
+                        if original in pending:
+                            # Link once the first copy is on disk, keep listing meanwhile
+                            waiting_links.setdefault(original, []).append(
+                                (photo_info, relative_path, local_path)
+                            )
+                            scheduled_paths.add(relative_path)
+                            scheduled = True
+                            continue
+                        if self._link_album_duplicate(photo_info, relative_path, local_path):
+                            continue
+
+                    if self.config.dry_run:
+                        # In dry run mode, just log what would be downloaded
+                        self.logger.info(f"[DRY RUN] Would download: {relative_path}")
+                        download_count += 1
+                        self.stats["new_downloads"] += 1
+                        # Use the photo size from metadata if available
+                        if photo_info.size:
+                            self.stats["bytes_downloaded"] += photo_info.size
+
+                        # In dry run, we don't actually record downloads to avoid
+                        # polluting the tracking database with hypothetical data
+                    else:
+                        # Actually download the photo on the worker pool
+                        future = executor.submit(
+                            self.icloud_client.download_photo, photo_info, str(local_path)
+                        )
+                        pending[future] = (photo_info, relative_path, local_path)
+                        scheduled_paths.add(relative_path)
+                        scheduled = True
+                        if link_duplicates:
+                            downloads_by_id[photo_id] = future
+
+                    # Log progress every 50 photos
+                    if self.stats["total_photos"] % 50 == 0:
+                        self._log_progress()
+
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    self.logger.error(
+                        f"❌ Error processing photo {photo_info.get('filename', 'unknown')}: {e}"
                     )
-                    self.stats["already_exists"] += 1
                     continue
+                finally:
+                    # The pyicloud asset is only needed by a scheduled download
+                    if not scheduled and isinstance(photo_info, PhotoRecord):
+                        photo_info.release()
+
+            # Wait for the remaining downloads and record them
+            while pending or waiting_links:
+                download_count += self._collect_downloads(pending)
+                download_count += self._place_waiting_links(
+                    waiting_links, pending, executor, download_count
+                )
 
-                # Create album subfolder path (use root if no album)
-                if album_name:
-                    album_folder = self._sanitize_album_name(album_name)
-                    relative_path = f"{album_folder}/{filename}"
-                else:
-                    # For backward compatibility - photos without album go to root
-                    album_folder = ""
-                    relative_path = filename
-
-                # Check if file already exists locally (fallback safety check)
-                if relative_path in local_files:
-                    self.logger.debug(f"⏭️ Photo file already exists locally: {relative_path}")
-                    # Record this as downloaded if not already tracked
-                    if not self.deletion_tracker.is_photo_downloaded(filename, album_name):
-                        self.deletion_tracker.add_downloaded_photo(
-                            photo_id=photo_id,
-                            filename=filename,
-                            local_path=relative_path,
-                            album_name=album_name,
-                        )
-                    self.stats["already_exists"] += 1
+        return download_count
+
+    def _wait_for_download_slot(
+        self, pending: dict[Future[bool], tuple[PhotoRecord, str, Path]], download_count: int
+    ) -> int:
+        """Record in-flight downloads until MAX_DOWNLOADS leaves room for another one.
+
+        Args:
+            pending: In-flight downloads, finished entries are removed
+            download_count: Downloads of this sync so far
+
+        Returns:
+            Number of successful downloads recorded meanwhile
+        """
+        downloaded = 0
+        if self.config.max_downloads > 0:
+            while (
+                pending and download_count + downloaded + len(pending) >= self.config.max_downloads
+            ):
+                downloaded += self._collect_downloads(pending)
+        return downloaded
+
+    def _place_waiting_links(
+        self,
+        waiting_links: dict[Future[bool], list[tuple[PhotoRecord, str, Path]]],
+        pending: dict[Future[bool], tuple[PhotoRecord, str, Path]],
+        executor: ThreadPoolExecutor,
+        download_count: int,
+    ) -> int:
+        """Link album copies whose photo finished downloading meanwhile.
+
+        Copies that cannot be linked, e.g. because the first download failed, are
+        downloaded themselves, within MAX_DOWNLOADS and unless iCloud is unavailable.
+        Otherwise they are left to the next sync, like the photos not processed yet.
+
+        Args:
+            waiting_links: Album copies by the download they wait for, placed entries
+                are removed
+            pending: In-flight downloads, downloads of unlinked copies are added
+            executor: Worker pool running the downloads
+            download_count: Downloads of this sync so far
+
+        Returns:
+            Number of successful downloads recorded while waiting for MAX_DOWNLOADS
+        """
+        downloaded = 0
+        for original in [future for future in waiting_links if future not in pending]:
+            for photo_info, relative_path, local_path in waiting_links.pop(original):
+                if self._link_album_duplicate(photo_info, relative_path, local_path):
+                    photo_info.release()
                     continue
 
-                # Create full local path
-                local_path = self.config.sync_directory / relative_path
-
-                # Create subdirectories if needed
-                local_path.parent.mkdir(parents=True, exist_ok=True)
-
-                if self.config.dry_run:
-                    # In dry run mode, just log what would be downloaded
-                    self.logger.info(f"[DRY RUN] Would download: {relative_path}")
-                    download_count += 1
-                    self.stats["new_downloads"] += 1
-                    # Use the photo size from metadata if available
-                    if "size" in photo_info:
-                        self.stats["bytes_downloaded"] += photo_info["size"]
-
-                    # In dry run, we don't actually record downloads to avoid
-                    # polluting the tracking database with hypothetical data
-                # Actually download the photo
-                elif self.icloud_client.download_photo(photo_info, str(local_path)):
-                    download_count += 1
-                    self.stats["new_downloads"] += 1
-
-                    # Update file size stats
-                    file_size = None
+                downloaded += self._wait_for_download_slot(pending, download_count + downloaded)
+                limit_reached = (
+                    self.config.max_downloads > 0
+                    and download_count + downloaded >= self.config.max_downloads
+                )
+                if limit_reached or self.stats["circuit_skipped"]:
+                    photo_info.release()
+                    self._forget_listings_of([photo_info])
+                    continue
+
+                future = executor.submit(
+                    self.icloud_client.download_photo, photo_info, str(local_path)
+                )
+                pending[future] = (photo_info, relative_path, local_path)
+        return downloaded
+
+    def _forget_listings_of(self, photos: t.Iterable[PhotoRecord]) -> None:
+        """Keep albums of unprocessed photos from being saved as completely listed.
+
+        The look-ahead window may have listed an album to its end while some of its
+        photos were still waiting in the window.
+
+        Args:
+            photos: Photos listed but never processed
+        """
+        album_names = {photo.album_name for photo in photos}
+        completed = self.icloud_client.completed_listings
+        for key in [key for key in completed if key[0] in album_names]:
+            del completed[key]
+
+    def _collect_downloads(
+        self,
+        pending: dict[Future[bool], tuple[PhotoRecord, str, Path]],
+        timeout: float | None = None,
+    ) -> int:
+        """Record finished downloads from the worker pool.
+
+        Args:
+            pending: In-flight downloads mapped to (photo record, relative_path, local_path),
+                finished entries are removed
+            timeout: Seconds to wait for at least one download to finish (None waits forever)
+
+        Returns:
+            Number of successful downloads recorded
+        """
+        if not pending:
+            return 0
+
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        downloaded = 0
+        for future in done:
+            photo_info, relative_path, local_path = pending.pop(future)
+            if self._record_download_result(future, photo_info, relative_path, local_path):
+                downloaded += 1
+        return downloaded
+
+    def _record_download_result(
+        self,
+        future: Future[bool],
+        photo_info: PhotoRecord,
+        relative_path: str,
+        local_path: Path,
+    ) -> bool:
+        """Update tracker and stats for a finished download.
+
+        Args:
+            future: Finished download future
+            photo_info: Photo record the download was started for
+            relative_path: Target path relative to sync directory
+            local_path: Full target path
+
+        Returns:
+            True if the photo was downloaded successfully, False otherwise
+        """
+        photo_info.release()
+        try:
+            if not future.result():
+                self.stats["errors"] += 1
+                self.logger.warning(f"⚠️ Failed to download: {relative_path}")
+                self._record_failure(photo_info, relative_path, "Download failed")
+                return False
+
+            self.stats["new_downloads"] += 1
+
+            # Update file size stats
+            file_size = None
+            if local_path.exists():
+                file_size = local_path.stat().st_size
+                self.stats["bytes_downloaded"] += file_size
+
+            # Record the successful download in the tracker
+            self.deletion_tracker.add_downloaded_photo(
+                photo_id=photo_info.id,
+                filename=photo_info.filename,
+                local_path=relative_path,
+                file_size=file_size,
+                album_name=photo_info.album_name,
+                checksum=photo_info.checksum,
+            )
+            retry_key = self._retry_key(photo_info)
+            if self._retry_states.pop(retry_key, None) is not None:
+                self.deletion_tracker.clear_sync_error(*retry_key)
+
+            self.logger.info(f"✅ Downloaded: {relative_path}")
+            return True
+
+        except CircuitOpenError:
+            # Not attempted, so neither an error of the photo nor a retry
+            self.stats["circuit_skipped"] += 1
+            self._forget_listings_of([photo_info])
+            return False
+        except DownloadSkippedError as e:
+            # Skipped on purpose, retrying would not change the outcome
+            self.stats["size_skipped"] += 1
+            self.logger.info(f"⏭️ Skipping {relative_path} ({e})")
+            return False
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.logger.error(f"❌ Error processing photo {photo_info.filename}: {e}")
+            self._record_failure(photo_info, relative_path, str(e))
+            return False
+
+    @staticmethod
+    def _retry_key(photo_info: PhotoRecord) -> tuple[str, str]:
+        """Get the (photo_id, album_name) key of a photo in the tracker."""
+        return (photo_info.id, photo_info.album_name or "Unknown")
+
+    def _retry_allowed(self, retry_state: RetryState, now: float) -> bool:
+        """Check whether a photo that failed before may be attempted now."""
+        return not self.retry_policy.exhausted(retry_state.error_count) and retry_state.is_due(now)
+
+    def _record_failure(
+        self, photo_info: PhotoRecord, relative_path: str, error_message: str
+    ) -> None:
+        """Record a failed download and schedule its retry with exponential backoff.
+
+        Args:
+            photo_info: Photo that failed
+            relative_path: Target path relative to sync directory
+            error_message: Reason of the failure
+        """
+        photo_id, album_name = self._retry_key(photo_info)
+        error_count = self.deletion_tracker.record_sync_error(
+            photo_id,
+            album_name,
+            error_message,
+            filename=photo_info.filename,
+            local_path=relative_path,
+            album_position=photo_info.position,
+        )
+        if not error_count:
+            return
+
+        # Only a photo that can be fetched by position is retried without a listing
+        if photo_info.position is not None:
+            self._recorded_failures += 1
+
+        next_retry_at = None
+        if self.retry_policy.exhausted(error_count):
+            self.logger.warning(
+                f"🛑 Giving up on {relative_path} after {error_count} failed attempts"
+            )
+        else:
+            next_retry_at = self.retry_policy.next_attempt_at(error_count)
+            self.deletion_tracker.schedule_retry(photo_id, album_name, next_retry_at)
+            self.logger.info(
+                f"🔁 Retrying {relative_path} in {(next_retry_at - time.time()) / 60:.0f} "
+                f"minutes (attempt {error_count + 1} of {self.retry_policy.max_attempts})"
+            )
+        self._retry_states[(photo_id, album_name)] = RetryState(error_count, next_retry_at)
+
+    def _retry_failed_downloads(self, download_count: int) -> None:
+        """Retry photos whose backoff elapsed without listing their albums again.
+
+        Photos listed by this sync were already attempted. The remaining due photos,
+        e.g. from albums skipped by an incremental listing, are fetched by their
+        position in the album, one small request each; a photo no longer found there
+        counts as a failed attempt.
+
+        Args:
+            download_count: Downloads of this sync so far, counted against MAX_DOWNLOADS
+        """
+        if self.config.dry_run or self.stats["circuit_skipped"]:
+            return
+
+        try:
+            due = self.deletion_tracker.get_photos_for_retry(
+                max_errors=self.retry_policy.max_attempts, due_before=time.time()
+            )
+            if due:
+                self.logger.info(f"🔁 Retrying {len(due)} previously failed downloads")
+
+            pending: dict[Future[bool], tuple[PhotoRecord, str, Path]] = {}
+            max_workers = max(1, self.config.download_workers)
+            with ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="PhotoRetry"
+            ) as executor:
+                for entry in due:
+                    if (
+                        self.config.max_downloads > 0
+                        and download_count + len(pending) >= self.config.max_downloads
+                    ):
+                        break
+
+                    relative_path = entry["local_path"]
+                    if entry["album_position"] is None or not relative_path:
+                        continue
+                    local_path = self.config.sync_directory / relative_path
                     if local_path.exists():
-                        file_size = local_path.stat().st_size
-                        self.stats["bytes_downloaded"] += file_size
-
-                    # Record the successful download in the tracker
-                    self.deletion_tracker.add_downloaded_photo(
-                        photo_id=photo_id,
-                        filename=filename,
-                        local_path=relative_path,
-                        file_size=file_size,
-                        album_name=album_name,
+                        self.deletion_tracker.clear_sync_error(
+                            entry["photo_id"], entry["album_name"]
+                        )
+                        continue
+
+                    photo_info = self.icloud_client.fetch_album_photo(
+                        entry["album_name"], entry["album_position"], entry["photo_id"]
                     )
+                    if photo_info is None:
+                        self.stats["errors"] += 1
+                        self._record_failure(
+                            PhotoRecord(
+                                entry["photo_id"],
+                                entry["filename"],
+                                album_name=entry["album_name"],
+                                position=entry["album_position"],
+                            ),
+                            relative_path,
+                            "Photo not found at its album position",
+                        )
+                        continue
 
-                    self.logger.info(f"✅ Downloaded: {relative_path}")
-                else:
-                    self.stats["errors"] += 1
-                    self.logger.warning(f"⚠️ Failed to download: {relative_path}")
+                    local_path.parent.mkdir(parents=True, exist_ok=True)
+                    future = executor.submit(
+                        self.icloud_client.download_photo, photo_info, str(local_path)
+                    )
+                    pending[future] = (photo_info, relative_path, local_path)
 
-                # Log progress every 50 photos
-                if self.stats["total_photos"] % 50 == 0:
-                    self._log_progress()
+                while pending:
+                    download_count += self._collect_downloads(pending)
+        except Exception as e:
+            self.logger.error(f"❌ Error retrying failed downloads: {e}")
 
-            except Exception as e:
-                self.stats["errors"] += 1
-                self.logger.error(
-                    f"❌ Error processing photo {photo_info.get('filename', 'unknown')}: {e}"
-                )
+    def _link_album_duplicate(
+        self, photo_info: PhotoRecord, relative_path: str, local_path: Path
+    ) -> bool:
+        """Place a photo already downloaded for another album by linking to that copy.
+
+        Args:
+            photo_info: Photo to place
+            relative_path: Target path relative to sync directory
+            local_path: Full target path
+
+        Returns:
+            True if the photo was linked, False if it has to be downloaded
+        """
+        for source_path, checksum in self.deletion_tracker.get_downloaded_copies(photo_info.id):
+            source = self.config.sync_directory / source_path
+            if source_path == relative_path or not source.is_file():
                 continue
 
-    def _get_photo_iterator(self) -> t.Iterator[dict[str, t.Any]]:
+            try:
+                method = link_or_clone(source, local_path)
+            except OSError as e:
+                self.logger.warning(f"⚠️ Cannot link {relative_path} to {source_path}: {e}")
+                return False
+            if method is None:
+                self.logger.debug(f"Filesystem cannot link {relative_path}, downloading it")
+                return False
+
+            self.deletion_tracker.add_downloaded_photo(
+                photo_id=photo_info.id,
+                filename=photo_info.filename,
+                local_path=relative_path,
+                file_size=source.stat().st_size,
+                album_name=photo_info.album_name,
+                checksum=checksum,
+            )
+            self.stats["linked_duplicates"] += 1
+            self.logger.info(f"🔗 Linked ({method}): {relative_path} -> {source_path}")
+            return True
+
+        return False
+
+    def _get_photo_iterator(self) -> t.Iterator[PhotoRecord]:
         """Get iterator for photos based on configuration.
 
         Returns:
-            Iterator yielding photo information dictionaries
+            Iterator yielding photo records
         """
+        # Continue from the previous listing unless full listings are forced
+        listing_states = None
+        if self.config.full_listing_interval_hours > 0:
+            listing_states = self.deletion_tracker.get_album_listing_states()
+
         # Use album filtering based on configuration
         return self.icloud_client.list_photos_from_filtered_albums(
-            self.config,
+            self.config, listing_states=listing_states
         )
 
+    def _save_album_listing_states(self) -> None:
+        """Remember how far albums were listed, so the next sync only fetches new photos.
+
+        Nothing is stored after a dry run or if any photo failed without being recorded
+        for a targeted retry: those photos must be listed again.
+        """
+        if self.config.dry_run or self.stats["errors"] > self._recorded_failures:
+            return
+        completed = self.icloud_client.completed_listings
+        if completed:
+            self.deletion_tracker.save_album_listing_states(completed)
+
     def _sanitize_album_name(self, album_name: str) -> str:
         """Sanitize album name for use as folder name.
 
@@ -430,6 +910,13 @@ class PhotoSyncer:
             f"{self.stats['deleted_skipped']} deleted, "
             f"{self.stats['errors']} errors"
         )
+        if not self.config.dry_run and self.stats["new_downloads"]:
+            concurrency = self.icloud_client.download_concurrency.snapshot()
+            self.logger.info(
+                f"🎚️ Downloads: {concurrency.in_flight}/{concurrency.limit} in flight, "
+                f"{concurrency.throughput / 1024 / 1024:.1f} MB/s, "
+                f"{concurrency.latency * 1000:.0f} ms latency"
+            )
 
     def _print_summary(self) -> None:
         """Print sync summary."""
@@ -439,8 +926,16 @@ class PhotoSyncer:
         self.logger.info(f"Total photos processed: {self.stats['total_photos']}")
         self.logger.info(f"New downloads: {self.stats['new_downloads']}")
         self.logger.info(f"Already existed: {self.stats['already_exists']}")
+        if self.stats["linked_duplicates"] > 0:
+            self.logger.info(f"Linked album duplicates: {self.stats['linked_duplicates']}")
         self.logger.info(f"Deleted (skipped): {self.stats['deleted_skipped']}")
+        if self.stats["retries_deferred"] > 0:
+            self.logger.info(f"Failed before, retry not due: {self.stats['retries_deferred']}")
         self.logger.info(f"Errors: {self.stats['errors']}")
+        if self.stats["circuit_skipped"] > 0:
+            self.logger.info(f"Postponed (iCloud unavailable): {self.stats['circuit_skipped']}")
+        if self.stats["size_skipped"] > 0:
+            self.logger.info(f"Skipped (over size limit): {self.stats['size_skipped']}")
 
         if self.stats["bytes_downloaded"] > 0:
             mb_downloaded = self.stats["bytes_downloaded"] / (1024 * 1024)
@@ -473,6 +968,14 @@ class PhotoSyncer:
 
         return stats
 
+    def request_pending_writes_flush(self) -> None:
+        """Have tracker records waiting in the current write batch committed soon.
+
+        Safe to call from a signal handler, the commit happens on the batch's flush
+        thread once the write in progress is complete.
+        """
+        self.deletion_tracker.request_flush()
+
     def cleanup(self) -> None:
         """Clean up resources and close database connections.
 
@@ -53,6 +53,26 @@ def clean_test_environment(monkeypatch):
         "LOG_LEVEL",
         "MAX_DOWNLOADS",
         "MAX_FILE_SIZE_MB",
+        "DOWNLOAD_WORKERS",
+        "MAX_DOWNLOAD_WORKERS",
+        "MAX_BANDWIDTH_MBPS",
+        "DOWNLOAD_ORDER",
+        "DOWNLOAD_LOOKAHEAD",
+        "BANDWIDTH_SCHEDULE",
+        "HTTP_CONNECT_TIMEOUT_SECONDS",
+        "HTTP_READ_TIMEOUT_SECONDS",
+        "RETRY_MAX_ATTEMPTS",
+        "RETRY_BACKOFF_MINUTES",
+        "RETRY_MAX_BACKOFF_HOURS",
+        "CIRCUIT_BREAKER_FAILURE_RATE",
+        "CIRCUIT_BREAKER_WINDOW",
+        "CIRCUIT_BREAKER_OPEN_SECONDS",
+        "CIRCUIT_BREAKER_MAX_OPEN_MINUTES",
+        "FULL_LISTING_INTERVAL_HOURS",
+        "LISTING_PREFETCH_PAGES",
+        "ALBUM_LISTING_WORKERS",
+        "DEDUP_MEMORY_BUDGET_MB",
+        "LINK_ALBUM_DUPLICATES",
         "INCLUDE_PERSONAL_ALBUMS",
         "INCLUDE_SHARED_ALBUMS",
         "PERSONAL_ALBUM_NAMES_TO_INCLUDE",
@@ -61,6 +81,7 @@ def clean_test_environment(monkeypatch):
         "EXECUTION_MODE",
         "SYNC_INTERVAL_MINUTES",
         "MAINTENANCE_INTERVAL_HOURS",
+        "WATCH_LOCAL_CHANGES",
         "ALLOW_MULTI_INSTANCE",
         "PUSHOVER_DEVICE",
     ]
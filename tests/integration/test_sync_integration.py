@@ -34,6 +34,16 @@ class TestSyncIntegration:
         config.log_level = "INFO"
         config.max_downloads = 0
         config.max_file_size_mb = 0
+        config.download_workers = 2
+        config.max_download_workers = 2
+        config.max_bandwidth_mbps = 0
+        config.download_order = "listing"
+        config.download_lookahead = 500
+        config.retry_max_attempts = 5
+        config.retry_backoff_minutes = 5
+        config.retry_max_backoff_hours = 24
+        config.full_listing_interval_hours = 24
+        config.link_album_duplicates = False
         config.personal_album_names_to_include = []  # Add empty list
         config.shared_album_names_to_include = []  # Add empty list
         config.ensure_sync_directory.return_value = None
@@ -78,10 +88,15 @@ class TestSyncIntegration:
         mock_tracker.mark_photos_as_deleted.return_value = None
         mock_tracker.get_downloaded_photos.return_value = {}
         mock_tracker.remove_deleted_photo.return_value = None
+        mock_tracker.detect_restored_photos.return_value = []
+        mock_tracker.load_local_snapshot.return_value = None
         mock_tracker.track_download.return_value = None
         mock_tracker.get_stats.return_value = {"total_deleted": 0}
         mock_tracker.is_photo_deleted.return_value = False  # Add this
         mock_tracker.is_photo_downloaded.return_value = False  # Add this
+        mock_tracker.get_retry_states.return_value = {}
+        mock_tracker.get_photos_for_retry.return_value = []
+        mock_tracker.record_sync_error.return_value = 1
         mock_tracker.close.return_value = None
         return mock_tracker
 
@@ -47,7 +47,7 @@ def test_pushover_service_creation():
     assert service.config.api_token == "test_token"
 
 
-@patch("requests.post")
+@patch("auth2fa.pushover_service._session.post")
 def test_pushover_service_send_notification(mock_post):
     """Test sending a Pushover notification."""
     mock_post.return_value.status_code = 200
@@ -61,7 +61,7 @@ def test_pushover_service_send_notification(mock_post):
     mock_post.assert_called_once()
 
 
-@patch("requests.post")
+@patch("auth2fa.pushover_service._session.post")
 def test_pushover_service_send_notification_failure(mock_post):
     """Test handling Pushover notification failure."""
     mock_post.return_value.status_code = 400
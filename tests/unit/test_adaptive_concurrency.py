@@ -0,0 +1,147 @@
+"""Unit tests for adaptive concurrency module."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from iphoto_downloader.adaptive_concurrency import AdaptiveConcurrency
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Patch the clock of the adaptive concurrency module."""
+    fake = FakeClock()
+    with patch("iphoto_downloader.adaptive_concurrency.time.monotonic", fake):
+        yield fake
+
+
+def _complete_round(concurrency, clock, bytes_per_second, seconds=2.0):
+    """Finish one round of downloads moving the given throughput."""
+    clock.now += seconds
+    completions = concurrency.limit
+    for _ in range(completions):
+        concurrency.record_success(int(bytes_per_second * seconds / completions))
+
+
+class TestAdaptiveConcurrency:
+    """Test the AdaptiveConcurrency class."""
+
+    def test_limit_grows_while_throughput_grows(self, clock):
+        """Test additive increase while more downloads move more bytes."""
+        concurrency = AdaptiveConcurrency(initial=2, maximum=4)
+
+        _complete_round(concurrency, clock, 1_000_000)
+        assert concurrency.limit == 3
+        _complete_round(concurrency, clock, 2_000_000)
+        assert concurrency.limit == 4
+        _complete_round(concurrency, clock, 3_000_000)
+        assert concurrency.limit == 4
+
+    def test_limit_holds_on_plateau_and_shrinks_on_drop(self, clock):
+        """Test that flat throughput keeps the limit and falling throughput lowers it."""
+        concurrency = AdaptiveConcurrency(initial=4, maximum=8)
+        _complete_round(concurrency, clock, 1_000_000)
+        assert concurrency.limit == 5
+
+        _complete_round(concurrency, clock, 1_010_000)
+        assert concurrency.limit == 5
+        _complete_round(concurrency, clock, 500_000)
+        assert concurrency.limit == 4
+
+    def test_round_waits_for_limit_completions(self, clock):
+        """Test that the limit is only adapted once a full round has finished."""
+        concurrency = AdaptiveConcurrency(initial=3, maximum=8)
+        clock.now += 2
+        concurrency.record_success(1000)
+        concurrency.record_success(1000)
+        assert concurrency.limit == 3
+
+        concurrency.record_success(1000)
+        assert concurrency.limit == 4
+
+    def test_throttling_halves_limit_and_pauses_growth(self, clock):
+        """Test multiplicative decrease on HTTP 429/503 and the growth cooldown."""
+        concurrency = AdaptiveConcurrency(initial=8, maximum=16)
+
+        concurrency.record_throttled()
+        assert concurrency.limit == 4
+
+        _complete_round(concurrency, clock, 5_000_000)
+        assert concurrency.limit == 4
+
+        _complete_round(concurrency, clock, 6_000_000, seconds=30)
+        assert concurrency.limit == 5
+
+    def test_limit_never_below_minimum(self, clock):
+        """Test that repeated throttling stops at the minimum."""
+        concurrency = AdaptiveConcurrency(initial=2, maximum=4)
+        for _ in range(3):
+            concurrency.record_throttled()
+        assert concurrency.limit == 1
+
+    def test_inflated_latency_shrinks_limit(self, clock):
+        """Test that responses slowing down lower the limit despite throughput."""
+        concurrency = AdaptiveConcurrency(initial=4, maximum=8)
+        concurrency.record_latency(0.1)
+        for _ in range(10):
+            concurrency.record_latency(1.0)
+
+        _complete_round(concurrency, clock, 1_000_000)
+
+        assert concurrency.limit == 3
+        assert concurrency.snapshot().latency > 0.5
+
+    def test_snapshot(self, clock):
+        """Test that the snapshot reports limit, slots in use and throughput."""
+        concurrency = AdaptiveConcurrency(initial=1, maximum=4)
+        _complete_round(concurrency, clock, 1_000_000)
+
+        with concurrency.slot():
+            snapshot = concurrency.snapshot()
+
+        assert snapshot.limit == 2
+        assert snapshot.in_flight == 1
+        assert snapshot.throughput == pytest.approx(1_000_000)
+
+    def test_slots_block_beyond_limit(self):
+        """Test that no more than ``limit`` slots are held at once."""
+        concurrency = AdaptiveConcurrency(initial=2, maximum=2)
+        release = threading.Event()
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def download():
+            nonlocal active, peak
+            with concurrency.slot():
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                release.wait(timeout=5)
+                with lock:
+                    active -= 1
+
+        threads = [threading.Thread(target=download) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        with lock:
+            assert active == 2
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert peak <= 2
+        assert concurrency.snapshot().in_flight == 0
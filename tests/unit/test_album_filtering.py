@@ -21,6 +21,13 @@ class TestAlbumFiltering(unittest.TestCase):
 
         # Create mock config
         self.mock_config = Mock(spec=BaseConfig)
+        self.mock_config.download_workers = 4
+        self.mock_config.max_download_workers = 16
+        self.mock_config.max_bandwidth_mbps = 0
+        self.mock_config.circuit_breaker_failure_rate = 0.5
+        self.mock_config.circuit_breaker_window = 20
+        self.mock_config.circuit_breaker_open_seconds = 30
+        self.mock_config.circuit_breaker_max_open_minutes = 30
 
         # Create mock iCloud client with proper patching
         with patch("iphoto_downloader.icloud_client.ICloudClient") as mock_client_class:
@@ -223,6 +230,13 @@ class TestAlbumFiltering(unittest.TestCase):
         """Test that unauthenticated client returns no albums."""
         # Create client without authentication
         mock_config = Mock(spec=BaseConfig)
+        mock_config.download_workers = 4
+        mock_config.max_download_workers = 16
+        mock_config.max_bandwidth_mbps = 0
+        mock_config.circuit_breaker_failure_rate = 0.5
+        mock_config.circuit_breaker_window = 20
+        mock_config.circuit_breaker_open_seconds = 30
+        mock_config.circuit_breaker_max_open_minutes = 30
         client = ICloudClient(mock_config)
         client._api = None
 
@@ -242,6 +256,13 @@ class TestAlbumFiltering(unittest.TestCase):
         """Test that client without photos service returns no albums."""
         # Create client without photos service
         mock_config = Mock(spec=BaseConfig)
+        mock_config.download_workers = 4
+        mock_config.max_download_workers = 16
+        mock_config.max_bandwidth_mbps = 0
+        mock_config.circuit_breaker_failure_rate = 0.5
+        mock_config.circuit_breaker_window = 20
+        mock_config.circuit_breaker_open_seconds = 30
+        mock_config.circuit_breaker_max_open_minutes = 30
         client = ICloudClient(mock_config)
         client._api = Mock()
         client._api.photos = None
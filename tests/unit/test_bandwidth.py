@@ -0,0 +1,121 @@
+"""Unit tests for bandwidth module."""
+
+import datetime as dt
+from unittest.mock import patch
+
+import pytest
+
+from iphoto_downloader.bandwidth import (
+    BandwidthLimiter,
+    BandwidthWindow,
+    parse_bandwidth_schedule,
+    scheduled_limit,
+)
+
+
+class FakeClock:
+    """Monotonic clock advanced by sleeping."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        self.slept += seconds
+
+
+@pytest.fixture
+def clock():
+    """Patch time in the bandwidth module."""
+    fake = FakeClock()
+    with (
+        patch("iphoto_downloader.bandwidth.time.monotonic", fake.monotonic),
+        patch("iphoto_downloader.bandwidth.time.sleep", fake.sleep),
+    ):
+        yield fake
+
+
+class TestBandwidthLimiter:
+    """Test the BandwidthLimiter class."""
+
+    def test_unlimited_never_sleeps(self, clock):
+        """Test that a limit of 0 lets everything through."""
+        limiter = BandwidthLimiter(0)
+        for _ in range(100):
+            limiter.consume(10_000_000)
+        assert clock.slept == 0
+
+    def test_rate_is_enforced(self, clock):
+        """Test that consuming 10 seconds worth of bytes takes about 10 seconds."""
+        limiter = BandwidthLimiter(8)  # 1,000,000 bytes per second
+        for _ in range(100):
+            limiter.consume(100_000)
+        assert clock.slept == pytest.approx(10, abs=0.01)
+
+    def test_idle_time_allows_one_second_burst(self, clock):
+        """Test that tokens saved while idle are capped at one second."""
+        limiter = BandwidthLimiter(8)
+        clock.now += 60
+
+        limiter.consume(1_000_000)
+        assert clock.slept == 0
+        limiter.consume(1_000_000)
+        assert clock.slept == pytest.approx(1)
+
+    def test_lifting_limit_forgives_debt(self, clock):
+        """Test that a lifted limit is not slowed down by debt of the old one."""
+        limiter = BandwidthLimiter(8)
+        limiter.consume(1_000_000)
+        limiter.set_limit(0)
+
+        limiter.consume(50_000_000)
+
+        assert limiter.limit_mbps == 0
+        assert clock.slept == pytest.approx(1)
+
+
+class TestBandwidthSchedule:
+    """Test parsing and evaluating bandwidth schedules."""
+
+    def test_parse(self):
+        """Test parsing windows including one across midnight."""
+        windows = parse_bandwidth_schedule(" 08:00-18:00=20, 22:30-06:00=0 ,")
+
+        assert windows == [
+            BandwidthWindow(dt.time(8), dt.time(18), 20.0),
+            BandwidthWindow(dt.time(22, 30), dt.time(6), 0.0),
+        ]
+        assert parse_bandwidth_schedule("") == []
+
+    @pytest.mark.parametrize("schedule", ["08:00-18:00", "8-18=5", "08:00-18:00=fast", "a=b=c"])
+    def test_parse_rejects_malformed_entries(self, schedule):
+        """Test that malformed windows raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid bandwidth window"):
+            parse_bandwidth_schedule(schedule)
+
+    def test_parse_rejects_negative_limit(self):
+        """Test that negative limits are rejected."""
+        with pytest.raises(ValueError, match="must not be negative"):
+            parse_bandwidth_schedule("08:00-18:00=-1")
+
+    @pytest.mark.parametrize(
+        ("hour", "minute", "expected"),
+        [(9, 0, 20.0), (17, 59, 20.0), (18, 0, 50.0), (23, 0, 0.0), (5, 59, 0.0), (6, 0, 50.0)],
+    )
+    def test_scheduled_limit(self, hour, minute, expected):
+        """Test that the matching window wins and the default applies outside windows."""
+        windows = parse_bandwidth_schedule("08:00-18:00=20,22:00-06:00=0")
+        now = dt.datetime(2024, 5, 1, hour, minute)
+
+        assert scheduled_limit(windows, 50.0, now) == expected
+
+    def test_window_ending_where_it_starts_covers_whole_day(self):
+        """Test that a window like 00:00-00:00 always applies."""
+        windows = parse_bandwidth_schedule("06:00-06:00=5")
+
+        assert scheduled_limit(windows, 0, dt.datetime(2024, 5, 1, 5, 59)) == 5.0
+        assert scheduled_limit(windows, 0, dt.datetime(2024, 5, 1, 6, 0)) == 5.0
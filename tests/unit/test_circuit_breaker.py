@@ -0,0 +1,116 @@
+"""Unit tests for circuit breaker module."""
+
+from unittest.mock import patch
+
+import pytest
+
+from iphoto_downloader.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Patch the clock of the circuit breaker module."""
+    fake = FakeClock()
+    with patch("iphoto_downloader.circuit_breaker.time.monotonic", fake):
+        yield fake
+
+
+def _breaker() -> CircuitBreaker:
+    return CircuitBreaker(failure_rate=0.5, window=10, open_seconds=30, max_open_seconds=100)
+
+
+class TestCircuitBreaker:
+    """Test the CircuitBreaker class."""
+
+    def test_trips_once_failure_rate_reached(self, clock):
+        """Test that the circuit opens after half of the window failed."""
+        breaker = _breaker()
+        for _ in range(4):
+            assert breaker.record_failure() is None
+        assert breaker.state == STATE_CLOSED
+
+        assert breaker.record_failure() == 30
+        assert breaker.state == STATE_OPEN
+        assert not breaker.allow_request()
+        assert breaker.retry_after() == 30
+        assert breaker.trips == 1
+
+    def test_successes_keep_circuit_closed(self, clock):
+        """Test that occasional failures among successes do not trip the circuit."""
+        breaker = _breaker()
+        for _ in range(20):
+            breaker.record_success()
+            breaker.record_success()
+            assert breaker.record_failure() is None
+
+        assert breaker.state == STATE_CLOSED
+
+    def test_single_probe_after_open_period(self, clock):
+        """Test that one probe is let through once the open period ended."""
+        breaker = _breaker()
+        for _ in range(5):
+            breaker.record_failure()
+
+        clock.now += 30
+        assert breaker.state == STATE_HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        assert breaker.record_success() is True
+        assert breaker.state == STATE_CLOSED
+        assert breaker.allow_request()
+
+    def test_failed_probes_double_open_period(self, clock):
+        """Test the backoff of repeated trips and its cap."""
+        breaker = _breaker()
+        for _ in range(5):
+            breaker.record_failure()
+
+        open_periods = []
+        for _ in range(3):
+            clock.now += breaker.retry_after()
+            assert breaker.allow_request()
+            open_periods.append(breaker.record_failure())
+
+        assert open_periods == [60, 100, 100]
+
+    def test_recovery_resets_backoff(self, clock):
+        """Test that a successful probe starts the next trip at the base period."""
+        breaker = _breaker()
+        for _ in range(5):
+            breaker.record_failure()
+        clock.now += 30
+        breaker.allow_request()
+        breaker.record_failure()
+        clock.now += 60
+        breaker.allow_request()
+        breaker.record_success()
+
+        open_periods = [breaker.record_failure() for _ in range(5)]
+
+        assert [period for period in open_periods if period] == [30]
+
+    def test_late_outcomes_while_open_are_ignored(self, clock):
+        """Test that requests sent before the trip do not change an open circuit."""
+        breaker = _breaker()
+        for _ in range(5):
+            breaker.record_failure()
+
+        assert breaker.record_success() is False
+        assert breaker.record_failure() is None
+        assert breaker.retry_after() == 30
@@ -419,3 +419,209 @@ class TestAlbumFilteringConfig:
 
         # Should not raise an exception
         config.validate_albums_exist(mock_client)
+
+
+class TestPerformanceConfig:
+    """Test download performance configuration."""
+
+    def test_default_download_workers(self, temp_dir, clean_env):
+        """Test default download concurrency."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("")
+
+        config = KeyringConfig(env_file)
+
+        assert config.download_workers == 4
+
+    def test_download_workers_from_env(self, temp_dir, clean_env):
+        """Test parsing of DOWNLOAD_WORKERS."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("DOWNLOAD_WORKERS=8\n")
+
+        config = KeyringConfig(env_file)
+
+        assert config.download_workers == 8
+
+    def test_download_workers_validation(self, temp_dir, clean_env):
+        """Test validation error for non-positive DOWNLOAD_WORKERS."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("DOWNLOAD_WORKERS=0\n")
+
+        config = KeyringConfig(env_file)
+
+        with pytest.raises(ValueError, match="DOWNLOAD_WORKERS must be at least 1"):
+            config.validate()
+
+    def test_max_download_workers(self, temp_dir, clean_env):
+        """Test that the adaptive concurrency bound defaults to DOWNLOAD_WORKERS."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("")
+        assert KeyringConfig(env_file).max_download_workers == 4
+
+        env_file.write_text("DOWNLOAD_WORKERS=1\n")
+        assert KeyringConfig(env_file).max_download_workers == 1
+
+        env_file.write_text("DOWNLOAD_WORKERS=2\nMAX_DOWNLOAD_WORKERS=16\n")
+        assert KeyringConfig(env_file).max_download_workers == 16
+
+    def test_max_download_workers_validation(self, temp_dir, clean_env):
+        """Test validation error for MAX_DOWNLOAD_WORKERS below DOWNLOAD_WORKERS."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("DOWNLOAD_WORKERS=8\nMAX_DOWNLOAD_WORKERS=4\n")
+
+        config = KeyringConfig(env_file)
+
+        with pytest.raises(ValueError, match="MAX_DOWNLOAD_WORKERS must not be less than"):
+            config.validate()
+
+    def test_download_order(self, temp_dir, clean_env):
+        """Test parsing of DOWNLOAD_ORDER and DOWNLOAD_LOOKAHEAD."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("")
+        config = KeyringConfig(env_file)
+        assert config.download_order == "listing"
+        assert config.download_lookahead == 500
+
+        env_file.write_text("DOWNLOAD_ORDER=Small-First\nDOWNLOAD_LOOKAHEAD=50\n")
+        config = KeyringConfig(env_file)
+        assert config.download_order == "small-first"
+        assert config.download_lookahead == 50
+
+    def test_download_order_validation(self, temp_dir, clean_env):
+        """Test validation error for an unknown DOWNLOAD_ORDER."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("DOWNLOAD_ORDER=random\n")
+
+        config = KeyringConfig(env_file)
+
+        with pytest.raises(ValueError, match="Invalid DOWNLOAD_ORDER: random"):
+            config.validate()
+
+    def test_bandwidth_settings(self, temp_dir, clean_env):
+        """Test parsing of the bandwidth limit and schedule."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("MAX_BANDWIDTH_MBPS=12.5\nBANDWIDTH_SCHEDULE=08:00-18:00=5\n")
+
+        config = KeyringConfig(env_file)
+
+        assert config.max_bandwidth_mbps == 12.5
+        assert config.bandwidth_schedule == "08:00-18:00=5"
+
+    def test_bandwidth_schedule_validation(self, temp_dir, clean_env):
+        """Test validation error for a malformed BANDWIDTH_SCHEDULE."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("BANDWIDTH_SCHEDULE=business hours=5\n")
+
+        config = KeyringConfig(env_file)
+
+        with pytest.raises(ValueError, match="BANDWIDTH_SCHEDULE: Invalid bandwidth window"):
+            config.validate()
+
+    def test_http_timeouts(self, temp_dir, clean_env):
+        """Test parsing and validation of the HTTP timeouts."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("")
+        config = KeyringConfig(env_file)
+        assert config.http_connect_timeout_seconds == 10
+        assert config.http_read_timeout_seconds == 60
+
+        env_file.write_text("HTTP_CONNECT_TIMEOUT_SECONDS=3.5\nHTTP_READ_TIMEOUT_SECONDS=0\n")
+        config = KeyringConfig(env_file)
+        assert config.http_connect_timeout_seconds == 3.5
+        with pytest.raises(ValueError, match="HTTP_READ_TIMEOUT_SECONDS must be bigger than 0"):
+            config.validate()
+
+    def test_retry_settings(self, temp_dir, clean_env):
+        """Test parsing and validation of the retry backoff settings."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("")
+        config = KeyringConfig(env_file)
+        assert config.retry_max_attempts == 5
+        assert config.retry_backoff_minutes == 5
+        assert config.retry_max_backoff_hours == 24
+
+        env_file.write_text("RETRY_BACKOFF_MINUTES=120\nRETRY_MAX_BACKOFF_HOURS=1\n")
+        config = KeyringConfig(env_file)
+        with pytest.raises(ValueError, match="RETRY_MAX_BACKOFF_HOURS must not be less"):
+            config.validate()
+
+    def test_circuit_breaker_settings(self, temp_dir, clean_env):
+        """Test parsing and validation of the circuit breaker settings."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("")
+        config = KeyringConfig(env_file)
+        assert config.circuit_breaker_failure_rate == 0.5
+        assert config.circuit_breaker_window == 20
+        assert config.circuit_breaker_open_seconds == 30
+        assert config.circuit_breaker_max_open_minutes == 30
+
+        env_file.write_text("CIRCUIT_BREAKER_FAILURE_RATE=1.5\n")
+        config = KeyringConfig(env_file)
+        with pytest.raises(ValueError, match="CIRCUIT_BREAKER_FAILURE_RATE must be between"):
+            config.validate()
+
+    def test_watch_local_changes(self, temp_dir, clean_env):
+        """Test that the local change watcher is opt-in."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("")
+        assert KeyringConfig(env_file).watch_local_changes is False
+
+        env_file.write_text("WATCH_LOCAL_CHANGES=true\n")
+        assert KeyringConfig(env_file).watch_local_changes is True
+
+    def test_full_listing_interval(self, temp_dir, clean_env):
+        """Test parsing and validation of FULL_LISTING_INTERVAL_HOURS."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("")
+        assert KeyringConfig(env_file).full_listing_interval_hours == 24
+
+        env_file.write_text("FULL_LISTING_INTERVAL_HOURS=-1\n")
+        config = KeyringConfig(env_file)
+
+        with pytest.raises(ValueError, match="FULL_LISTING_INTERVAL_HOURS must not be negative"):
+            config.validate()
+
+    def test_listing_prefetch_pages(self, temp_dir, clean_env):
+        """Test parsing and validation of LISTING_PREFETCH_PAGES."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("")
+        assert KeyringConfig(env_file).listing_prefetch_pages == 2
+
+        env_file.write_text("LISTING_PREFETCH_PAGES=-1\n")
+        config = KeyringConfig(env_file)
+
+        with pytest.raises(ValueError, match="LISTING_PREFETCH_PAGES must not be negative"):
+            config.validate()
+
+    def test_album_listing_workers(self, temp_dir, clean_env):
+        """Test parsing and validation of ALBUM_LISTING_WORKERS."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("")
+        assert KeyringConfig(env_file).album_listing_workers == 4
+
+        env_file.write_text("ALBUM_LISTING_WORKERS=0\n")
+        config = KeyringConfig(env_file)
+
+        with pytest.raises(ValueError, match="ALBUM_LISTING_WORKERS must be at least 1"):
+            config.validate()
+
+    def test_dedup_memory_budget(self, temp_dir, clean_env):
+        """Test parsing and validation of DEDUP_MEMORY_BUDGET_MB."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("")
+        assert KeyringConfig(env_file).dedup_memory_budget_mb == 64
+
+        env_file.write_text("DEDUP_MEMORY_BUDGET_MB=0\n")
+        config = KeyringConfig(env_file)
+
+        with pytest.raises(ValueError, match="DEDUP_MEMORY_BUDGET_MB must be at least 1"):
+            config.validate()
+
+    def test_link_album_duplicates(self, temp_dir, clean_env):
+        """Test that linking album duplicates is opt-in."""
+        env_file = temp_dir / ".env"
+        env_file.write_text("")
+        assert KeyringConfig(env_file).link_album_duplicates is False
+
+        env_file.write_text("LINK_ALBUM_DUPLICATES=true\n")
+        assert KeyringConfig(env_file).link_album_duplicates is True
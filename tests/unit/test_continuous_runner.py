@@ -0,0 +1,167 @@
+"""Unit tests for continuous runner module."""
+
+import signal
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from iphoto_downloader.bandwidth import BandwidthLimiter, parse_bandwidth_schedule
+from iphoto_downloader.circuit_breaker import STATE_CLOSED, STATE_OPEN
+from iphoto_downloader.continuous_runner import ContinuousRunner
+
+
+class TestContinuousRunner:
+    """Test the ContinuousRunner class."""
+
+    @pytest.fixture
+    def mock_config(self):
+        """Create a mock config for testing."""
+        config = Mock()
+        config.sync_interval_minutes = 2
+        config.maintenance_interval_hours = 1
+        config.max_bandwidth_mbps = 0
+        config.bandwidth_schedule = ""
+        config.circuit_breaker_open_seconds = 30
+        config.circuit_breaker_max_open_minutes = 30
+        return config
+
+    @pytest.fixture
+    def runner(self, mock_config):
+        """Create a runner without installing real signal handlers."""
+        with patch("iphoto_downloader.continuous_runner.signal.signal"):
+            return ContinuousRunner(mock_config)
+
+    def test_signal_requests_shutdown(self, runner):
+        """Test that a shutdown signal sets the shutdown flag."""
+        runner._signal_handler(signal.SIGTERM, None)
+
+        assert runner.shutdown_requested is True
+
+    def test_signal_flushes_active_syncer(self, runner):
+        """Test that a shutdown signal asks the running sync to commit batched records."""
+        syncer = Mock()
+        runner._active_syncer = syncer
+
+        runner._signal_handler(signal.SIGINT, None)
+
+        syncer.request_pending_writes_flush.assert_called_once()
+
+    def test_signal_flush_failure_is_ignored(self, runner):
+        """Test that a failing flush does not break the signal handler."""
+        syncer = Mock()
+        syncer.request_pending_writes_flush.side_effect = Exception("database is locked")
+        runner._active_syncer = syncer
+
+        runner._signal_handler(signal.SIGTERM, None)
+
+        assert runner.shutdown_requested is True
+
+    def test_single_sync_tracks_active_syncer(self, runner):
+        """Test that the running syncer is registered only while it runs."""
+        seen = []
+
+        with patch("iphoto_downloader.continuous_runner.PhotoSyncer") as mock_syncer_class:
+            syncer = mock_syncer_class.return_value
+            syncer.sync.side_effect = lambda: seen.append(runner._active_syncer) or True
+
+            assert runner.run_single_sync() is True
+
+        assert seen == [syncer]
+        assert runner._active_syncer is None
+        syncer.cleanup.assert_called_once()
+
+    def test_cycle_skips_deletion_scan_while_watched(self, runner):
+        """Test that cycles rely on the watcher only if it missed nothing."""
+        runner._watcher = Mock()
+        flags = []
+
+        with patch("iphoto_downloader.continuous_runner.PhotoSyncer") as mock_syncer_class:
+            syncer = mock_syncer_class.return_value
+            syncer.sync.side_effect = lambda: flags.append(syncer.local_changes_watched) or True
+
+            runner._watcher.consume_resync_needed.return_value = True
+            runner._run_sync_cycle()
+            runner._watcher.consume_resync_needed.return_value = False
+            runner._run_sync_cycle()
+
+        assert flags == [False, True]
+
+    def test_cycle_without_watcher_scans(self, runner):
+        """Test that cycles scan for deletions when no watcher runs."""
+        with patch("iphoto_downloader.continuous_runner.PhotoSyncer") as mock_syncer_class:
+            runner._run_sync_cycle()
+
+        assert mock_syncer_class.return_value.local_changes_watched is False
+
+    def test_watcher_not_kept_when_start_fails(self, runner):
+        """Test that an unavailable watcher falls back to periodic scans."""
+        with patch("iphoto_downloader.continuous_runner.LocalChangeWatcher") as mock_watcher_class:
+            mock_watcher_class.return_value.start.return_value = False
+
+            runner._start_watcher()
+
+        assert runner._watcher is None
+
+    def test_cycle_applies_scheduled_bandwidth(self, mock_config):
+        """Test that each cycle limits downloads to the window active at its start."""
+        mock_config.max_bandwidth_mbps = 50
+        mock_config.bandwidth_schedule = "00:00-23:59=10"
+        with patch("iphoto_downloader.continuous_runner.signal.signal"):
+            runner = ContinuousRunner(mock_config)
+
+        with patch("iphoto_downloader.continuous_runner.PhotoSyncer") as mock_syncer_class:
+            limiter = mock_syncer_class.return_value.icloud_client.bandwidth_limiter
+            limiter.limit_mbps = 50
+            runner._run_sync_cycle()
+
+        limiter.set_limit.assert_called_once_with(10.0)
+
+    def test_bandwidth_scheduler_updates_running_sync(self, runner):
+        """Test that the scheduler thread switches the limit while a sync runs."""
+        runner.bandwidth_windows = parse_bandwidth_schedule("00:00-00:00=5")
+        syncer = Mock()
+        syncer.icloud_client.bandwidth_limiter = BandwidthLimiter(0)
+        runner._active_syncer = syncer
+
+        with patch("iphoto_downloader.continuous_runner.BANDWIDTH_SCHEDULE_CHECK_SECONDS", 0.01):
+            runner._start_bandwidth_scheduler()
+            deadline = time.monotonic() + 5
+            while syncer.icloud_client.bandwidth_limiter.limit_mbps != 5:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            runner._bandwidth_scheduler_stop.set()
+
+    def test_no_scheduler_without_schedule(self, runner):
+        """Test that no scheduler thread is started without bandwidth windows."""
+        with patch("iphoto_downloader.continuous_runner.threading.Thread") as mock_thread:
+            runner._start_bandwidth_scheduler()
+
+        mock_thread.assert_not_called()
+
+    def test_next_sync_follows_circuit_breaker_backoff(self, runner):
+        """Test that cycles ending with iCloud unavailable shorten, then lengthen the wait."""
+        syncer = Mock()
+        syncer.icloud_client.circuit_breaker.state = STATE_OPEN
+        syncer.icloud_client.circuit_breaker.retry_after.return_value = 10.0
+        assert runner._next_sync_wait_seconds() == 120
+
+        waits = []
+        for _ in range(8):
+            runner._update_sync_backoff(syncer)
+            waits.append(runner._next_sync_wait_seconds())
+        assert waits == [30, 60, 120, 240, 480, 960, 1800, 1800]
+
+        syncer.icloud_client.circuit_breaker.state = STATE_CLOSED
+        runner._update_sync_backoff(syncer)
+        assert runner._next_sync_wait_seconds() == 120
+
+    def test_next_sync_waits_for_open_circuit(self, runner):
+        """Test that the next cycle is not started before the circuit lets a probe through."""
+        syncer = Mock()
+        syncer.icloud_client.circuit_breaker.state = STATE_OPEN
+        syncer.icloud_client.circuit_breaker.retry_after.return_value = 400.0
+
+        runner._update_sync_backoff(syncer)
+
+        assert runner._next_sync_wait_seconds() == 400.0
@@ -2,6 +2,7 @@
 
 import sqlite3
 import tempfile
+import time
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -9,6 +10,7 @@ import pytest
 
 from iphoto_downloader.deletion_tracker import DeletionTracker
 from iphoto_downloader.logger import setup_logging
+from iphoto_downloader.retry_policy import RetryState
 
 
 class TestDeletionTracker:
@@ -254,3 +256,495 @@ class TestDeletionTracker:
             assert row[1] == "test.jpg"
             assert row[2] is None  # file_size should be None
             assert row[3] is None  # original_path should be None
+
+    def test_connection_uses_wal_and_is_reused(self, temp_db):
+        """Test that the tracker keeps one tuned connection open."""
+        tracker = DeletionTracker(temp_db)
+
+        tracker.add_downloaded_photo("photo1", "a.jpg", "Album/a.jpg", album_name="Album")
+        conn = tracker._get_connection()
+        assert tracker.is_photo_downloaded("a.jpg", "Album") is True
+        assert tracker._get_connection() is conn
+
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        tracker.close()
+
+    def test_connection_reopens_after_close(self, temp_db):
+        """Test that a closed tracker transparently reconnects."""
+        tracker = DeletionTracker(temp_db)
+        tracker.add_deleted_photo("photo1", "a.jpg", album_name="Album")
+
+        tracker.close()
+
+        assert tracker._conn is None
+        assert tracker.is_photo_deleted("a.jpg", "Album") is True
+        tracker.close()
+
+    def test_lookups_use_composite_index(self, temp_db):
+        """Test that (name, album) lookups are served by the composite indexes."""
+        tracker = DeletionTracker(temp_db)
+
+        with tracker._connect() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT 1 FROM downloaded_photos "
+                "WHERE photo_name = ? AND source_album_name = ?",
+                ("a.jpg", "Album"),
+            ).fetchall()
+
+        assert "idx_downloaded_name_album" in str(plan)
+        tracker.close()
+
+    def test_membership_index_answers_from_memory(self, temp_db):
+        """Test that lookups use the loaded index instead of the database."""
+        tracker = DeletionTracker(temp_db)
+        tracker.add_downloaded_photo("photo1", "a.jpg", "Album/a.jpg", album_name="Album")
+        tracker.add_deleted_photo("photo2", "b.jpg", album_name="Album")
+
+        tracker.load_membership_index()
+
+        # Rows written behind the tracker's back are not visible while the index is loaded
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute(
+                "INSERT INTO downloaded_photos (photo_name, source_album_name, photo_id, local_path)"
+                " VALUES ('c.jpg', 'Album', 'photo3', 'Album/c.jpg')"
+            )
+
+        assert tracker.is_photo_downloaded("a.jpg", "Album") is True
+        assert tracker.is_photo_deleted("b.jpg", "Album") is True
+        assert tracker.is_photo_downloaded("c.jpg", "Album") is False
+
+        tracker.clear_membership_index()
+        assert tracker.is_photo_downloaded("c.jpg", "Album") is True
+        tracker.close()
+
+    def test_membership_index_coherent_on_writes(self, temp_db):
+        """Test that writes through the tracker keep the index up to date."""
+        tracker = DeletionTracker(temp_db)
+        tracker.load_membership_index()
+
+        tracker.add_downloaded_photo("photo1", "a.jpg", "a.jpg")
+        tracker.add_deleted_photo("photo2", "b.jpg", album_name="Album")
+        assert tracker.is_photo_downloaded("a.jpg") is True
+        assert tracker.is_photo_deleted("b.jpg", "Album") is True
+
+        tracker.remove_deleted_photo("photo2")
+        tracker.remove_downloaded_photo("photo1")
+        assert tracker.is_photo_deleted("b.jpg", "Album") is False
+        assert tracker.is_photo_downloaded("a.jpg") is False
+        tracker.close()
+
+    def test_membership_index_keeps_pair_shared_by_other_id(self, temp_db):
+        """Test that removing one photo id keeps a pair still held by another id."""
+        tracker = DeletionTracker(temp_db)
+        tracker.add_downloaded_photo("photo1", "a.jpg", "Album/a.jpg", album_name="Album")
+        tracker.add_downloaded_photo("photo2", "a.jpg", "Album/a.jpg", album_name="Album")
+        tracker.load_membership_index()
+
+        tracker.remove_downloaded_photo("photo1")
+
+        assert tracker.is_photo_downloaded("a.jpg", "Album") is True
+        tracker.close()
+
+    def test_write_batch_defers_commit(self, temp_db):
+        """Test that batched records are committed together."""
+        tracker = DeletionTracker(temp_db)
+        tracker.begin_write_batch(max_writes=3, max_delay_seconds=3600)
+
+        tracker.add_downloaded_photo("photo1", "a.jpg", "a.jpg")
+        tracker.add_deleted_photo("photo2", "b.jpg")
+
+        # Pending records are visible to the tracker itself, not to other connections
+        assert tracker.is_photo_downloaded("a.jpg") is True
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM downloaded_photos").fetchone()[0] == 0
+
+        # Third record fills the batch
+        tracker.add_downloaded_photo("photo3", "c.jpg", "c.jpg")
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM downloaded_photos").fetchone()[0] == 2
+            assert conn.execute("SELECT COUNT(*) FROM deleted_photos").fetchone()[0] == 1
+
+        tracker.end_write_batch()
+        tracker.close()
+
+    @pytest.mark.parametrize("earlier_records", [0, 1])
+    def test_write_batch_rolls_back_failed_block_only(self, temp_db, earlier_records):
+        """Test that a write failing halfway is not committed with the batch."""
+        tracker = DeletionTracker(temp_db)
+        tracker.begin_write_batch(max_writes=1000, max_delay_seconds=3600)
+        if earlier_records:
+            tracker.add_downloaded_photo("photo1", "a.jpg", "a.jpg")
+
+        with pytest.raises(sqlite3.OperationalError), tracker._connect() as conn:
+            conn.execute(
+                "INSERT INTO downloaded_photos (photo_name, source_album_name, photo_id, "
+                "local_path) VALUES ('b.jpg', 'Unknown', 'photo2', 'b.jpg')"
+            )
+            conn.execute("UPDATE missing_table SET x = 1")
+
+        tracker.end_write_batch()
+        with sqlite3.connect(temp_db) as conn:
+            names = [row[0] for row in conn.execute("SELECT photo_name FROM downloaded_photos")]
+        assert names == ["a.jpg"] * earlier_records
+        tracker.close()
+
+    def test_write_batch_commits_on_age(self, temp_db):
+        """Test that an old batch is committed on the next write."""
+        tracker = DeletionTracker(temp_db)
+        tracker.begin_write_batch(max_writes=1000, max_delay_seconds=0)
+
+        tracker.add_downloaded_photo("photo1", "a.jpg", "a.jpg")
+
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM downloaded_photos").fetchone()[0] == 1
+        tracker.close()
+
+    def test_write_batch_commits_without_further_writes(self, temp_db):
+        """Test that an idle batch is committed by its flush thread, releasing the lock."""
+        tracker = DeletionTracker(temp_db)
+        tracker.begin_write_batch(max_writes=1000, max_delay_seconds=0.1)
+        tracker.add_downloaded_photo("photo1", "a.jpg", "a.jpg")
+
+        # Another connection, like the file watcher's, can write once the batch is due
+        with sqlite3.connect(temp_db, timeout=5) as conn:
+            conn.execute(
+                "INSERT INTO deleted_photos (photo_name, source_album_name, photo_id) "
+                "VALUES ('b.jpg', 'Unknown', 'photo2')"
+            )
+            assert conn.execute("SELECT COUNT(*) FROM downloaded_photos").fetchone()[0] == 1
+
+        tracker.close()
+
+    def test_requested_flush_is_committed_by_flush_thread(self, temp_db):
+        """Test that request_flush() commits the batch without waiting for its age."""
+        tracker = DeletionTracker(temp_db)
+        tracker.begin_write_batch(max_writes=1000, max_delay_seconds=3600)
+        tracker.add_downloaded_photo("photo1", "a.jpg", "a.jpg")
+
+        tracker.request_flush()
+
+        deadline = time.monotonic() + 5
+        committed = 0
+        while not committed and time.monotonic() < deadline:
+            with sqlite3.connect(temp_db) as conn:
+                committed = conn.execute("SELECT COUNT(*) FROM downloaded_photos").fetchone()[0]
+            time.sleep(0.05)
+        assert committed == 1
+        tracker.close()
+        assert tracker._flush_thread is None
+
+    def test_close_flushes_write_batch(self, temp_db):
+        """Test that closing the tracker commits pending records."""
+        tracker = DeletionTracker(temp_db)
+        tracker.begin_write_batch(max_writes=1000, max_delay_seconds=3600)
+        tracker.add_downloaded_photo("photo1", "a.jpg", "a.jpg")
+
+        tracker.close()
+
+        with sqlite3.connect(temp_db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM downloaded_photos").fetchone()[0] == 1
+
+    def test_detect_restored_photos(self, temp_db, tmp_path):
+        """Test that only deleted photos present on disk again are reported."""
+        tracker = DeletionTracker(temp_db)
+        tracker.add_downloaded_photo("photo1", "a.jpg", "Album/a.jpg", album_name="Album")
+        tracker.add_downloaded_photo("photo2", "b.jpg", "Album/b.jpg", album_name="Album")
+        tracker.add_downloaded_photo("photo3", "c.jpg", "Album/c.jpg", album_name="Album")
+        tracker.add_deleted_photo("photo1", "a.jpg", album_name="Album")
+        tracker.add_deleted_photo("photo2", "b.jpg", album_name="Album")
+
+        (tmp_path / "Album").mkdir()
+        (tmp_path / "Album" / "a.jpg").write_bytes(b"restored")
+        (tmp_path / "Album" / "c.jpg").write_bytes(b"never deleted")
+
+        restored = tracker.detect_restored_photos(tmp_path)
+
+        assert restored == [
+            {
+                "photo_id": "photo1",
+                "filename": "a.jpg",
+                "album_name": "Album",
+                "local_path": "Album/a.jpg",
+            }
+        ]
+
+        tracker.remove_deleted_copies(
+            [(photo["filename"], photo["album_name"]) for photo in restored]
+        )
+        assert tracker.get_deleted_photos() == {"photo2"}
+        tracker.close()
+
+    def test_deletion_of_one_album_copy(self, temp_db, tmp_path):
+        """Test that copies of a photo in several albums are deleted and restored separately."""
+        tracker = DeletionTracker(temp_db)
+        tracker.add_downloaded_photo("photo1", "x.jpg", "A/x.jpg", album_name="A")
+        tracker.add_downloaded_photo("photo1", "x.jpg", "B/x.jpg", album_name="B")
+        (tmp_path / "B").mkdir()
+        (tmp_path / "B" / "x.jpg").write_bytes(b"kept")
+
+        deleted = tracker.detect_locally_deleted_photos(tmp_path)
+
+        assert [(photo["album_name"], photo["local_path"]) for photo in deleted] == [
+            ("A", "A/x.jpg")
+        ]
+        tracker.mark_photos_as_deleted(deleted)
+        assert tracker.is_photo_deleted("x.jpg", "A") is True
+        assert tracker.is_photo_deleted("x.jpg", "B") is False
+        # The copy kept in B does not count as restoring the one deleted from A
+        assert tracker.detect_restored_photos(tmp_path) == []
+
+        (tmp_path / "A").mkdir()
+        (tmp_path / "A" / "x.jpg").write_bytes(b"back")
+        restored = tracker.detect_restored_photos(tmp_path)
+
+        assert [photo["local_path"] for photo in restored] == ["A/x.jpg"]
+        tracker.close()
+
+    def test_record_local_restore_of_one_album_copy(self, temp_db):
+        """Test that restoring one album copy keeps the other copy deleted."""
+        tracker = DeletionTracker(temp_db)
+        tracker.add_downloaded_photo("photo1", "x.jpg", "A/x.jpg", album_name="A")
+        tracker.add_downloaded_photo("photo1", "x.jpg", "B/x.jpg", album_name="B")
+        tracker.record_local_deletion("A/x.jpg")
+        tracker.record_local_deletion("B/x.jpg")
+
+        assert tracker.record_local_restore("A/x.jpg") == 1
+
+        assert tracker.is_photo_deleted("x.jpg", "A") is False
+        assert tracker.is_photo_deleted("x.jpg", "B") is True
+        tracker.close()
+
+    def test_detect_locally_deleted_skips_deleted_photos(self, temp_db, tmp_path):
+        """Test that photos already marked as deleted are not reported again."""
+        tracker = DeletionTracker(temp_db)
+        tracker.add_downloaded_photo("photo1", "a.jpg", "a.jpg", file_size=10)
+        tracker.add_downloaded_photo("photo2", "b.jpg", "b.jpg", file_size=20)
+        tracker.add_downloaded_photo("photo3", "c.jpg", "c.jpg", file_size=30)
+        tracker.add_deleted_photo("photo2", "b.jpg")
+        (tmp_path / "c.jpg").write_bytes(b"present")
+
+        deleted = tracker.detect_locally_deleted_photos(tmp_path)
+
+        assert [photo["photo_id"] for photo in deleted] == ["photo1"]
+        assert deleted[0]["file_size"] == 10
+        tracker.close()
+
+    @pytest.mark.slow
+    def test_restore_detection_scales_linearly(self, tmp_path):
+        """Benchmark restore detection on growing trackers.
+
+        Scanning deleted x downloaded pairs grows quadratically; quadrupling the
+        tracker should cost roughly four times as much, never sixteen.
+        """
+        import time
+
+        def measure(downloaded_count: int) -> float:
+            sync_dir = tmp_path / f"sync_{downloaded_count}"
+            sync_dir.mkdir()
+            tracker = DeletionTracker(str(tmp_path / f"bench_{downloaded_count}.db"))
+            tracker.begin_write_batch(max_writes=100_000, max_delay_seconds=3600)
+            for i in range(downloaded_count):
+                tracker.add_downloaded_photo(f"id{i}", f"IMG_{i}.jpg", f"IMG_{i}.jpg")
+            # Every fourth photo was deleted, every other deleted one restored
+            for i in range(0, downloaded_count, 4):
+                tracker.add_deleted_photo(f"id{i}", f"IMG_{i}.jpg")
+                if i % 8 == 0:
+                    (sync_dir / f"IMG_{i}.jpg").write_bytes(b"x")
+            tracker.end_write_batch()
+
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                restored = tracker.detect_restored_photos(sync_dir)
+                timings.append(time.perf_counter() - start)
+            tracker.close()
+
+            assert len(restored) == downloaded_count // 8
+            return min(timings)
+
+        small = measure(2_000)
+        large = measure(8_000)
+
+        print(
+            f"\nRestore detection: 2k photos {small * 1000:.1f} ms, 8k photos {large * 1000:.1f} ms"
+        )
+        assert large < small * 8
+
+    def test_detection_uses_existing_paths(self, temp_db, tmp_path):
+        """Test that a directory scan replaces the per-photo disk checks."""
+        tracker = DeletionTracker(temp_db)
+        tracker.add_downloaded_photo("photo1", "a.jpg", "Album/a.jpg", album_name="Album")
+        tracker.add_downloaded_photo("photo2", "b.jpg", "Album/b.jpg", album_name="Album")
+        tracker.add_deleted_photo("photo2", "b.jpg", album_name="Album")
+
+        # Nothing exists on disk, only the scan knows about the files
+        existing_paths = {"Album/a.jpg", "Album/b.jpg"}
+
+        assert tracker.detect_locally_deleted_photos(tmp_path, existing_paths) == []
+        assert tracker.detect_restored_photos(tmp_path, existing_paths) == [
+            {
+                "photo_id": "photo2",
+                "filename": "b.jpg",
+                "album_name": "Album",
+                "local_path": "Album/b.jpg",
+            }
+        ]
+        tracker.close()
+
+    def test_local_snapshot_roundtrip(self, temp_db, tmp_path):
+        """Test that a stored scan is loaded back and updated per directory."""
+        from iphoto_downloader.local_scanner import scan_directory
+
+        (tmp_path / "Album").mkdir()
+        (tmp_path / "Album" / "a.jpg").write_bytes(b"a")
+        (tmp_path / "b.jpg").write_bytes(b"bb")
+        tracker = DeletionTracker(temp_db)
+
+        assert tracker.load_local_snapshot(tmp_path) is None
+
+        first = scan_directory(tmp_path)
+        tracker.save_local_snapshot(first)
+        loaded = tracker.load_local_snapshot(tmp_path)
+
+        assert loaded.files == first.files
+        assert loaded.directories == first.directories
+        assert tracker.load_local_snapshot(tmp_path / "Album") is None
+
+        # Incremental save rewrites only the stale directory
+        (tmp_path / "Album" / "c.jpg").write_bytes(b"c")
+        second = scan_directory(tmp_path, loaded)
+        second.stale_directories = {"Album"}
+        tracker.save_local_snapshot(second)
+
+        assert tracker.load_local_snapshot(tmp_path).files == second.files
+        tracker.close()
+
+    def test_record_local_deletion_and_restore(self, temp_db):
+        """Test recording single file changes reported by the file watcher."""
+        tracker = DeletionTracker(temp_db)
+        tracker.add_downloaded_photo("photo1", "a.jpg", "Album/a.jpg", album_name="Album")
+        tracker.add_downloaded_photo("photo2", "b.jpg", "Album/b.jpg", album_name="Album")
+
+        assert tracker.record_local_deletion("Album/a.jpg") == 1
+        assert tracker.is_photo_deleted("a.jpg", "Album") is True
+        assert tracker.is_photo_deleted("b.jpg", "Album") is False
+        # Already deleted photos are not recorded twice
+        assert tracker.record_local_deletion("Album/a.jpg") == 0
+        # Unknown files are ignored
+        assert tracker.record_local_deletion("Album/other.jpg") == 0
+
+        assert tracker.record_local_restore("Album/a.jpg") == 1
+        assert tracker.is_photo_deleted("a.jpg", "Album") is False
+        tracker.close()
+
+    def test_record_local_deletion_of_directory(self, temp_db):
+        """Test that removing an album folder marks all its photos as deleted."""
+        tracker = DeletionTracker(temp_db)
+        tracker.add_downloaded_photo("photo1", "a.jpg", "Al_%/a.jpg", album_name="Al_%")
+        tracker.add_downloaded_photo("photo2", "b.jpg", "Al_%/b.jpg", album_name="Al_%")
+        tracker.add_downloaded_photo("photo3", "c.jpg", "AlX%2/c.jpg", album_name="AlX%2")
+
+        assert tracker.record_local_deletion("Al_%", is_directory=True) == 2
+        assert tracker.is_photo_deleted("c.jpg", "AlX%2") is False
+        tracker.close()
+
+    def test_album_listing_states_roundtrip(self, temp_db):
+        """Test storing and updating album high-water marks."""
+        tracker = DeletionTracker(temp_db)
+        assert tracker.get_album_listing_states() == {}
+
+        state = {"asset_count": 3, "last_photo_id": "p3", "full_listed_at": 1000.0}
+        tracker.save_album_listing_states({("Trip", False): state, ("Trip", True): state})
+        tracker.save_album_listing_states(
+            {("Trip", False): {**state, "asset_count": 5, "last_photo_id": "p5"}}
+        )
+
+        states = tracker.get_album_listing_states()
+        assert states[("Trip", True)] == state
+        assert states[("Trip", False)]["asset_count"] == 5
+        assert states[("Trip", False)]["last_photo_id"] == "p5"
+        tracker.close()
+
+    def test_get_downloaded_copies(self, temp_db):
+        """Test finding the copies of a photo downloaded for other albums."""
+        tracker = DeletionTracker(temp_db)
+        tracker.add_downloaded_photo("photo1", "a.jpg", "Trip/a.jpg", 10, "Trip", "abc")
+        tracker.add_downloaded_photo("photo1", "a.jpg", "Best Of/a.jpg", 10, "Best Of")
+        tracker.add_downloaded_photo("photo2", "b.jpg", "Trip/b.jpg", 20, "Trip")
+
+        assert sorted(tracker.get_downloaded_copies("photo1")) == [
+            ("Best Of/a.jpg", None),
+            ("Trip/a.jpg", "abc"),
+        ]
+        assert tracker.get_downloaded_copies("unknown") == []
+        tracker.close()
+
+    def test_checksum_column_added_to_old_database(self, temp_db):
+        """Test that databases without the checksum column are migrated."""
+        tracker = DeletionTracker(temp_db)
+        tracker.close()
+        conn = sqlite3.connect(temp_db)
+        conn.execute("ALTER TABLE downloaded_photos DROP COLUMN checksum")
+        conn.commit()
+        conn.close()
+
+        tracker = DeletionTracker(temp_db)
+        tracker.add_downloaded_photo("photo1", "a.jpg", "Trip/a.jpg", 10, "Trip", "abc")
+
+        assert tracker.get_downloaded_photos()["photo1"]["checksum"] == "abc"
+        tracker.close()
+
+    def test_iter_downloaded_files_in_batches(self, temp_db):
+        """Test that all download records are iterated across batch boundaries."""
+        tracker = DeletionTracker(temp_db)
+        for i in range(5):
+            tracker.add_downloaded_photo(f"photo{i}", f"{i}.jpg", f"Trip/{i}.jpg", i, "Trip", "c")
+
+        rows = list(tracker.iter_downloaded_files(batch_size=2))
+
+        assert [row["local_path"] for row in rows] == [f"Trip/{i}.jpg" for i in range(5)]
+        assert rows[3] == {
+            "photo_id": "photo3",
+            "album_name": "Trip",
+            "local_path": "Trip/3.jpg",
+            "file_size": 3,
+            "checksum": "c",
+        }
+        tracker.close()
+
+    def test_forget_downloaded_file(self, temp_db):
+        """Test that a forgotten file is neither downloaded nor deleted."""
+        tracker = DeletionTracker(temp_db)
+        tracker.add_downloaded_photo("photo1", "a.jpg", "Trip/a.jpg", 10, "Trip")
+        tracker.add_downloaded_photo("photo1", "a.jpg", "Best Of/a.jpg", 10, "Best Of")
+        tracker.load_membership_index()
+
+        assert tracker.forget_downloaded_file("Trip/a.jpg") == 1
+
+        assert tracker.get_downloaded_copies("photo1") == [("Best Of/a.jpg", None)]
+        assert not tracker.is_photo_downloaded("a.jpg", "Trip")
+        assert tracker.is_photo_downloaded("a.jpg", "Best Of")
+        assert not tracker.is_photo_deleted("a.jpg", "Trip")
+        assert tracker.forget_downloaded_file("Trip/a.jpg") == 0
+        tracker.close()
+
+    def test_retry_scheduling(self, temp_db):
+        """Test recording failures, scheduling retries and clearing them."""
+        tracker = DeletionTracker(temp_db)
+
+        assert tracker.record_sync_error("photo1", "Trip", "timeout", "a.jpg", "Trip/a.jpg", 3) == 1
+        assert tracker.record_sync_error("photo1", "Trip", "HTTP 503") == 2
+        tracker.schedule_retry("photo1", "Trip", 2000.0)
+
+        assert tracker.get_retry_states() == {("photo1", "Trip"): RetryState(2, 2000.0)}
+        assert tracker.get_photos_for_retry(max_errors=5, due_before=1999.0) == []
+        due = tracker.get_photos_for_retry(max_errors=5, due_before=2000.0)
+        assert len(due) == 1
+        assert due[0]["local_path"] == "Trip/a.jpg"
+        assert due[0]["album_position"] == 3
+        assert tracker.get_photos_for_retry(max_errors=2, due_before=2000.0) == []
+
+        tracker.clear_sync_error("photo1", "Trip")
+        assert tracker.get_retry_states() == {}
+        assert tracker.get_photo_info("photo1", "Trip")["error_count"] == 0
+        tracker.close()
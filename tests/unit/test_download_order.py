@@ -0,0 +1,82 @@
+"""Unit tests for download order module."""
+
+import datetime as dt
+
+import pytest
+
+from iphoto_downloader.download_order import LookaheadWindow
+from iphoto_downloader.photo_record import PhotoRecord
+
+
+def _photos(sizes):
+    return [
+        PhotoRecord(id=f"p{i}", filename=f"p{i}.jpg", size=size) for i, size in enumerate(sizes)
+    ]
+
+
+class TestLookaheadWindow:
+    """Test the LookaheadWindow class."""
+
+    def test_listing_order_passes_photos_through(self):
+        """Test that the listing order neither buffers nor converts photos."""
+        photos = [{"id": "a", "filename": "a.jpg"}, {"id": "b", "filename": "b.jpg"}]
+
+        assert list(LookaheadWindow(iter(photos), "listing", 10)) == photos
+
+    @pytest.mark.parametrize(
+        ("order", "expected"),
+        [
+            ("small-first", [1, 5, 3, 4, 7, 9]),
+            ("large-first", [9, 7, 5, 4, 3, 1]),
+        ],
+    )
+    def test_size_orders_within_window(self, order, expected):
+        """Test that reordering only looks as far ahead as the window."""
+        photos = _photos([5, 9, 1, 7, 3, 4])
+
+        result = [photo.size for photo in LookaheadWindow(iter(photos), order, 3)]
+
+        assert result == expected
+
+    def test_newest_first_puts_undated_photos_last(self):
+        """Test newest-first ordering with photos lacking a creation date."""
+        photos = [
+            PhotoRecord(id="old", filename="o.jpg", created=dt.datetime(2020, 1, 1)),
+            PhotoRecord(id="none", filename="n.jpg"),
+            PhotoRecord(id="new", filename="w.jpg", created=dt.datetime(2024, 1, 1)),
+        ]
+
+        result = [photo.id for photo in LookaheadWindow(iter(photos), "newest-first", 10)]
+
+        assert result == ["new", "old", "none"]
+
+    def test_ties_keep_listing_order(self):
+        """Test that photos of equal size keep their listed order."""
+        photos = _photos([2, 2, 2, 1])
+
+        result = [photo.id for photo in LookaheadWindow(iter(photos), "small-first", 10)]
+
+        assert result == ["p3", "p0", "p1", "p2"]
+
+    def test_dictionaries_are_converted_and_malformed_entries_passed_on(self):
+        """Test that dict photos become records and broken entries are not held back."""
+        photos = [{"id": "a", "filename": "a.jpg", "size": 3}, {"size": 1}]
+
+        result = list(LookaheadWindow(iter(photos), "small-first", 10))
+
+        assert result[0] == {"size": 1}
+        assert isinstance(result[1], PhotoRecord)
+
+    def test_pending_lists_buffered_photos(self):
+        """Test that photos read from the listing but not yielded are reported."""
+        window = LookaheadWindow(iter(_photos([4, 3, 2, 1])), "small-first", 3)
+        iterator = iter(window)
+
+        assert next(iterator).size == 2
+
+        assert sorted(photo.size for photo in window.pending()) == [3, 4]
+
+    def test_unknown_order(self):
+        """Test that unknown orders are rejected."""
+        with pytest.raises(ValueError, match="Unknown download order"):
+            LookaheadWindow([], "random", 10)
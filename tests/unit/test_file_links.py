@@ -0,0 +1,49 @@
+"""Unit tests for file links module."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from iphoto_downloader.file_links import link_or_clone
+
+
+class TestLinkOrClone:
+    """Test the link_or_clone function."""
+
+    def test_hard_link(self, tmp_path):
+        """Test that a hard link is created where possible."""
+        source = tmp_path / "Trip" / "a.jpg"
+        source.parent.mkdir()
+        source.write_bytes(b"photo data")
+        target = tmp_path / "a.jpg"
+
+        assert link_or_clone(source, target) == "hardlink"
+        assert os.path.samefile(source, target)
+        assert source.stat().st_nlink == 2
+
+    def test_existing_target_is_not_replaced(self, tmp_path):
+        """Test that an existing target raises instead of being overwritten."""
+        source = tmp_path / "a.jpg"
+        source.write_bytes(b"photo data")
+        target = tmp_path / "b.jpg"
+        target.write_bytes(b"other")
+
+        with pytest.raises(FileExistsError):
+            link_or_clone(source, target)
+        assert target.read_bytes() == b"other"
+
+    def test_falls_back_to_reflink_or_nothing(self, tmp_path):
+        """Test that without hard links a reflink is tried and failures leave no file."""
+        source = tmp_path / "a.jpg"
+        source.write_bytes(b"photo data")
+        target = tmp_path / "b.jpg"
+
+        with patch("iphoto_downloader.file_links.os.link", side_effect=OSError("EXDEV")):
+            method = link_or_clone(source, target)
+
+        if method == "reflink":
+            assert target.read_bytes() == b"photo data"
+        else:
+            assert method is None
+            assert not target.exists()
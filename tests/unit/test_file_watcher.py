@@ -0,0 +1,164 @@
+"""Unit tests for file watcher module."""
+
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from iphoto_downloader.deletion_tracker import DeletionTracker
+from iphoto_downloader.file_watcher import (
+    IN_MOVED_FROM,
+    IN_Q_OVERFLOW,
+    LocalChangeWatcher,
+    inotify_available,
+)
+
+requires_inotify = pytest.mark.skipif(not inotify_available(), reason="Linux inotify required")
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll a condition until it holds or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+class TestLocalChangeWatcher:
+    """Test the LocalChangeWatcher class."""
+
+    @pytest.fixture
+    def sync_dir(self, tmp_path):
+        """Create a sync directory with one downloaded album photo."""
+        sync_dir = tmp_path / "sync"
+        (sync_dir / "Album").mkdir(parents=True)
+        (sync_dir / "Album" / "a.jpg").write_bytes(b"a")
+        return sync_dir
+
+    @pytest.fixture
+    def tracker(self, tmp_path):
+        """Create a tracker that knows the downloaded photo."""
+        tracker = DeletionTracker(str(tmp_path / "tracker.db"))
+        tracker.add_downloaded_photo("photo1", "a.jpg", "Album/a.jpg", album_name="Album")
+        yield tracker
+        tracker.close()
+
+    @pytest.fixture
+    def watcher(self, sync_dir, tmp_path):
+        """Create a watcher on the sync directory."""
+        watcher = LocalChangeWatcher(sync_dir, tmp_path / "tracker.db")
+        yield watcher
+        watcher.stop()
+
+    def test_start_fails_without_inotify(self, watcher):
+        """Test that the watcher falls back to periodic scans without inotify."""
+        with patch("iphoto_downloader.file_watcher._load_libc", return_value=None):
+            assert watcher.start() is False
+
+        assert watcher.is_running is False
+        assert watcher.consume_resync_needed() is True
+
+    @requires_inotify
+    def test_first_cycle_needs_full_check(self, watcher, tracker):
+        """Test that the first cycle after starting still scans for deletions."""
+        assert watcher.start() is True
+
+        assert watcher.consume_resync_needed() is True
+        assert watcher.consume_resync_needed() is False
+
+    @requires_inotify
+    def test_records_deletion_and_restore(self, watcher, tracker, sync_dir):
+        """Test that deleting and restoring a file is recorded as it happens."""
+        assert watcher.start() is True
+        photo = sync_dir / "Album" / "a.jpg"
+
+        photo.unlink()
+        assert wait_for(lambda: tracker.is_photo_deleted("a.jpg", "Album"))
+
+        photo.write_bytes(b"a")
+        assert wait_for(lambda: not tracker.is_photo_deleted("a.jpg", "Album"))
+
+    @requires_inotify
+    def test_records_album_folder_moved_away(self, watcher, tracker, sync_dir, tmp_path):
+        """Test that moving an album folder out of the tree deletes its photos."""
+        assert watcher.start() is True
+
+        os.rename(sync_dir / "Album", tmp_path / "Trash")
+
+        assert wait_for(lambda: tracker.is_photo_deleted("a.jpg", "Album"))
+        assert "Album" not in watcher._path_wds
+
+    @requires_inotify
+    def test_watches_new_directories(self, watcher, tracker, sync_dir):
+        """Test that restores into a newly created folder are seen."""
+        tracker.add_deleted_photo("photo2", "b.jpg", album_name="New")
+        tracker.add_downloaded_photo("photo2", "b.jpg", "New/b.jpg", album_name="New")
+        assert watcher.start() is True
+
+        (sync_dir / "New").mkdir()
+        (sync_dir / "New" / "b.jpg").write_bytes(b"b")
+
+        assert wait_for(lambda: not tracker.is_photo_deleted("b.jpg", "New"))
+
+    @requires_inotify
+    def test_ignores_partial_downloads(self, watcher, sync_dir):
+        """Test that in-progress downloads never reach the tracker."""
+        assert watcher.start() is True
+
+        with patch.object(watcher, "_get_tracker") as get_tracker:
+            watcher._handle_event(watcher._path_wds["Album"], IN_MOVED_FROM, "a.jpg.part")
+
+        get_tracker.assert_not_called()
+
+    @requires_inotify
+    def test_failed_record_requests_full_check(self, watcher):
+        """Test that a change the tracker could not record makes the next cycle scan."""
+        assert watcher.start() is True
+        watcher.consume_resync_needed()
+
+        with patch.object(watcher, "_get_tracker") as get_tracker:
+            get_tracker.return_value.record_local_deletion.return_value = None
+            watcher._handle_event(watcher._path_wds["Album"], IN_MOVED_FROM, "a.jpg")
+
+        assert watcher.consume_resync_needed() is True
+
+    @requires_inotify
+    def test_overflow_requests_full_check(self, watcher):
+        """Test that lost events make the next cycle scan again."""
+        assert watcher.start() is True
+        watcher.consume_resync_needed()
+
+        watcher._handle_event(-1, IN_Q_OVERFLOW, "")
+
+        assert watcher.consume_resync_needed() is True
+
+    @requires_inotify
+    def test_hold_defers_events(self, sync_dir, tracker, tmp_path):
+        """Test that events are applied only after maintenance finished."""
+        hold = threading.Event()
+        hold.set()
+        watcher = LocalChangeWatcher(sync_dir, tmp_path / "tracker.db", hold=hold)
+        try:
+            assert watcher.start() is True
+            (sync_dir / "Album" / "a.jpg").unlink()
+
+            assert not wait_for(lambda: tracker.is_photo_deleted("a.jpg", "Album"), timeout=0.5)
+
+            hold.clear()
+            assert wait_for(lambda: tracker.is_photo_deleted("a.jpg", "Album"))
+        finally:
+            watcher.stop()
+
+    @requires_inotify
+    def test_stop_ends_thread(self, watcher):
+        """Test that stopping the watcher ends its thread."""
+        assert watcher.start() is True
+
+        watcher.stop()
+
+        assert watcher.is_running is False
+        assert watcher.consume_resync_needed() is True
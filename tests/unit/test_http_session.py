@@ -0,0 +1,87 @@
+"""Unit tests for http_session module."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import requests
+
+from iphoto_downloader.http_session import (
+    POOLED_HOSTS,
+    configure_connection_pool,
+    request_timeout,
+    serialize_session_saving,
+)
+
+
+class TestConnectionPool:
+    """Test configuring the shared connection pool."""
+
+    def test_adapters_are_sized(self):
+        """Test that both schemes get adapters with the requested pool size."""
+        session = requests.Session()
+
+        configure_connection_pool(session, 20)
+
+        for url in ("https://p01-content.icloud.com/", "http://example.com/"):
+            adapter = session.get_adapter(url)
+            assert adapter._pool_maxsize == 20
+            assert adapter._pool_connections == POOLED_HOSTS
+
+    def test_pool_size_at_least_one(self):
+        """Test that a pool is never configured without connections."""
+        session = requests.Session()
+
+        configure_connection_pool(session, 0)
+
+        assert session.get_adapter("https://example.com/")._pool_maxsize == 1
+
+    def test_request_timeout(self):
+        """Test that the timeout tuple is taken from the configuration."""
+        config = Mock(http_connect_timeout_seconds=5.0, http_read_timeout_seconds=30.0)
+
+        assert request_timeout(config) == (5.0, 30.0)
+
+
+class TestSerializeSessionSaving:
+    """Test serializing pyicloud's session file writes."""
+
+    def test_saves_do_not_overlap(self):
+        """Test that concurrent responses save the session one after another."""
+        active = []
+        overlaps = []
+
+        class FakeSession(requests.Session):
+            def _update_session_data(self, response):
+                pass
+
+            def _save_session_data(self):
+                active.append(1)
+                if len(active) > 1:
+                    overlaps.append(len(active))
+                time.sleep(0.01)
+                active.pop()
+
+        session = FakeSession()
+        serialize_session_saving(session)
+
+        threads = [threading.Thread(target=session._save_session_data) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert overlaps == []
+
+    def test_wrapped_methods_keep_arguments_and_results(self):
+        """Test that the original methods are still called with their arguments."""
+        session = requests.Session()
+        session._update_session_data = Mock(return_value="updated")
+        update = session._update_session_data
+
+        serialize_session_saving(session)
+        result = session._update_session_data("response")
+
+        assert result == "updated"
+        update.assert_called_once_with("response")
+        assert not hasattr(session, "_save_session_data")
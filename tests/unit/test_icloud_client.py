@@ -1,12 +1,32 @@
 """Unit tests for iCloud client module."""
 
-from unittest.mock import MagicMock, Mock, mock_open, patch
+import hashlib
+import threading
+import time
+from unittest.mock import MagicMock, Mock, PropertyMock, call, mock_open, patch
 
 import pytest
+import requests
+import urllib3.exceptions
+from pyicloud.exceptions import PyiCloudAPIResponseException
 
+from iphoto_downloader.circuit_breaker import CircuitOpenError
 from iphoto_downloader.config import get_config
-from iphoto_downloader.icloud_client import ICloudClient
+from iphoto_downloader.icloud_client import (
+    DOWNLOAD_CHUNK_SIZE,
+    DownloadSkippedError,
+    ICloudClient,
+)
 from iphoto_downloader.logger import setup_logging
+from iphoto_downloader.photo_record import PhotoRecord
+
+
+def _wrapped_by_pyicloud(error: Exception) -> PyiCloudAPIResponseException:
+    """Wrap a requests error the way pyicloud's session does."""
+    try:
+        raise PyiCloudAPIResponseException("Request failed to iCloud") from error
+    except PyiCloudAPIResponseException as wrapped:
+        return wrapped
 
 
 class TestICloudClient:
@@ -26,6 +46,19 @@ class TestICloudClient:
         config.icloud_password = "testpass123"
         config.max_file_size_mb = 0  # No limit
         config.dry_run = False
+        config.listing_prefetch_pages = 2
+        config.album_listing_workers = 2
+        config.dedup_memory_budget_mb = 1
+        config.link_album_duplicates = False
+        config.download_workers = 2
+        config.max_download_workers = 4
+        config.max_bandwidth_mbps = 0
+        config.http_connect_timeout_seconds = 10
+        config.http_read_timeout_seconds = 60
+        config.circuit_breaker_failure_rate = 0.5
+        config.circuit_breaker_window = 20
+        config.circuit_breaker_open_seconds = 30
+        config.circuit_breaker_max_open_minutes = 30
         config.session_directory = "C:\\Users\\uekoe\\iphoto_downloader\\sessions"
         return config
 
@@ -82,6 +115,19 @@ class TestICloudClient:
 
             assert result is False
 
+    def test_authenticate_sizes_connection_pool(self, mock_config, mock_pyicloud_api):
+        """Test that authentication pools a connection per concurrent request."""
+        mock_pyicloud_api.session = requests.Session()
+
+        with patch("iphoto_downloader.icloud_client.PyiCloudService") as mock_api_class:
+            mock_api_class.return_value = mock_pyicloud_api
+
+            client = ICloudClient(mock_config)
+            client.authenticate()
+
+        adapter = mock_pyicloud_api.session.get_adapter("https://cvws.icloud-content.com/")
+        assert adapter._pool_maxsize == 6
+
     def test_authenticate_exception(self, mock_config):
         """Test authentication with exception."""
         with patch("iphoto_downloader.icloud_client.PyiCloudService") as mock_api_class:
@@ -243,11 +289,11 @@ class TestICloudClient:
         assert photos[0]["id"] == "id0"
         assert photos[0]["filename"] == "photo0.jpg"
 
-    def test_download_photo_success(self, mock_config):
+    def test_download_photo_success(self, mock_config, tmp_path):
         """Test successful photo download."""
         mock_photo = Mock()
         mock_download = Mock()
-        mock_download.raw.read.return_value = b"fake image data"
+        mock_download.raw.read.side_effect = [b"fake image data", b""]
         mock_photo.download.return_value = mock_download
 
         photo_info = {
@@ -256,16 +302,236 @@ class TestICloudClient:
             "size": 1024,
             "photo_obj": mock_photo,
         }
+        target = tmp_path / "test.jpg"
 
         client = ICloudClient(mock_config)
+        result = client.download_photo(photo_info, str(target))
 
-        with patch("builtins.open", mock_open()) as mock_file:
-            result = client.download_photo(photo_info, "/tmp/test.jpg")
+        assert result is True
+        mock_photo.download.assert_called_once_with(timeout=(10, 60))
+        assert target.read_bytes() == b"fake image data"
+        assert not (tmp_path / "test.jpg.part").exists()
+        mock_download.close.assert_called_once()
+
+    def test_download_photo_interrupted_keeps_partial_file(self, mock_config, tmp_path):
+        """Test that an interrupted download never shows up under the final name."""
+        mock_photo = Mock()
+        mock_download = Mock()
+        mock_download.raw.read.side_effect = [b"first chunk", OSError("Connection reset")]
+        mock_photo.download.return_value = mock_download
+
+        photo_info = {"id": "test_id", "filename": "v.mov", "size": 0, "photo_obj": mock_photo}
+        target = tmp_path / "v.mov"
+
+        client = ICloudClient(mock_config)
+        result = client.download_photo(photo_info, str(target))
+
+        assert result is False
+        assert not target.exists()
+        assert (tmp_path / "v.mov.part").read_bytes() == b"first chunk"
+
+    def test_download_photo_resumes_partial_file(self, mock_config, tmp_path):
+        """Test that an existing .part file is resumed with a conditional Range request."""
+        (tmp_path / "v.mov.part").write_bytes(b"first chunk")
+        (tmp_path / ".v.mov.part.validator").write_text('"etag-1"')
+        mock_photo = Mock()
+        mock_download = Mock()
+        mock_download.status_code = 206
+        mock_download.raw.read.side_effect = [b" second chunk", b""]
+        mock_photo.download.return_value = mock_download
+
+        photo_info = {"id": "test_id", "filename": "v.mov", "size": 0, "photo_obj": mock_photo}
+        target = tmp_path / "v.mov"
+
+        client = ICloudClient(mock_config)
+        result = client.download_photo(photo_info, str(target))
+
+        assert result is True
+        mock_photo.download.assert_called_once_with(
+            headers={"Range": "bytes=11-", "If-Range": '"etag-1"'}, timeout=(10, 60)
+        )
+        assert target.read_bytes() == b"first chunk second chunk"
+        assert not (tmp_path / "v.mov.part").exists()
+        assert not (tmp_path / ".v.mov.part.validator").exists()
+
+    def test_download_photo_stores_validator_of_partial_file(self, mock_config, tmp_path):
+        """Test that an interrupted download keeps the ETag it can be resumed with."""
+        mock_photo = Mock()
+        mock_download = Mock()
+        mock_download.headers = {"ETag": '"etag-1"', "Last-Modified": "Mon, 01 Jan 2024"}
+        mock_download.raw.read.side_effect = [b"first chunk", OSError("Connection reset")]
+        mock_photo.download.return_value = mock_download
+        photo_info = {"id": "test_id", "filename": "v.mov", "size": 0, "photo_obj": mock_photo}
+
+        client = ICloudClient(mock_config)
+
+        assert client.download_photo(photo_info, str(tmp_path / "v.mov")) is False
+        assert (tmp_path / ".v.mov.part.validator").read_text() == '"etag-1"'
+
+    @pytest.mark.parametrize(
+        ("part", "validator"),
+        [
+            (b"first chunk", None),  # Started before validators were stored
+            (b"a longer stale part", '"etag-1"'),  # Not smaller than the photo
+        ],
+    )
+    def test_download_photo_restarts_unsafe_partial_file(
+        self, mock_config, tmp_path, part, validator
+    ):
+        """Test that a partial file that cannot be matched to the asset is replaced."""
+        (tmp_path / "v.mov.part").write_bytes(part)
+        if validator:
+            (tmp_path / ".v.mov.part.validator").write_text(validator)
+        mock_photo = Mock()
+        mock_download = Mock()
+        mock_download.raw.read.side_effect = [b"complete file", b""]
+        mock_photo.download.return_value = mock_download
+        photo_info = {"id": "test_id", "filename": "v.mov", "size": 13, "photo_obj": mock_photo}
+        target = tmp_path / "v.mov"
+
+        client = ICloudClient(mock_config)
+
+        assert client.download_photo(photo_info, str(target)) is True
+        mock_photo.download.assert_called_once_with(timeout=(10, 60))
+        assert target.read_bytes() == b"complete file"
+
+    def test_download_photo_discards_spliced_file(self, mock_config, tmp_path):
+        """Test that a resumed file of the wrong size is never stored under the final name."""
+        (tmp_path / "v.mov.part").write_bytes(b"old ")
+        (tmp_path / ".v.mov.part.validator").write_text('"etag-1"')
+        mock_photo = Mock()
+        mock_download = Mock()
+        mock_download.status_code = 206
+        mock_download.raw.read.side_effect = [b"new version tail", b""]
+        mock_photo.download.return_value = mock_download
+        photo_info = {"id": "test_id", "filename": "v.mov", "size": 13, "photo_obj": mock_photo}
+        target = tmp_path / "v.mov"
+
+        client = ICloudClient(mock_config)
+
+        assert client.download_photo(photo_info, str(target)) is False
+        assert not target.exists()
+        assert not (tmp_path / "v.mov.part").exists()
+        assert not (tmp_path / ".v.mov.part.validator").exists()
+
+    def test_download_photo_records_checksum(self, mock_config, tmp_path):
+        """Test that the checksum is computed over the streamed chunks."""
+        mock_photo = Mock()
+        mock_download = Mock()
+        mock_download.raw.read.side_effect = [b"fake ", b"image data", b""]
+        mock_photo.download.return_value = mock_download
+        photo = PhotoRecord("test_id", "test.jpg", photo_obj=mock_photo)
+
+        client = ICloudClient(mock_config)
+        with patch.object(client, "_hash_file") as hash_file:
+            assert client.download_photo(photo, str(tmp_path / "test.jpg")) is True
+
+        assert photo.checksum == hashlib.sha256(b"fake image data").hexdigest()
+        hash_file.assert_not_called()
+
+    def test_download_photo_resumed_checksum_covers_whole_file(self, mock_config, tmp_path):
+        """Test that a resumed download's checksum includes the partial file."""
+        (tmp_path / "v.mov.part").write_bytes(b"first chunk")
+        (tmp_path / ".v.mov.part.validator").write_text('"etag-1"')
+        mock_photo = Mock()
+        mock_download = Mock()
+        mock_download.status_code = 206
+        mock_download.raw.read.side_effect = [b" second chunk", b""]
+        mock_photo.download.return_value = mock_download
+        photo = PhotoRecord("test_id", "v.mov", photo_obj=mock_photo)
+
+        client = ICloudClient(mock_config)
+        assert client.download_photo(photo, str(tmp_path / "v.mov")) is True
 
-            assert result is True
-            mock_photo.download.assert_called_once()
-            mock_file.assert_called_once_with("/tmp/test.jpg", "wb")
-            mock_file().write.assert_called_once_with(b"fake image data")
+        assert photo.checksum == hashlib.sha256(b"first chunk second chunk").hexdigest()
+
+    def test_download_photo_range_ignored_restarts(self, mock_config, tmp_path):
+        """Test that a full response to a Range request replaces the partial file."""
+        (tmp_path / "v.mov.part").write_bytes(b"stale")
+        (tmp_path / ".v.mov.part.validator").write_text('"etag-1"')
+        mock_photo = Mock()
+        mock_download = Mock()
+        mock_download.status_code = 200
+        mock_download.raw.read.side_effect = [b"complete file", b""]
+        mock_photo.download.return_value = mock_download
+
+        photo_info = {"id": "test_id", "filename": "v.mov", "size": 0, "photo_obj": mock_photo}
+        target = tmp_path / "v.mov"
+
+        client = ICloudClient(mock_config)
+
+        assert client.download_photo(photo_info, str(target)) is True
+        assert target.read_bytes() == b"complete file"
+
+    def test_download_photo_range_not_satisfiable_restarts(self, mock_config, tmp_path):
+        """Test that a rejected Range request falls back to a full download."""
+        (tmp_path / "v.mov.part").write_bytes(b"too long")
+        (tmp_path / ".v.mov.part.validator").write_text('"etag-1"')
+        mock_photo = Mock()
+        mock_download = Mock()
+        mock_download.raw.read.side_effect = [b"complete file", b""]
+        mock_photo.download.side_effect = [
+            PyiCloudAPIResponseException("Range Not Satisfiable", 416),
+            mock_download,
+        ]
+
+        photo_info = {"id": "test_id", "filename": "v.mov", "size": 0, "photo_obj": mock_photo}
+        target = tmp_path / "v.mov"
+
+        client = ICloudClient(mock_config)
+
+        assert client.download_photo(photo_info, str(target)) is True
+        assert target.read_bytes() == b"complete file"
+
+    def test_download_photo_streams_in_chunks(self, mock_config, tmp_path):
+        """Test that the response is written chunk by chunk with progress reports."""
+        chunks = [b"a" * DOWNLOAD_CHUNK_SIZE, b"b" * DOWNLOAD_CHUNK_SIZE, b"c" * 10, b""]
+        mock_photo = Mock()
+        mock_download = Mock()
+        mock_download.raw.read.side_effect = chunks
+        mock_photo.download.return_value = mock_download
+
+        photo_info = {"id": "test_id", "filename": "big.mov", "size": 0, "photo_obj": mock_photo}
+        progress = []
+        target = tmp_path / "big.mov"
+
+        client = ICloudClient(mock_config)
+        result = client.download_photo(photo_info, str(target), progress_callback=progress.append)
+
+        assert result is True
+        assert progress == [DOWNLOAD_CHUNK_SIZE, DOWNLOAD_CHUNK_SIZE, 10]
+        assert target.read_bytes() == b"".join(chunks)
+        mock_download.raw.read.assert_called_with(DOWNLOAD_CHUNK_SIZE)
+
+    def test_download_photo_counts_against_bandwidth_limit(self, mock_config, tmp_path):
+        """Test that every chunk read is charged to the shared bandwidth limiter."""
+        mock_photo = Mock()
+        mock_download = Mock()
+        mock_download.raw.read.side_effect = [b"a" * 10, b"b" * 5, b""]
+        mock_photo.download.return_value = mock_download
+        photo_info = {"id": "test_id", "filename": "a.jpg", "size": 15, "photo_obj": mock_photo}
+
+        client = ICloudClient(mock_config)
+        client.bandwidth_limiter = Mock()
+        assert client.download_photo(photo_info, str(tmp_path / "a.jpg")) is True
+
+        assert client.bandwidth_limiter.consume.call_args_list == [call(10), call(5)]
+
+    def test_download_photo_no_version(self, mock_config):
+        """Test photo download when no downloadable version exists."""
+        mock_photo = Mock()
+        mock_photo.download.return_value = None
+
+        photo_info = {
+            "id": "test_id",
+            "filename": "test.jpg",
+            "size": 1024,
+            "photo_obj": mock_photo,
+        }
+
+        client = ICloudClient(mock_config)
+
+        assert client.download_photo(photo_info, "/tmp/test.jpg") is False
 
     def test_download_photo_size_limit(self, mock_config):
         """Test photo download with size limit."""
@@ -280,9 +546,10 @@ class TestICloudClient:
 
         client = ICloudClient(mock_config)
 
-        result = client.download_photo(photo_info, "/tmp/large.jpg")
+        with pytest.raises(DownloadSkippedError):
+            client.download_photo(photo_info, "/tmp/large.jpg")
 
-        assert result is False
+        photo_info["photo_obj"].download.assert_not_called()
 
     def test_download_photo_dry_run(self, mock_config):
         """Test photo download in dry run mode."""
@@ -315,6 +582,103 @@ class TestICloudClient:
 
         assert result is False
 
+    @pytest.mark.parametrize(("code", "expected_limit"), [(429, 1), (503, 1), (500, 2)])
+    def test_download_photo_throttling_lowers_concurrency(
+        self, mock_config, tmp_path, code, expected_limit
+    ):
+        """Test that only throttling responses lower the download concurrency."""
+        mock_photo = Mock()
+        mock_photo.download.side_effect = PyiCloudAPIResponseException("Busy", code)
+        photo_info = {"id": "test_id", "filename": "a.jpg", "size": 0, "photo_obj": mock_photo}
+
+        client = ICloudClient(mock_config)
+        result = client.download_photo(photo_info, str(tmp_path / "a.jpg"))
+
+        assert result is False
+        assert client.download_concurrency.limit == expected_limit
+        assert client.download_concurrency.snapshot().in_flight == 0
+
+    @pytest.mark.parametrize(
+        ("error", "service_failure"),
+        [
+            (PyiCloudAPIResponseException("Server error", 502), True),
+            (PyiCloudAPIResponseException("Unauthorized", 401), True),
+            (PyiCloudAPIResponseException("Not found", 404), False),
+            (_wrapped_by_pyicloud(requests.exceptions.ConnectionError("reset")), True),
+            (_wrapped_by_pyicloud(requests.exceptions.ReadTimeout("timed out")), True),
+            (ValueError("bad metadata"), False),
+        ],
+    )
+    def test_download_errors_feed_circuit_breaker(
+        self, mock_config, tmp_path, error, service_failure
+    ):
+        """Test that only failures on iCloud's side count against the circuit breaker."""
+        mock_config.circuit_breaker_window = 1
+        mock_photo = Mock()
+        mock_photo.download.side_effect = error
+        photo_info = {"id": "test_id", "filename": "a.jpg", "size": 0, "photo_obj": mock_photo}
+
+        client = ICloudClient(mock_config)
+        result = client.download_photo(photo_info, str(tmp_path / "a.jpg"))
+
+        assert result is False
+        assert (client.circuit_breaker.trips == 1) is service_failure
+
+    def test_interrupted_stream_feeds_circuit_breaker(self, mock_config, tmp_path):
+        """Test that a connection lost while streaming counts against the circuit breaker."""
+        mock_config.circuit_breaker_window = 1
+        mock_photo = Mock()
+        mock_photo.download.return_value.raw.read.side_effect = urllib3.exceptions.ProtocolError(
+            "Connection broken"
+        )
+        photo_info = {"id": "test_id", "filename": "a.jpg", "size": 0, "photo_obj": mock_photo}
+
+        client = ICloudClient(mock_config)
+        result = client.download_photo(photo_info, str(tmp_path / "a.jpg"))
+
+        assert result is False
+        assert client.circuit_breaker.trips == 1
+
+    def test_download_photo_refused_during_long_outage(self, mock_config, tmp_path):
+        """Test that downloads fail fast with CircuitOpenError instead of requesting."""
+        mock_config.circuit_breaker_window = 1
+        mock_config.circuit_breaker_open_seconds = 600
+        mock_photo = Mock()
+        mock_photo.download.side_effect = PyiCloudAPIResponseException("Unavailable", 503)
+        photo_info = {"id": "test_id", "filename": "a.jpg", "size": 0, "photo_obj": mock_photo}
+        client = ICloudClient(mock_config)
+        client.download_photo(photo_info, str(tmp_path / "a.jpg"))
+
+        with pytest.raises(CircuitOpenError):
+            client.download_photo(photo_info, str(tmp_path / "a.jpg"))
+
+        mock_photo.download.assert_called_once()
+
+    def test_download_photo_waits_out_short_outage(self, mock_config, tmp_path):
+        """Test that a download pauses for a short open period and probes afterwards."""
+        mock_config.circuit_breaker_window = 1
+        mock_photo = Mock()
+        mock_photo.download.side_effect = PyiCloudAPIResponseException("Unavailable", 503)
+        photo_info = {"id": "test_id", "filename": "a.jpg", "size": 0, "photo_obj": mock_photo}
+        client = ICloudClient(mock_config)
+        client.download_photo(photo_info, str(tmp_path / "a.jpg"))
+
+        mock_photo.download.side_effect = None
+        mock_photo.download.return_value.raw.read.side_effect = [b"data", b""]
+        slept = []
+
+        def sleep(seconds):
+            # Let the open period pass
+            slept.append(seconds)
+            client.circuit_breaker._opened_until -= seconds
+
+        with patch("iphoto_downloader.icloud_client.time.sleep", side_effect=sleep):
+            result = client.download_photo(photo_info, str(tmp_path / "a.jpg"))
+
+        assert result is True
+        assert slept == [pytest.approx(30, abs=1)]
+        assert client.circuit_breaker.state == "closed"
+
     def test_download_photo_write_error(self, mock_config):
         """Test photo download with file write error."""
         mock_photo = Mock()
@@ -516,6 +880,35 @@ class TestICloudClient:
         assert photos[0]["filename"] == "test.jpg"
         assert photos[0]["album_name"] == "Test Album"
 
+    @pytest.mark.parametrize(("prefetch_pages", "background"), [(2, True), (0, False)])
+    def test_list_photos_from_album_prefetch(self, mock_config, prefetch_pages, background):
+        """Test that album pages are fetched on a producer thread unless disabled."""
+        mock_config.listing_prefetch_pages = prefetch_pages
+        client = ICloudClient(mock_config)
+        fetch_threads = []
+
+        def fetch_assets():
+            for i in range(3):
+                fetch_threads.append(threading.current_thread())
+                photo = MagicMock()
+                photo.id = f"photo{i}"
+                photo.filename = f"IMG_{i}.jpg"
+                yield photo
+
+        mock_album = MagicMock()
+        mock_album.name = "Test Album"
+        mock_album.__iter__ = MagicMock(return_value=fetch_assets())
+        mock_album.__len__ = MagicMock(return_value=3)
+        client._api = MagicMock()
+        client._api.photos.albums = {"Test Album": mock_album}
+
+        photos = list(client.list_photos_from_album("Test Album", is_shared=False))
+
+        assert [photo["id"] for photo in photos] == ["photo0", "photo1", "photo2"]
+        assert all(
+            (thread is not threading.current_thread()) == background for thread in fetch_threads
+        )
+
     def test_list_photos_from_albums_success(self, mock_config):
         """Test listing photos from multiple albums."""
         client = ICloudClient(mock_config)
@@ -751,3 +1144,401 @@ class TestICloudClient:
         # Check that photos have album_name set (since they come from albums)
         album_photos = [p for p in photos if p.get("album_name") is not None]
         assert len(album_photos) >= 1
+
+
+class FakeAlbum:
+    """Ascending album paging like pyicloud's BasePhotoAlbum."""
+
+    def __init__(self, name, photo_ids, direction="ASCENDING"):
+        self.name = name
+        self.direction = direction
+        self.page_size = 2
+        self.photos = [self._asset(photo_id) for photo_id in photo_ids]
+        self.requested_offsets = []
+        self.full_iterations = 0
+
+    @staticmethod
+    def _asset(photo_id):
+        asset = MagicMock()
+        asset.id = photo_id
+        asset.filename = f"{photo_id}.jpg"
+        return asset
+
+    def __len__(self):
+        return len(self.photos)
+
+    def __iter__(self):
+        self.full_iterations += 1
+        return iter(self.photos)
+
+    def photo(self, index):
+        return iter(self.photos[index : index + 1])
+
+    def _get_photos_at(self, index, direction, page_size):
+        self.requested_offsets.append(index)
+        return iter(self.photos[index : index + page_size])
+
+
+class TestIncrementalListing:
+    """Test incremental album listing with per-album high-water marks."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a client with a mocked API."""
+        config = Mock()
+        config.listing_prefetch_pages = 2
+        config.album_listing_workers = 2
+        config.dedup_memory_budget_mb = 1
+        config.link_album_duplicates = False
+        config.download_workers = 2
+        config.max_download_workers = 4
+        config.max_bandwidth_mbps = 0
+        config.http_connect_timeout_seconds = 10
+        config.http_read_timeout_seconds = 60
+        config.circuit_breaker_failure_rate = 0.5
+        config.circuit_breaker_window = 20
+        config.circuit_breaker_open_seconds = 30
+        config.circuit_breaker_max_open_minutes = 30
+        client = ICloudClient(config)
+        client._api = MagicMock()
+        return client
+
+    @pytest.fixture
+    def filter_config(self):
+        """Create a config including all personal albums."""
+        config = Mock()
+        config.include_personal_albums = True
+        config.include_shared_albums = False
+        config.personal_album_names_to_include = []
+        config.full_listing_interval_hours = 24
+        return config
+
+    def _list(self, client, filter_config, album, states):
+        album_info = {"name": album.name, "is_shared": False, "album_obj": album}
+        with patch.object(client, "list_albums", return_value=iter([album_info])):
+            return [
+                photo["id"]
+                for photo in client.list_photos_from_filtered_albums(filter_config, states)
+            ]
+
+    def _state(self, count, last_id, age_hours=1):
+        return {
+            ("Trip", False): {
+                "asset_count": count,
+                "last_photo_id": last_id,
+                "full_listed_at": time.time() - age_hours * 3600,
+            }
+        }
+
+    def test_first_listing_is_full(self, client, filter_config):
+        """Test that an album without state is listed completely."""
+        album = FakeAlbum("Trip", ["p1", "p2", "p3"])
+
+        assert self._list(client, filter_config, album, {}) == ["p1", "p2", "p3"]
+
+        state = client.completed_listings[("Trip", False)]
+        assert state["asset_count"] == 3
+        assert state["last_photo_id"] == "p3"
+
+    def test_unchanged_album_is_skipped(self, client, filter_config):
+        """Test that an album with the same size and last photo is not paged."""
+        album = FakeAlbum("Trip", ["p1", "p2", "p3"])
+        states = self._state(3, "p3")
+
+        assert self._list(client, filter_config, album, states) == []
+        assert album.full_iterations == 0
+        assert album.requested_offsets == []
+        assert client.completed_listings[("Trip", False)] == states[("Trip", False)]
+
+    def test_grown_album_pages_new_photos_only(self, client, filter_config):
+        """Test that only photos after the previous end are fetched."""
+        album = FakeAlbum("Trip", ["p1", "p2", "p3", "p4", "p5", "p6", "p7"])
+        states = self._state(3, "p3")
+
+        assert self._list(client, filter_config, album, states) == ["p4", "p5", "p6", "p7"]
+        assert album.full_iterations == 0
+        assert album.requested_offsets[0] == 3
+
+        state = client.completed_listings[("Trip", False)]
+        assert state["asset_count"] == 7
+        assert state["last_photo_id"] == "p7"
+        assert state["full_listed_at"] == states[("Trip", False)]["full_listed_at"]
+
+    def test_shifted_album_is_listed_fully(self, client, filter_config):
+        """Test that a photo inserted before the previous end forces a full listing."""
+        album = FakeAlbum("Trip", ["p1", "new", "p2", "p3"])
+
+        assert self._list(client, filter_config, album, self._state(3, "p3")) == [
+            "p1",
+            "new",
+            "p2",
+            "p3",
+        ]
+        assert album.full_iterations == 1
+
+    def test_due_full_listing(self, client, filter_config):
+        """Test that the full listing schedule overrides the high-water mark."""
+        album = FakeAlbum("Trip", ["p1", "p2", "p3"])
+        states = self._state(3, "p3", age_hours=25)
+
+        assert self._list(client, filter_config, album, states) == ["p1", "p2", "p3"]
+        assert client.completed_listings[("Trip", False)]["full_listed_at"] > time.time() - 60
+
+    def test_descending_album_is_listed_fully(self, client, filter_config):
+        """Test that albums not ordered ascending are never listed incrementally."""
+        album = FakeAlbum("Trip", ["p1", "p2", "p3"], direction="DESCENDING")
+
+        assert self._list(client, filter_config, album, self._state(3, "p3")) == [
+            "p1",
+            "p2",
+            "p3",
+        ]
+
+    def test_interrupted_listing_is_not_completed(self, client, filter_config):
+        """Test that a listing stopped early records no state."""
+        album = FakeAlbum("Trip", ["p1", "p2", "p3"])
+        album_info = {"name": "Trip", "is_shared": False, "album_obj": album}
+
+        with patch.object(client, "list_albums", return_value=iter([album_info])):
+            photos = client.list_photos_from_filtered_albums(filter_config, {})
+            next(photos)
+
+        assert client.completed_listings == {}
+
+
+class TestParallelAlbumListing:
+    """Test concurrent enumeration of filtered albums."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a client listing two albums at a time."""
+        config = Mock()
+        config.listing_prefetch_pages = 2
+        config.album_listing_workers = 2
+        config.dedup_memory_budget_mb = 1
+        config.link_album_duplicates = False
+        config.download_workers = 2
+        config.max_download_workers = 4
+        config.max_bandwidth_mbps = 0
+        config.http_connect_timeout_seconds = 10
+        config.http_read_timeout_seconds = 60
+        config.circuit_breaker_failure_rate = 0.5
+        config.circuit_breaker_window = 20
+        config.circuit_breaker_open_seconds = 30
+        config.circuit_breaker_max_open_minutes = 30
+        client = ICloudClient(config)
+        client._api = MagicMock()
+        return client
+
+    @pytest.fixture
+    def filter_config(self):
+        """Create a config including all personal albums."""
+        config = Mock()
+        config.include_personal_albums = True
+        config.include_shared_albums = False
+        config.personal_album_names_to_include = []
+        return config
+
+    def _listing(self, client, filter_config, albums, states=None):
+        album_infos = [
+            {"name": album.name, "is_shared": False, "album_obj": album} for album in albums
+        ]
+        with patch.object(client, "list_albums", return_value=iter(album_infos)):
+            yield from client.list_photos_from_filtered_albums(filter_config, states)
+
+    def test_albums_are_opened_concurrently(self, client, filter_config):
+        """Test that album round-trips overlap instead of running one after another."""
+        both_counting = threading.Barrier(2, timeout=5)
+
+        class SlowAlbum(FakeAlbum):
+            def __len__(self):
+                both_counting.wait()
+                return super().__len__()
+
+        albums = [SlowAlbum("Trip", ["p1"]), SlowAlbum("Party", ["p2"])]
+
+        photos = list(self._listing(client, filter_config, albums))
+
+        assert [photo["id"] for photo in photos] == ["p1", "p2"]
+
+    def test_duplicates_keep_first_album_in_catalogue_order(self, client, filter_config):
+        """Test that a photo in several albums is yielded once, from the first album."""
+        first_counted = threading.Event()
+
+        class SlowAlbum(FakeAlbum):
+            def __len__(self):
+                # The later album is ready first, yet must not be listed first
+                assert first_counted.wait(timeout=5)
+                return super().__len__()
+
+        class FastAlbum(FakeAlbum):
+            def __len__(self):
+                first_counted.set()
+                return super().__len__()
+
+        albums = [
+            SlowAlbum("Trip", ["p1", "shared"]),
+            FastAlbum("Party", ["shared", "p2"]),
+            FakeAlbum("Beach", ["p3", "p1"]),
+        ]
+
+        photos = list(self._listing(client, filter_config, albums))
+
+        assert [(photo["id"], photo["album_name"]) for photo in photos] == [
+            ("p1", "Trip"),
+            ("shared", "Trip"),
+            ("p2", "Party"),
+            ("p3", "Beach"),
+        ]
+
+    def test_early_stop_records_only_finished_albums(self, client, filter_config):
+        """Test that albums opened ahead of an early stop are not marked as listed."""
+        albums = [
+            FakeAlbum("Trip", ["p1"]),
+            FakeAlbum("Party", ["p2", "p3"]),
+            FakeAlbum("Beach", ["p4"]),
+        ]
+
+        photos = self._listing(client, filter_config, albums, states={})
+        assert [next(photos)["id"], next(photos)["id"]] == ["p1", "p2"]
+        photos.close()
+
+        assert list(client.completed_listings) == [("Trip", False)]
+
+    def test_duplicates_detected_after_spilling(self, client, filter_config):
+        """Test that duplicates are still found once the seen ids exceed the budget."""
+        client.config.dedup_memory_budget_mb = 0
+        albums = [
+            FakeAlbum("Trip", [f"p{i}" for i in range(50)]),
+            FakeAlbum("Party", ["p3", "new", "p42"]),
+        ]
+
+        photos = list(self._listing(client, filter_config, albums))
+
+        assert [photo.id for photo in photos[-1:]] == ["new"]
+        assert len(photos) == 51
+
+    def test_duplicates_yielded_when_linking(self, client, filter_config):
+        """Test that every album placement is listed when duplicates are linked."""
+        client.config.link_album_duplicates = True
+        albums = [FakeAlbum("Trip", ["p1", "p2"]), FakeAlbum("Party", ["p2", "p3"])]
+
+        photos = list(self._listing(client, filter_config, albums))
+
+        assert [(photo.id, photo.album_name) for photo in photos] == [
+            ("p1", "Trip"),
+            ("p2", "Trip"),
+            ("p2", "Party"),
+            ("p3", "Party"),
+        ]
+
+    def test_per_album_timing_is_logged(self, client, filter_config):
+        """Test that every album reports its listing breakdown."""
+        albums = [FakeAlbum("Trip", ["p1", "p2"]), FakeAlbum("Party", ["p2"])]
+        logger = Mock()
+
+        with patch.object(ICloudClient, "logger", new_callable=PropertyMock, return_value=logger):
+            list(self._listing(client, filter_config, albums))
+
+        messages = [call.args[0] for call in logger.info.call_args_list]
+        assert any(m.startswith("⏱️ Album 'Trip': 2 photos, 0 duplicates") for m in messages)
+        assert any(m.startswith("⏱️ Album 'Party': 1 photos, 1 duplicates") for m in messages)
+        assert any(m.startswith("⏱️ Enumerated 2 albums") for m in messages)
+
+
+class TestAlbumCatalog:
+    """Test the album catalogue cache of ICloudClient."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a client whose API counts album container fetches."""
+        client = ICloudClient(
+            Mock(
+                listing_prefetch_pages=2,
+                album_listing_workers=2,
+                dedup_memory_budget_mb=1,
+                link_album_duplicates=False,
+                download_workers=2,
+                max_download_workers=4,
+                max_bandwidth_mbps=0,
+                http_connect_timeout_seconds=10,
+                http_read_timeout_seconds=60,
+                circuit_breaker_failure_rate=0.5,
+                circuit_breaker_window=20,
+                circuit_breaker_open_seconds=30,
+                circuit_breaker_max_open_minutes=30,
+            )
+        )
+
+        personal = MagicMock()
+        personal.name = "Trip"
+        personal.__len__ = MagicMock(return_value=0)
+        shared = MagicMock()
+        shared.name = "Family"
+        library = MagicMock()
+        library.name = "Library"
+        library.service.shared_streams = {"family": shared}
+
+        photos = Mock()
+        albums = PropertyMock(return_value={"trip": personal, "Library": library})
+        type(photos).albums = albums
+        client._api = Mock()
+        client._api.photos = photos
+        client.albums_property = albums
+        return client
+
+    def test_catalog_fetched_once(self, client):
+        """Test that album lookups of one cycle share one catalogue fetch."""
+        list(client.list_albums())
+        client.verify_albums_exist(["Trip"])
+        client.verify_albums_exist(["Family"])
+        list(client.list_photos_from_album("Trip", is_shared=False))
+        list(client.list_photos_from_album("Family"))
+
+        # One fetch for personal albums, one to reach the shared streams
+        assert client.albums_property.call_count == 2
+
+    def test_lookup_by_name(self, client):
+        """Test that albums are resolved by name from the catalogue."""
+        available, existing, missing = client.verify_albums_exist(["Trip", "Family", "Gone"])
+
+        assert set(available) == {"Trip", "Family", "Library"}
+        assert existing == ["Trip", "Family"]
+        assert missing == ["Gone"]
+
+    def test_catalog_expires(self, client):
+        """Test that the catalogue is fetched again after its TTL."""
+        client.verify_albums_exist(["Trip"])
+
+        with patch("iphoto_downloader.icloud_client.time.monotonic", return_value=1e12):
+            client.verify_albums_exist(["Trip"])
+
+        assert client.albums_property.call_count == 4
+
+    def test_invalidate_album_cache(self, client):
+        """Test that invalidating the cache forces a new fetch."""
+        client.verify_albums_exist(["Trip"])
+        client.invalidate_album_cache()
+        client.verify_albums_exist(["Trip"])
+
+        assert client.albums_property.call_count == 4
+
+    def test_fetch_album_photo(self, client):
+        """Test that a photo is fetched from its position and checked by id."""
+        personal = client._api.photos.albums["trip"]
+        personal.photo.return_value = iter([MagicMock(id="photo1", filename="a.jpg")])
+
+        record = client.fetch_album_photo("Trip", 4, "photo1")
+
+        personal.photo.assert_called_once_with(4)
+        assert record.id == "photo1"
+        assert record.album_name == "Trip"
+        assert record.position == 4
+
+    def test_fetch_album_photo_moved_or_missing(self, client):
+        """Test that None is returned if the position holds another photo."""
+        personal = client._api.photos.albums["trip"]
+        personal.photo.return_value = iter([MagicMock(id="other")])
+
+        assert client.fetch_album_photo("Trip", 4, "photo1") is None
+        assert client.fetch_album_photo("Gone", 0, "photo1") is None
@@ -0,0 +1,213 @@
+"""Unit tests for integrity module."""
+
+import hashlib
+from unittest.mock import Mock, patch
+
+import pytest
+
+from iphoto_downloader.deletion_tracker import DeletionTracker
+from iphoto_downloader.integrity import (
+    STATUS_CHECKSUM_MISMATCH,
+    STATUS_MISSING,
+    STATUS_OK,
+    STATUS_SIZE_MISMATCH,
+    STATUS_TRUNCATED,
+    check_file,
+    queue_for_redownload,
+    verify_downloads,
+)
+from iphoto_downloader.photo_record import PhotoRecord
+from iphoto_downloader.sync import PhotoSyncer
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class TestCheckFile:
+    """Test the check_file function."""
+
+    def test_intact_file_is_hashed_in_chunks(self, tmp_path):
+        """Test that a file matching size and checksum passes with small reads."""
+        data = b"photo data" * 100
+        path = tmp_path / "a.jpg"
+        path.write_bytes(data)
+
+        result = check_file(path, "a.jpg", len(data), _sha256(data), read_size=64)
+
+        assert result.status == STATUS_OK
+        assert result.checksum_verified
+        assert result.bytes_read == len(data)
+
+    @pytest.mark.parametrize(
+        ("expected_size", "status"),
+        [(20, STATUS_TRUNCATED), (5, STATUS_SIZE_MISMATCH)],
+    )
+    def test_size_mismatch_is_found_without_reading(self, tmp_path, expected_size, status):
+        """Test that files of the wrong size are reported before hashing."""
+        path = tmp_path / "a.jpg"
+        path.write_bytes(b"photo data")
+
+        result = check_file(path, "a.jpg", expected_size, _sha256(b"photo data"))
+
+        assert result.status == status
+        assert result.bytes_read == 0
+
+    def test_checksum_mismatch(self, tmp_path):
+        """Test that corrupted content of the right size is found."""
+        path = tmp_path / "a.jpg"
+        path.write_bytes(b"photo dat!")
+
+        result = check_file(path, "a.jpg", 10, _sha256(b"photo data"))
+
+        assert result.status == STATUS_CHECKSUM_MISMATCH
+
+    def test_missing_file(self, tmp_path):
+        """Test that missing files are reported as missing."""
+        result = check_file(tmp_path / "a.jpg", "a.jpg", 10, "abc")
+
+        assert result.status == STATUS_MISSING
+
+    def test_file_without_checksum_is_checked_by_size(self, tmp_path):
+        """Test that downloads predating checksums are only checked by size."""
+        path = tmp_path / "a.jpg"
+        path.write_bytes(b"photo data")
+
+        result = check_file(path, "a.jpg", 10, None)
+
+        assert result.status == STATUS_OK
+        assert not result.checksum_verified
+
+
+class TestVerifyDownloads:
+    """Test verifying and repairing a library."""
+
+    @pytest.fixture
+    def library(self, tmp_path):
+        """Create a sync directory with intact, damaged and missing downloads."""
+        sync_dir = tmp_path / "photos"
+        (sync_dir / "Trip").mkdir(parents=True)
+        tracker = DeletionTracker(str(tmp_path / "deletion_tracker.db"))
+
+        files = {
+            "good": b"good photo",
+            "corrupt": b"bad photo!",
+            "truncated": b"short",
+            "legacy": b"old photo",
+        }
+        for name, data in files.items():
+            (sync_dir / "Trip" / f"{name}.jpg").write_bytes(data)
+        for i in range(20):
+            data = b"bulk %d" % i
+            (sync_dir / "Trip" / f"bulk{i}.jpg").write_bytes(data)
+            tracker.add_downloaded_photo(
+                f"bulk{i}", f"bulk{i}.jpg", f"Trip/bulk{i}.jpg", len(data), "Trip", _sha256(data)
+            )
+
+        good = _sha256(b"good photo")
+        tracker.add_downloaded_photo("good", "good.jpg", "Trip/good.jpg", 10, "Trip", good)
+        tracker.add_downloaded_photo(
+            "corrupt", "corrupt.jpg", "Trip/corrupt.jpg", 10, "Trip", _sha256(b"bad photo.")
+        )
+        tracker.add_downloaded_photo(
+            "truncated", "truncated.jpg", "Trip/truncated.jpg", 10, "Trip", "abc"
+        )
+        tracker.add_downloaded_photo("legacy", "legacy.jpg", "Trip/legacy.jpg", 9, "Trip")
+        tracker.add_downloaded_photo("missing", "missing.jpg", "Trip/missing.jpg", 3, "Trip", "x")
+        yield sync_dir, tracker
+        tracker.close()
+
+    def test_report_lists_damaged_and_missing_files(self, library):
+        """Test that every record is checked and only problems are listed."""
+        sync_dir, tracker = library
+
+        report = verify_downloads(sync_dir, tracker, workers=3)
+
+        assert report.files_checked == 25
+        assert report.size_only == 1
+        assert {(p.local_path, p.status) for p in report.problems} == {
+            ("Trip/corrupt.jpg", STATUS_CHECKSUM_MISMATCH),
+            ("Trip/truncated.jpg", STATUS_TRUNCATED),
+            ("Trip/missing.jpg", STATUS_MISSING),
+        }
+
+    def test_locally_deleted_photos_are_not_reported(self, library):
+        """Test that files the user deleted on purpose are not reported as missing."""
+        sync_dir, tracker = library
+        tracker.mark_photos_as_deleted(
+            [{"photo_id": "missing", "filename": "missing.jpg", "local_path": "Trip/missing.jpg"}]
+        )
+
+        report = verify_downloads(sync_dir, tracker, workers=2)
+
+        assert report.files_checked == 24
+        assert STATUS_MISSING not in {problem.status for problem in report.problems}
+
+    def test_damaged_files_are_queued_for_download(self, library):
+        """Test that repair removes damaged files and their records but not missing ones."""
+        sync_dir, tracker = library
+        report = verify_downloads(sync_dir, tracker, workers=2)
+
+        assert queue_for_redownload(sync_dir, tracker, report.problems) == 2
+
+        assert not (sync_dir / "Trip" / "corrupt.jpg").exists()
+        assert not (sync_dir / "Trip" / "truncated.jpg").exists()
+        assert (sync_dir / "Trip" / "good.jpg").exists()
+        downloaded = tracker.get_downloaded_photos()
+        assert "corrupt" not in downloaded
+        assert "truncated" not in downloaded
+        assert "missing" in downloaded
+        assert not tracker.is_photo_deleted("corrupt.jpg", "Trip")
+
+    def test_repaired_files_are_downloaded_from_unchanged_album(self, library, tmp_path):
+        """Test that the next sync lists an album again whose damaged files were removed."""
+        sync_dir, tracker = library
+        tracker.save_album_listing_states(
+            {("Trip", False): {"asset_count": 25, "last_photo_id": "x", "full_listed_at": 0.0}}
+        )
+        report = verify_downloads(sync_dir, tracker, workers=2)
+        queue_for_redownload(sync_dir, tracker, report.problems)
+
+        config = Mock(
+            sync_directory=sync_dir,
+            database_path=tmp_path / "deletion_tracker.db",
+            dry_run=False,
+            max_downloads=0,
+            download_workers=1,
+            max_download_workers=1,
+            download_order="listing",
+            download_lookahead=500,
+            full_listing_interval_hours=24,
+            link_album_duplicates=False,
+            retry_max_attempts=3,
+            retry_backoff_minutes=5,
+            retry_max_backoff_hours=24,
+        )
+
+        def list_photos(config, listing_states):
+            # An incremental listing skips albums that did not change since their state
+            if ("Trip", False) in listing_states:
+                return iter([])
+            return iter([PhotoRecord("corrupt", "corrupt.jpg", album_name="Trip")])
+
+        with patch("iphoto_downloader.sync.ICloudClient") as client_class:
+            client = client_class.return_value
+            client.list_photos_from_filtered_albums.side_effect = list_photos
+            client.download_photo.return_value = True
+            syncer = PhotoSyncer(config)
+            try:
+                syncer._sync_photos(set())
+            finally:
+                syncer.deletion_tracker.close()
+
+        client.download_photo.assert_called_once()
+        assert client.download_photo.call_args.args[1] == str(sync_dir / "Trip" / "corrupt.jpg")
+
+    def test_unknown_record_is_not_removed(self, tmp_path):
+        """Test that a file is kept if its record could not be removed."""
+        (tmp_path / "a.jpg").write_bytes(b"data")
+        tracker = Mock(forget_downloaded_file=Mock(return_value=0))
+        problem = check_file(tmp_path / "a.jpg", "a.jpg", 10, None)
+
+        assert queue_for_redownload(tmp_path, tracker, [problem]) == 0
+        assert (tmp_path / "a.jpg").exists()
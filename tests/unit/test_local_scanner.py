@@ -0,0 +1,130 @@
+"""Unit tests for local scanner module."""
+
+import os
+from unittest.mock import patch
+
+from iphoto_downloader.local_scanner import LocalFileEntry, scan_directory
+
+
+class TestScanDirectory:
+    """Test the scan_directory function."""
+
+    def test_scan_collects_nested_files(self, tmp_path):
+        """Test that files in nested folders are keyed by relative path."""
+        (tmp_path / "Album" / "Sub").mkdir(parents=True)
+        (tmp_path / "root.jpg").write_bytes(b"12345")
+        (tmp_path / "Album" / "a.heic").write_bytes(b"a")
+        (tmp_path / "Album" / "Sub" / "clip.mov").write_bytes(b"clip")
+
+        snapshot = scan_directory(tmp_path)
+
+        assert set(snapshot.files) == {
+            "root.jpg",
+            os.path.join("Album", "a.heic"),
+            os.path.join("Album", "Sub", "clip.mov"),
+        }
+        entry = snapshot.get("root.jpg")
+        assert isinstance(entry, LocalFileEntry)
+        assert entry.size == 5
+        assert entry.inode == (tmp_path / "root.jpg").stat().st_ino
+        assert len(snapshot) == 3
+
+    def test_forward_slash_paths_match(self, tmp_path):
+        """Test that paths recorded with forward slashes are found."""
+        (tmp_path / "Album").mkdir()
+        (tmp_path / "Album" / "a.jpg").write_bytes(b"a")
+
+        snapshot = scan_directory(tmp_path)
+
+        assert "Album/a.jpg" in snapshot
+        assert "Album/b.jpg" not in snapshot
+        assert snapshot.get("Album/a.jpg") is not None
+
+    def test_image_files_filters_hidden_and_non_images(self, tmp_path):
+        """Test that only visible image files are reported as photos."""
+        (tmp_path / "photo.JPG").write_bytes(b"a")
+        (tmp_path / ".hidden.jpg").write_bytes(b"b")
+        (tmp_path / "notes.txt").write_bytes(b"c")
+        (tmp_path / "photo.jpg.part").write_bytes(b"d")
+
+        assert scan_directory(tmp_path).image_files() == {"photo.JPG"}
+
+    def test_missing_directory_gives_empty_snapshot(self, tmp_path):
+        """Test that scanning a missing directory does not fail."""
+        snapshot = scan_directory(tmp_path / "missing")
+
+        assert len(snapshot) == 0
+
+    def test_symlinked_directories_are_not_followed(self, tmp_path):
+        """Test that symlinked directories are skipped like Path.rglob does."""
+        target = tmp_path / "target"
+        target.mkdir()
+        (target / "a.jpg").write_bytes(b"a")
+        sync_dir = tmp_path / "sync"
+        sync_dir.mkdir()
+        try:
+            (sync_dir / "link").symlink_to(target, target_is_directory=True)
+        except OSError:
+            return
+
+        assert len(scan_directory(sync_dir)) == 0
+
+    def test_incremental_scan_reuses_unchanged_directories(self, tmp_path):
+        """Test that only directories with a new mtime are listed again."""
+        (tmp_path / "Old").mkdir()
+        (tmp_path / "New").mkdir()
+        (tmp_path / "Old" / "a.jpg").write_bytes(b"a")
+        (tmp_path / "New" / "b.jpg").write_bytes(b"b")
+        # Age the tree so no directory counts as modified just now
+        for path in (tmp_path / "Old", tmp_path / "New", tmp_path):
+            os.utime(path, (1_000_000, 1_000_000))
+
+        first = scan_directory(tmp_path)
+        assert first.stale_directories is None
+
+        (tmp_path / "New" / "c.jpg").write_bytes(b"c")
+        os.utime(tmp_path / "New", (2_000_000, 2_000_000))
+
+        with patch("iphoto_downloader.local_scanner.os.scandir", wraps=os.scandir) as scandir:
+            second = scan_directory(tmp_path, first)
+
+        assert [call.args[0] for call in scandir.call_args_list] == [
+            os.path.join(os.fspath(tmp_path), "New")
+        ]
+        assert second.stale_directories == {"New"}
+        assert set(second.files) == {
+            os.path.join("Old", "a.jpg"),
+            os.path.join("New", "b.jpg"),
+            os.path.join("New", "c.jpg"),
+        }
+
+    def test_incremental_scan_drops_removed_directories(self, tmp_path):
+        """Test that files of a removed directory disappear from the snapshot."""
+        (tmp_path / "Gone").mkdir()
+        (tmp_path / "Gone" / "a.jpg").write_bytes(b"a")
+        for path in (tmp_path / "Gone", tmp_path):
+            os.utime(path, (1_000_000, 1_000_000))
+        first = scan_directory(tmp_path)
+
+        (tmp_path / "Gone" / "a.jpg").unlink()
+        (tmp_path / "Gone").rmdir()
+
+        second = scan_directory(tmp_path, first)
+
+        assert len(second) == 0
+        assert second.stale_directories == {"", "Gone"}
+
+    def test_recently_modified_directory_is_rescanned(self, tmp_path):
+        """Test that a directory changed right before the scan is listed again."""
+        (tmp_path / "a.jpg").write_bytes(b"a")
+        first = scan_directory(tmp_path)
+
+        second = scan_directory(tmp_path, first)
+
+        assert second.stale_directories == {""}
+
+    def test_previous_snapshot_of_other_root_is_ignored(self, tmp_path):
+        """Test that a snapshot of another directory forces a full scan."""
+        other = scan_directory(tmp_path / "missing")
+
+        assert scan_directory(tmp_path, other).stale_directories is None
@@ -0,0 +1,67 @@
+"""Unit tests for photo record module."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from iphoto_downloader.photo_record import PhotoRecord
+
+
+class TestPhotoRecord:
+    """Test the PhotoRecord class."""
+
+    def test_from_asset(self):
+        """Test that a record copies the asset metadata and keeps the asset."""
+        asset = MagicMock()
+        asset.id = "photo1"
+        asset.filename = "IMG_0001.HEIC"
+        asset.size = 2048
+
+        record = PhotoRecord.from_asset(asset, "Trip")
+
+        assert record.id == "photo1"
+        assert record.filename == "IMG_0001.HEIC"
+        assert record.size == 2048
+        assert record.album_name == "Trip"
+        assert record.photo_obj is asset
+
+    def test_record_has_no_instance_dict(self):
+        """Test that records use slots instead of a per-instance dict."""
+        record = PhotoRecord("photo1", "a.jpg")
+
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(AttributeError):
+            record.extra = 1
+
+    def test_coerce_dict_and_record(self):
+        """Test that dictionaries become records and records are passed through."""
+        record = PhotoRecord.coerce({"id": "photo1", "filename": "a.jpg", "size": 10})
+
+        assert (record.id, record.filename, record.size, record.album_name) == (
+            "photo1",
+            "a.jpg",
+            10,
+            None,
+        )
+        assert PhotoRecord.coerce(record) is record
+
+    def test_key_access(self):
+        """Test dictionary-style reads of record fields."""
+        record = PhotoRecord("photo1", "a.jpg", album_name="Trip")
+
+        assert record["id"] == "photo1"
+        assert record.get("album_name") == "Trip"
+        assert record.get("unknown", "default") == "default"
+        assert "filename" in record
+        assert "unknown" not in record
+        with pytest.raises(KeyError):
+            record["unknown"]
+
+    def test_release_drops_asset(self):
+        """Test that release() drops the pyicloud asset but keeps the metadata."""
+        record = PhotoRecord.from_asset(MagicMock(id="photo1", filename="a.jpg"), None)
+
+        record.release()
+
+        assert record.photo_obj is None
+        assert record.id == "photo1"
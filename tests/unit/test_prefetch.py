@@ -0,0 +1,106 @@
+"""Unit tests for prefetch module."""
+
+import threading
+import time
+
+import pytest
+
+from iphoto_downloader.prefetch import PrefetchIterator
+
+
+def wait_for(condition, timeout=5.0):
+    """Wait until condition() is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestPrefetchIterator:
+    """Test the PrefetchIterator class."""
+
+    def test_yields_items_in_order(self):
+        """Test that all items arrive in source order."""
+        assert list(PrefetchIterator(range(1000), max_items=7)) == list(range(1000))
+
+    def test_empty_source(self):
+        """Test that an empty source ends the iteration."""
+        assert list(PrefetchIterator([], max_items=3)) == []
+
+    def test_source_is_read_ahead_up_to_limit(self):
+        """Test that the producer fetches ahead of the consumer but stays bounded."""
+        pulled = []
+
+        def source():
+            for i in range(100):
+                pulled.append(i)
+                yield i
+
+        items = PrefetchIterator(source(), max_items=5)
+        assert next(items) == 0
+
+        # One item consumed, five buffered, one held by the blocked producer
+        assert wait_for(lambda: len(pulled) == 7)
+        time.sleep(0.2)
+        assert len(pulled) == 7
+        items.close()
+
+    def test_source_runs_on_background_thread(self):
+        """Test that the source is iterated off the consumer thread."""
+        threads = []
+
+        def source():
+            threads.append(threading.current_thread())
+            yield 1
+
+        assert list(PrefetchIterator(source(), max_items=2)) == [1]
+        assert threads[0] is not threading.current_thread()
+
+    def test_exception_reaches_consumer_after_previous_items(self):
+        """Test that a source error is raised where it occurred."""
+
+        def source():
+            yield 1
+            yield 2
+            raise ConnectionError("page fetch failed")
+
+        items = PrefetchIterator(source(), max_items=10)
+        assert next(items) == 1
+        assert next(items) == 2
+        with pytest.raises(ConnectionError, match="page fetch failed"):
+            next(items)
+
+    def test_close_stops_producer(self):
+        """Test that the producer ends when the consumer stops early."""
+        finished = threading.Event()
+
+        def source():
+            try:
+                i = 0
+                while True:
+                    yield i
+                    i += 1
+            finally:
+                finished.set()
+
+        items = PrefetchIterator(source(), max_items=3, name="TestPrefetch")
+        assert next(items) == 0
+        items.close()
+
+        assert wait_for(finished.is_set)
+        assert wait_for(lambda: not any(t.name == "TestPrefetch" for t in threading.enumerate()))
+
+    def test_producer_starts_before_first_item_is_requested(self):
+        """Test that prefetching begins as soon as the iterator is created."""
+        started = threading.Event()
+
+        def source():
+            started.set()
+            yield 1
+
+        items = PrefetchIterator(source(), max_items=2)
+
+        assert started.wait(timeout=5)
+        assert list(items) == [1]
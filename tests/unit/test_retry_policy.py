@@ -0,0 +1,55 @@
+"""Unit tests for retry_policy module."""
+
+import pytest
+
+from iphoto_downloader.retry_policy import RetryPolicy, RetryState
+
+
+def _upper_bound(low: float, high: float) -> float:
+    """Jitter function always picking the longest delay."""
+    return high
+
+
+class TestRetryPolicy:
+    """Test the RetryPolicy class."""
+
+    def test_delay_doubles_up_to_maximum(self):
+        """Test exponential growth of the delay and its cap."""
+        policy = RetryPolicy(base_seconds=60, max_seconds=300, max_attempts=10, rng=_upper_bound)
+
+        assert [policy.delay(n) for n in range(1, 6)] == [60, 120, 240, 300, 300]
+
+    def test_delay_is_jittered(self):
+        """Test that delays are drawn between half and all of the backoff."""
+        policy = RetryPolicy(base_seconds=60, max_seconds=3600, max_attempts=10)
+
+        delays = [policy.delay(3) for _ in range(200)]
+
+        assert all(120 <= delay <= 240 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_huge_error_counts_do_not_overflow(self):
+        """Test that the exponent is bounded for long failure histories."""
+        policy = RetryPolicy(base_seconds=60, max_seconds=3600, max_attempts=10_000)
+
+        assert policy.delay(5000) <= 3600
+
+    def test_next_attempt_and_exhaustion(self):
+        """Test scheduling relative to the failure time and the attempt cap."""
+        policy = RetryPolicy(base_seconds=10, max_seconds=100, max_attempts=3, rng=_upper_bound)
+
+        assert policy.next_attempt_at(2, now=1000.0) == 1020.0
+        assert not policy.exhausted(2)
+        assert policy.exhausted(3)
+
+
+class TestRetryState:
+    """Test the RetryState tuple."""
+
+    @pytest.mark.parametrize(
+        ("next_retry_at", "expected"),
+        [(None, True), (999.0, True), (1000.0, True), (1001.0, False)],
+    )
+    def test_is_due(self, next_retry_at, expected):
+        """Test that a retry is due once its time has come or if none was scheduled."""
+        assert RetryState(1, next_retry_at).is_due(1000.0) is expected
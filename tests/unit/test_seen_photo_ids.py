@@ -0,0 +1,50 @@
+"""Unit tests for seen photo ids module."""
+
+import os
+
+from iphoto_downloader.seen_photo_ids import BYTES_PER_IN_MEMORY_ID, SeenPhotoIds
+
+
+class TestSeenPhotoIds:
+    """Test the SeenPhotoIds class."""
+
+    def test_add_reports_new_ids_only(self):
+        """Test that add() is True only for the first occurrence of an id."""
+        seen = SeenPhotoIds(1024 * 1024)
+
+        assert seen.add("photo1") is True
+        assert seen.add("photo2") is True
+        assert seen.add("photo1") is False
+        assert "photo2" in seen
+        assert "photo3" not in seen
+        assert len(seen) == 2
+        seen.close()
+
+    def test_spills_to_disk_beyond_budget(self):
+        """Test that ids beyond the memory budget are spilled and still found exactly."""
+        # Room for ten ids in memory
+        seen = SeenPhotoIds(20 * BYTES_PER_IN_MEMORY_ID)
+        ids = [f"photo{i:05d}" for i in range(1000)]
+
+        assert all(seen.add(photo_id) for photo_id in ids)
+
+        assert len(seen._recent) < 10
+        assert seen._db_path is not None
+        assert os.path.exists(seen._db_path)
+        assert len(seen) == 1000
+        assert not any(seen.add(photo_id) for photo_id in ids)
+        assert all(seen.add(f"other{i}") for i in range(1000))
+        assert len(seen) == 2000
+
+        spill_path = seen._db_path
+        seen.close()
+        assert not os.path.exists(spill_path)
+
+    def test_no_spill_file_within_budget(self):
+        """Test that small listings stay entirely in memory."""
+        seen = SeenPhotoIds(1024 * 1024)
+        for i in range(100):
+            seen.add(f"photo{i}")
+
+        assert seen._db_path is None
+        seen.close()
@@ -2,11 +2,17 @@
 
 import os
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import Mock, call, patch
 
 import pytest
 
+from iphoto_downloader.adaptive_concurrency import AdaptiveConcurrency
+from iphoto_downloader.circuit_breaker import CircuitOpenError
+from iphoto_downloader.icloud_client import DownloadSkippedError
+from iphoto_downloader.photo_record import PhotoRecord
+from iphoto_downloader.retry_policy import RetryState
 from iphoto_downloader.sync import PhotoSyncer
 
 
@@ -26,6 +32,16 @@ class TestPhotoSyncer:
         config.sync_directory = temp_dir / "sync"
         config.dry_run = False
         config.max_downloads = 0  # No limit
+        config.download_workers = 1
+        config.max_download_workers = 1
+        config.max_bandwidth_mbps = 0
+        config.download_order = "listing"
+        config.download_lookahead = 500
+        config.full_listing_interval_hours = 24
+        config.link_album_duplicates = False
+        config.retry_max_attempts = 3
+        config.retry_backoff_minutes = 5
+        config.retry_max_backoff_hours = 24
         config.ensure_sync_directory.return_value = None
         return config
 
@@ -43,6 +59,7 @@ class TestPhotoSyncer:
         """Create a mock deletion tracker."""
         tracker = Mock()
         tracker.get_deleted_photos.return_value = set()
+        tracker.detect_restored_photos.return_value = []
         tracker.is_filename_deleted.return_value = False
         tracker.add_deleted_photo.return_value = None
         return tracker
@@ -55,7 +72,12 @@ class TestPhotoSyncer:
             patch("iphoto_downloader.sync.DeletionTracker") as mock_tracker_class,
         ):
             mock_client_class.return_value = Mock()
-            mock_tracker_class.return_value = Mock()
+            mock_tracker = Mock()
+            mock_tracker.load_local_snapshot.return_value = None
+            mock_tracker.record_sync_error.return_value = 1
+            mock_tracker.get_retry_states.return_value = {}
+            mock_tracker.get_photos_for_retry.return_value = []
+            mock_tracker_class.return_value = mock_tracker
 
             return PhotoSyncer(mock_config)
 
@@ -128,7 +150,7 @@ class TestPhotoSyncer:
             mock_2fa.return_value = True
             mock_get_local.return_value = set()
             syncer.icloud_client.list_photos_from_filtered_albums.return_value = []
-            syncer.deletion_tracker.get_deleted_photos.return_value = set()
+            syncer.deletion_tracker.detect_restored_photos.return_value = []
             syncer.deletion_tracker.get_stats.return_value = {"total_deleted": 0}
             syncer.deletion_tracker.detect_locally_deleted_photos.return_value = []
 
@@ -178,24 +200,15 @@ class TestPhotoSyncer:
         # Mock detected locally deleted photos (empty for this test)
         syncer.deletion_tracker.detect_locally_deleted_photos.return_value = []
 
-        # Mock existing deleted photos
-        syncer.deletion_tracker.get_deleted_photos.return_value = {
-            "test1.jpg",
-            "test2.jpg",
-            "test3.jpg",
-        }
-
-        # Mock downloaded photos with metadata
-        mock_downloaded_photos = {
-            "test1.jpg": {
+        # Mock deleted photos whose file is back on disk
+        syncer.deletion_tracker.detect_restored_photos.return_value = [
+            {
+                "photo_id": "photo1",
                 "filename": "test1.jpg",
+                "album_name": "Unknown",
                 "local_path": "test1.jpg",
-                "downloaded_at": "2024-01-01",
-                "file_size": 1024,
-                "album_name": None,
             }
-        }
-        syncer.deletion_tracker.get_downloaded_photos.return_value = mock_downloaded_photos
+        ]
 
         # Mock deletion tracker stats
         syncer.deletion_tracker.get_stats.return_value = {"total_deleted": 3, "recently_deleted": 1}
@@ -203,18 +216,100 @@ class TestPhotoSyncer:
         # Mock sync directory
         syncer.config.sync_directory = Path("/mock/sync/dir")
 
-        # Mock file existence check for restored photo
-        def mock_exists():
-            return True  # Simulate that test1.jpg was restored locally
+        syncer._track_local_deletions({"test1.jpg", "test2.jpg"})
+
+        # Should remove test1.jpg from deleted photos since it exists locally again
+        syncer.deletion_tracker.detect_restored_photos.assert_called_once_with(
+            Path("/mock/sync/dir"), None
+        )
+        syncer.deletion_tracker.remove_deleted_copies.assert_called_once_with(
+            [("test1.jpg", "Unknown")]
+        )
+        syncer.deletion_tracker.get_downloaded_photos.assert_not_called()
+
+    def test_track_local_deletions_uses_local_scan(self, syncer, temp_dir):
+        """Test that deletion checks reuse the scan of _get_local_files."""
+        sync_dir = temp_dir / "sync"
+        (sync_dir / "Album").mkdir(parents=True)
+        (sync_dir / "Album" / "a.jpg").write_bytes(b"a")
+        syncer.config.sync_directory = sync_dir
+        syncer.deletion_tracker.detect_locally_deleted_photos.return_value = []
+        syncer.deletion_tracker.detect_restored_photos.return_value = []
+        syncer.deletion_tracker.get_stats.return_value = {"total_deleted": 0}
+
+        local_files = syncer._get_local_files()
+        syncer._track_local_deletions(local_files)
 
-        mock_path = Mock()
-        mock_path.exists.return_value = True
+        snapshot = syncer.deletion_tracker.detect_locally_deleted_photos.call_args.args[1]
+        assert "Album/a.jpg" in snapshot
+        assert "Album/b.jpg" not in snapshot
+        assert syncer.deletion_tracker.detect_restored_photos.call_args.args[1] is snapshot
 
-        with patch("pathlib.Path.__truediv__", return_value=mock_path):
-            syncer._track_local_deletions({"test1.jpg", "test2.jpg"})
+    def test_track_local_deletions_skipped_when_watched(self, syncer):
+        """Test that no deletion scan runs while a file watcher records changes."""
+        syncer.local_changes_watched = True
+        syncer.deletion_tracker.get_stats.return_value = {"total_deleted": 2}
 
-        # Should remove test1.jpg from deleted photos since it exists locally again
-        syncer.deletion_tracker.remove_deleted_photo.assert_called_with("test1.jpg")
+        syncer._track_local_deletions(set())
+
+        syncer.deletion_tracker.detect_locally_deleted_photos.assert_not_called()
+        syncer.deletion_tracker.detect_restored_photos.assert_not_called()
+
+    def test_listing_states_passed_to_client(self, syncer):
+        """Test that albums are listed from the stored high-water marks."""
+        states = {("Trip", False): {"asset_count": 3}}
+        syncer.deletion_tracker.get_album_listing_states.return_value = states
+
+        syncer._get_photo_iterator()
+
+        syncer.icloud_client.list_photos_from_filtered_albums.assert_called_once_with(
+            syncer.config, listing_states=states
+        )
+
+    def test_full_listing_when_incremental_disabled(self, syncer):
+        """Test that FULL_LISTING_INTERVAL_HOURS=0 always lists everything."""
+        syncer.config.full_listing_interval_hours = 0
+
+        syncer._get_photo_iterator()
+
+        syncer.deletion_tracker.get_album_listing_states.assert_not_called()
+        syncer.icloud_client.list_photos_from_filtered_albums.assert_called_once_with(
+            syncer.config, listing_states=None
+        )
+
+    def test_listing_states_saved_after_clean_sync(self, syncer):
+        """Test that high-water marks advance only if every photo was handled."""
+        syncer.config.dry_run = False
+        syncer.icloud_client.completed_listings = {("Trip", False): {"asset_count": 3}}
+
+        syncer.stats["errors"] = 1
+        syncer._save_album_listing_states()
+        syncer.deletion_tracker.save_album_listing_states.assert_not_called()
+
+        syncer.stats["errors"] = 0
+        syncer._save_album_listing_states()
+        syncer.deletion_tracker.save_album_listing_states.assert_called_once_with(
+            {("Trip", False): {"asset_count": 3}}
+        )
+
+    def test_listing_states_not_saved_on_dry_run(self, syncer):
+        """Test that a dry run does not advance the high-water marks."""
+        syncer.config.dry_run = True
+        syncer.icloud_client.completed_listings = {("Trip", False): {"asset_count": 3}}
+
+        syncer._save_album_listing_states()
+
+        syncer.deletion_tracker.save_album_listing_states.assert_not_called()
+
+    def test_track_local_deletions_nothing_restored(self, syncer):
+        """Test that nothing is removed when no deleted photo was restored."""
+        syncer.deletion_tracker.detect_locally_deleted_photos.return_value = []
+        syncer.deletion_tracker.detect_restored_photos.return_value = []
+        syncer.deletion_tracker.get_stats.return_value = {"total_deleted": 0}
+
+        syncer._track_local_deletions(set())
+
+        syncer.deletion_tracker.remove_deleted_copies.assert_not_called()
 
     def test_sync_photos_with_new_photos(self, syncer):
         """Test syncing new photos."""
@@ -262,9 +357,11 @@ class TestPhotoSyncer:
             syncer._sync_photos(local_files)
 
             # Should try to download new_photo1.jpg but not existing_photo.jpg
-            syncer.icloud_client.download_photo.assert_called_once_with(
-                mock_photo1, str(syncer.config.sync_directory / "new_photo1.jpg")
-            )
+            syncer.icloud_client.download_photo.assert_called_once()
+            photo, local_path = syncer.icloud_client.download_photo.call_args.args
+            assert isinstance(photo, PhotoRecord)
+            assert (photo.id, photo.filename, photo.size) == ("photo1", "new_photo1.jpg", 1024)
+            assert local_path == str(syncer.config.sync_directory / "new_photo1.jpg")
 
         # Check stats
         assert syncer.stats["total_photos"] == 2
@@ -334,6 +431,307 @@ class TestPhotoSyncer:
             assert syncer.stats["errors"] == 1
             assert syncer.stats["new_downloads"] == 0
 
+    def test_download_failure_schedules_retry(self, syncer):
+        """Test that a failed download is recorded with its position and backed off."""
+        photo = PhotoRecord("photo1", "fail.jpg", album_name="Trip", position=7)
+        syncer.deletion_tracker.is_photo_deleted.return_value = False
+        syncer.deletion_tracker.is_photo_downloaded.return_value = False
+        syncer.deletion_tracker.record_sync_error.return_value = 2
+        syncer.icloud_client.download_photo.return_value = False
+
+        with (
+            patch.object(syncer, "_get_photo_iterator", return_value=iter([photo])),
+            patch("iphoto_downloader.sync.time.time", return_value=1000.0),
+            patch.object(syncer.retry_policy, "_rng", side_effect=lambda low, high: high),
+        ):
+            syncer._sync_photos(set())
+
+        syncer.deletion_tracker.record_sync_error.assert_called_once_with(
+            "photo1",
+            "Trip",
+            "Download failed",
+            filename="fail.jpg",
+            local_path="Trip/fail.jpg",
+            album_position=7,
+        )
+        syncer.deletion_tracker.schedule_retry.assert_called_once_with("photo1", "Trip", 1600.0)
+        assert syncer._recorded_failures == 1
+
+    def test_photo_over_size_limit_is_not_a_failure(self, syncer):
+        """Test that a deliberately skipped photo is neither an error nor retried."""
+        photo = PhotoRecord("photo1", "big.mov", album_name="Trip", position=3)
+        syncer.deletion_tracker.is_photo_deleted.return_value = False
+        syncer.deletion_tracker.is_photo_downloaded.return_value = False
+        syncer.icloud_client.download_photo.side_effect = DownloadSkippedError("too large")
+
+        with patch.object(syncer, "_get_photo_iterator", return_value=iter([photo])):
+            syncer._sync_photos(set())
+
+        syncer.deletion_tracker.record_sync_error.assert_not_called()
+        syncer.deletion_tracker.schedule_retry.assert_not_called()
+        assert syncer.stats["size_skipped"] == 1
+        assert syncer.stats["errors"] == 0
+
+    def test_open_circuit_stops_sync(self, syncer):
+        """Test that an iCloud outage postpones the remaining photos without failures."""
+        photos = [PhotoRecord(f"photo{i}", f"p{i}.jpg", album_name="Trip") for i in range(3)]
+        syncer.deletion_tracker.is_photo_deleted.return_value = False
+        syncer.deletion_tracker.is_photo_downloaded.return_value = False
+        syncer.icloud_client.download_photo.side_effect = CircuitOpenError(600)
+        syncer.icloud_client.completed_listings = {("Trip", False): {"asset_count": 3}}
+
+        with patch.object(syncer, "_get_photo_iterator", return_value=iter(photos)):
+            syncer._sync_photos(set())
+
+        syncer.icloud_client.download_photo.assert_called_once()
+        syncer.deletion_tracker.record_sync_error.assert_not_called()
+        assert syncer.stats["circuit_skipped"] == 1
+        assert syncer.stats["errors"] == 0
+        assert syncer.icloud_client.completed_listings == {}
+
+    def test_sync_photos_defers_retries_not_due(self, syncer):
+        """Test that photos in backoff or given up are not downloaded again."""
+        photos = [
+            PhotoRecord("waiting", "a.jpg", album_name="Trip"),
+            PhotoRecord("due", "b.jpg", album_name="Trip"),
+            PhotoRecord("given_up", "c.jpg", album_name="Trip"),
+        ]
+        syncer._retry_states = {
+            ("waiting", "Trip"): RetryState(1, 2000.0),
+            ("due", "Trip"): RetryState(1, 500.0),
+            ("given_up", "Trip"): RetryState(3, 500.0),
+        }
+        syncer.deletion_tracker.is_photo_deleted.return_value = False
+        syncer.deletion_tracker.is_photo_downloaded.return_value = False
+
+        with (
+            patch.object(syncer, "_get_photo_iterator", return_value=iter(photos)),
+            patch("iphoto_downloader.sync.time.time", return_value=1000.0),
+        ):
+            syncer._sync_photos(set())
+
+        downloaded = [c.args[0].id for c in syncer.icloud_client.download_photo.call_args_list]
+        assert downloaded == ["due"]
+        assert syncer.stats["retries_deferred"] == 2
+        syncer.deletion_tracker.clear_sync_error.assert_called_once_with("due", "Trip")
+
+    def test_retry_pass_fetches_photos_by_position(self, syncer):
+        """Test that due photos not listed this sync are fetched from their position."""
+        found = PhotoRecord("photo1", "a.jpg", album_name="Trip", position=3)
+        syncer.deletion_tracker.get_photos_for_retry.return_value = [
+            {
+                "photo_id": "photo1",
+                "album_name": "Trip",
+                "filename": "a.jpg",
+                "local_path": "Trip/a.jpg",
+                "album_position": 3,
+            },
+            {
+                "photo_id": "photo2",
+                "album_name": "Trip",
+                "filename": "b.jpg",
+                "local_path": "Trip/b.jpg",
+                "album_position": 4,
+            },
+        ]
+        syncer.icloud_client.fetch_album_photo.side_effect = [found, None]
+        syncer.icloud_client.download_photo.return_value = True
+        syncer._retry_states = {("photo1", "Trip"): RetryState(1, 0.0)}
+
+        syncer._retry_failed_downloads(0)
+
+        syncer.icloud_client.fetch_album_photo.assert_has_calls(
+            [call("Trip", 3, "photo1"), call("Trip", 4, "photo2")]
+        )
+        syncer.icloud_client.download_photo.assert_called_once_with(
+            found, str(syncer.config.sync_directory / "Trip/a.jpg")
+        )
+        assert syncer.stats["new_downloads"] == 1
+        syncer.deletion_tracker.clear_sync_error.assert_called_once_with("photo1", "Trip")
+        failure = syncer.deletion_tracker.record_sync_error.call_args
+        assert failure.args[:3] == ("photo2", "Trip", "Photo not found at its album position")
+
+    def test_listing_states_saved_when_failures_are_retried(self, syncer):
+        """Test that failures recorded for a targeted retry do not force a full listing."""
+        syncer.icloud_client.completed_listings = {("Trip", False): {"asset_count": 1}}
+        syncer.stats["errors"] = 1
+        syncer._recorded_failures = 1
+
+        syncer._save_album_listing_states()
+        syncer.deletion_tracker.save_album_listing_states.assert_called_once()
+
+        syncer.stats["errors"] = 2
+        syncer._save_album_listing_states()
+        syncer.deletion_tracker.save_album_listing_states.assert_called_once()
+
+    def test_sync_photos_releases_assets(self, syncer):
+        """Test that pyicloud assets are dropped once a photo is skipped or downloaded."""
+        skipped = PhotoRecord("photo1", "deleted.jpg", photo_obj=Mock())
+        downloaded = PhotoRecord("photo2", "new.jpg", photo_obj=Mock())
+        assets_during_download = []
+
+        def mock_download_photo(photo_info, local_path):
+            assets_during_download.append(photo_info.photo_obj)
+            return True
+
+        syncer.deletion_tracker.is_photo_deleted.side_effect = (
+            lambda filename, album_name: filename == "deleted.jpg"
+        )
+        syncer.deletion_tracker.is_photo_downloaded.return_value = False
+        syncer.icloud_client.download_photo.side_effect = mock_download_photo
+
+        with patch.object(syncer, "_get_photo_iterator", return_value=iter([skipped, downloaded])):
+            syncer._sync_photos(set())
+
+        assert assets_during_download[0] is not None
+        assert skipped.photo_obj is None
+        assert downloaded.photo_obj is None
+        assert syncer.stats["new_downloads"] == 1
+
+    def test_sync_photos_links_album_duplicates(self, syncer):
+        """Test that a photo listed in a second album is hard linked, not downloaded again."""
+        syncer.config.link_album_duplicates = True
+        syncer.config.download_workers = 2
+        downloads = {}
+
+        def mock_download_photo(photo_info, local_path):
+            Path(local_path).write_bytes(b"photo data")
+            photo_info.checksum = "abc"
+            return True
+
+        def mock_add_downloaded_photo(
+            photo_id, filename, local_path, file_size, album_name, checksum
+        ):
+            downloads.setdefault(photo_id, []).append((local_path, checksum))
+
+        syncer.deletion_tracker.is_photo_deleted.return_value = False
+        syncer.deletion_tracker.is_photo_downloaded.return_value = False
+        syncer.deletion_tracker.add_downloaded_photo.side_effect = mock_add_downloaded_photo
+        syncer.deletion_tracker.get_downloaded_copies.side_effect = lambda photo_id: list(
+            downloads.get(photo_id, [])
+        )
+        syncer.icloud_client.download_photo.side_effect = mock_download_photo
+        photos = [
+            PhotoRecord("photo1", "a.jpg", album_name="Trip"),
+            PhotoRecord("photo1", "a.jpg", album_name="Best Of"),
+        ]
+
+        with patch.object(syncer, "_get_photo_iterator", return_value=iter(photos)):
+            syncer._sync_photos(set())
+
+        sync_dir = syncer.config.sync_directory
+        syncer.icloud_client.download_photo.assert_called_once()
+        assert downloads["photo1"] == [("Trip/a.jpg", "abc"), ("Best Of/a.jpg", "abc")]
+        assert (sync_dir / "Best Of" / "a.jpg").read_bytes() == b"photo data"
+        assert os.path.samefile(sync_dir / "Trip" / "a.jpg", sync_dir / "Best Of" / "a.jpg")
+        assert syncer.stats["new_downloads"] == 1
+        assert syncer.stats["linked_duplicates"] == 1
+
+    def test_album_duplicate_does_not_hold_up_listing(self, syncer):
+        """Test that photos listed after an in-flight duplicate are scheduled meanwhile."""
+        syncer.config.link_album_duplicates = True
+        syncer.config.download_workers = 2
+        later_photo_started = threading.Event()
+        downloads = {}
+
+        def mock_download_photo(photo_info, local_path):
+            if photo_info.id == "photo1":
+                # Only finishes once the photo listed after the duplicate was handed out
+                assert later_photo_started.wait(timeout=5)
+            else:
+                later_photo_started.set()
+            Path(local_path).write_bytes(b"photo data")
+            return True
+
+        def mock_add_downloaded_photo(
+            photo_id, filename, local_path, file_size, album_name, checksum
+        ):
+            downloads.setdefault(photo_id, []).append((local_path, checksum))
+
+        syncer.deletion_tracker.is_photo_deleted.return_value = False
+        syncer.deletion_tracker.is_photo_downloaded.return_value = False
+        syncer.deletion_tracker.add_downloaded_photo.side_effect = mock_add_downloaded_photo
+        syncer.deletion_tracker.get_downloaded_copies.side_effect = lambda photo_id: list(
+            downloads.get(photo_id, [])
+        )
+        syncer.icloud_client.download_photo.side_effect = mock_download_photo
+        photos = [
+            PhotoRecord("photo1", "a.jpg", album_name="Trip"),
+            PhotoRecord("photo1", "a.jpg", album_name="Best Of"),
+            PhotoRecord("photo2", "b.jpg", album_name="Best Of"),
+        ]
+
+        with patch.object(syncer, "_get_photo_iterator", return_value=iter(photos)):
+            syncer._sync_photos(set())
+
+        assert syncer.icloud_client.download_photo.call_count == 2
+        assert [path for path, _ in downloads["photo1"]] == ["Trip/a.jpg", "Best Of/a.jpg"]
+        assert syncer.stats["linked_duplicates"] == 1
+
+    def test_unlinked_album_duplicate_respects_max_downloads(self, syncer):
+        """Test that a copy downloaded after all counts towards MAX_DOWNLOADS."""
+        syncer.config.link_album_duplicates = True
+        syncer.config.download_workers = 2
+        syncer.config.max_downloads = 2
+        later_photo_started = threading.Event()
+
+        def mock_download_photo(photo_info, local_path):
+            if photo_info.id == "photo1":
+                # Only finishes once the photo listed after the duplicate was handed out
+                assert later_photo_started.wait(timeout=5)
+            else:
+                later_photo_started.set()
+            Path(local_path).write_bytes(b"photo data")
+            return True
+
+        syncer.deletion_tracker.is_photo_deleted.return_value = False
+        syncer.deletion_tracker.is_photo_downloaded.return_value = False
+        syncer.deletion_tracker.get_downloaded_copies.return_value = []
+        syncer.icloud_client.download_photo.side_effect = mock_download_photo
+        syncer.icloud_client.completed_listings = {
+            ("Trip", False): {"asset_count": 1},
+            ("Best Of", False): {"asset_count": 1},
+            ("Party", False): {"asset_count": 1},
+        }
+        photos = [
+            PhotoRecord("photo1", "a.jpg", album_name="Trip"),
+            PhotoRecord("photo1", "a.jpg", album_name="Best Of"),
+            PhotoRecord("photo2", "b.jpg", album_name="Party"),
+        ]
+
+        with patch.object(syncer, "_get_photo_iterator", return_value=iter(photos)):
+            syncer._sync_photos(set())
+
+        assert syncer.icloud_client.download_photo.call_count == 2
+        assert syncer.stats["new_downloads"] == 2
+        assert set(syncer.icloud_client.completed_listings) == {
+            ("Trip", False),
+            ("Party", False),
+        }
+
+    def test_sync_photos_downloads_when_linking_unsupported(self, syncer):
+        """Test that a duplicate is downloaded if the filesystem cannot link it."""
+        syncer.config.link_album_duplicates = True
+        sync_dir = syncer.config.sync_directory
+        (sync_dir / "Trip").mkdir(parents=True)
+        (sync_dir / "Trip" / "a.jpg").write_bytes(b"photo data")
+        syncer.deletion_tracker.is_photo_deleted.return_value = False
+        syncer.deletion_tracker.is_photo_downloaded.return_value = False
+        syncer.deletion_tracker.get_downloaded_copies.return_value = [("Trip/a.jpg", None)]
+
+        with (
+            patch.object(
+                syncer,
+                "_get_photo_iterator",
+                return_value=iter([PhotoRecord("photo1", "a.jpg", album_name="Best Of")]),
+            ),
+            patch("iphoto_downloader.sync.link_or_clone", return_value=None),
+        ):
+            syncer._sync_photos(set())
+
+        syncer.icloud_client.download_photo.assert_called_once()
+        assert syncer.stats["linked_duplicates"] == 0
+
     def test_sync_photos_dry_run(self, syncer):
         """Test sync in dry run mode."""
         syncer.config.dry_run = True
@@ -360,6 +758,117 @@ class TestPhotoSyncer:
             assert syncer.stats["new_downloads"] == 1
             assert syncer.stats["bytes_downloaded"] == 1024
 
+    def test_sync_photos_concurrent_downloads(self, syncer):
+        """Test that downloads run on the worker pool and are all recorded."""
+        syncer.config.download_workers = 4
+        photos = [
+            {"id": f"photo{i}", "filename": f"photo{i}.jpg", "size": 100 + i, "album_name": None}
+            for i in range(10)
+        ]
+
+        with patch.object(syncer, "_get_photo_iterator") as mock_iterator:
+            mock_iterator.return_value = iter(photos)
+            syncer.deletion_tracker.is_photo_deleted.return_value = False
+            syncer.deletion_tracker.is_photo_downloaded.return_value = False
+
+            def mock_download_photo(photo_info, local_path):
+                Path(local_path).write_bytes(b"x" * photo_info["size"])
+                return True
+
+            syncer.icloud_client.download_photo.side_effect = mock_download_photo
+
+            syncer._sync_photos(set())
+
+        assert syncer.icloud_client.download_photo.call_count == 10
+        assert syncer.deletion_tracker.add_downloaded_photo.call_count == 10
+        assert syncer.stats["new_downloads"] == 10
+        assert syncer.stats["bytes_downloaded"] == sum(p["size"] for p in photos)
+
+    def test_sync_photos_small_first_order(self, syncer):
+        """Test that photos within the look-ahead window are downloaded smallest first."""
+        syncer.config.download_order = "small-first"
+        syncer.config.download_lookahead = 3
+        sizes = [500, 40, 300, 10, 20]
+        photos = [
+            {"id": f"p{i}", "filename": f"p{i}.jpg", "size": size, "album_name": None}
+            for i, size in enumerate(sizes)
+        ]
+
+        with patch.object(syncer, "_get_photo_iterator") as mock_iterator:
+            mock_iterator.return_value = iter(photos)
+            syncer.deletion_tracker.is_photo_deleted.return_value = False
+            syncer.deletion_tracker.is_photo_downloaded.return_value = False
+            syncer.icloud_client.download_photo.return_value = True
+
+            syncer._sync_photos(set())
+
+        downloaded = [c[0][0].size for c in syncer.icloud_client.download_photo.call_args_list]
+        assert downloaded == [40, 10, 20, 300, 500]
+
+    def test_download_limit_forgets_listings_of_waiting_photos(self, syncer):
+        """Test that albums with photos left in the window are not saved as listed."""
+        syncer.config.download_order = "large-first"
+        syncer.config.download_lookahead = 10
+        syncer.config.max_downloads = 1
+        photos = [
+            {"id": "a", "filename": "a.jpg", "size": 9, "album_name": "Trip"},
+            {"id": "b", "filename": "b.jpg", "size": 1, "album_name": "Party"},
+        ]
+        syncer.icloud_client.completed_listings = {
+            ("Trip", False): {"asset_count": 1},
+            ("Party", True): {"asset_count": 1},
+        }
+
+        with patch.object(syncer, "_get_photo_iterator") as mock_iterator:
+            mock_iterator.return_value = iter(photos)
+            syncer.deletion_tracker.is_photo_deleted.return_value = False
+            syncer.deletion_tracker.is_photo_downloaded.return_value = False
+            syncer.icloud_client.download_photo.return_value = True
+
+            syncer._sync_photos(set())
+
+        assert syncer.stats["new_downloads"] == 1
+        assert syncer.icloud_client.completed_listings == {("Trip", False): {"asset_count": 1}}
+
+    def test_sync_photos_concurrent_respects_max_downloads(self, syncer):
+        """Test that in-flight downloads count towards MAX_DOWNLOADS."""
+        syncer.config.download_workers = 4
+        syncer.config.max_downloads = 3
+        photos = [
+            {"id": f"photo{i}", "filename": f"photo{i}.jpg", "size": 10, "album_name": None}
+            for i in range(10)
+        ]
+
+        with patch.object(syncer, "_get_photo_iterator") as mock_iterator:
+            mock_iterator.return_value = iter(photos)
+            syncer.deletion_tracker.is_photo_deleted.return_value = False
+            syncer.deletion_tracker.is_photo_downloaded.return_value = False
+            syncer.icloud_client.download_photo.return_value = True
+
+            syncer._sync_photos(set())
+
+        assert syncer.icloud_client.download_photo.call_count == 3
+        assert syncer.stats["new_downloads"] == 3
+
+    def test_sync_photos_skips_duplicate_in_flight(self, syncer):
+        """Test that the same target path is only scheduled once per run."""
+        syncer.config.download_workers = 4
+        photos = [
+            {"id": "photo1", "filename": "same.jpg", "size": 10, "album_name": "Album"},
+            {"id": "photo2", "filename": "same.jpg", "size": 10, "album_name": "Album"},
+        ]
+
+        with patch.object(syncer, "_get_photo_iterator") as mock_iterator:
+            mock_iterator.return_value = iter(photos)
+            syncer.deletion_tracker.is_photo_deleted.return_value = False
+            syncer.deletion_tracker.is_photo_downloaded.return_value = False
+            syncer.icloud_client.download_photo.return_value = True
+
+            syncer._sync_photos(set())
+
+        syncer.icloud_client.download_photo.assert_called_once()
+        assert syncer.stats["already_exists"] == 1
+
     def test_handle_2fa_success(self, syncer):
         """Test successful 2FA handling."""
         with patch("builtins.input", return_value="123456"):
@@ -414,9 +923,12 @@ class TestPhotoSyncer:
         syncer.stats["already_exists"] = 50
         syncer.stats["deleted_skipped"] = 15
         syncer.stats["errors"] = 10
+        syncer.icloud_client.download_concurrency = AdaptiveConcurrency(initial=3, maximum=8)
 
-        # This should not raise an exception
-        syncer._log_progress()
+        with patch("iphoto_downloader.sync.get_logger") as mock_get_logger:
+            syncer._log_progress()
+
+        assert "0/3 in flight" in mock_get_logger.return_value.info.call_args_list[-1][0][0]
 
     def test_print_summary(self, syncer):
         """Test summary printing."""